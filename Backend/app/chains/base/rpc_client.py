@@ -1,13 +1,23 @@
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List
 import httpx
+from ...utils.rpc_cassette import get_rpc_transport
 
 
 class BaseRPCClient(ABC):
-    def __init__(self, rpc_url: Optional[str] = None, timeout: float = 30.0):
+    # Used by clients created without an explicit transport (benchmarks point it at a fake RPC)
+    default_transport: Optional[httpx.AsyncBaseTransport] = None
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.rpc_url = rpc_url or self.get_default_rpc_url()
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.transport = transport or self.default_transport or get_rpc_transport()
+        self.client = httpx.AsyncClient(timeout=timeout, transport=self.transport)
 
     @classmethod
     @abstractmethod
@@ -21,7 +31,7 @@ class BaseRPCClient(ABC):
         pass
 
     @abstractmethod
-    async def get_latest_blockhash(self) -> Dict[str, Any]:
+    async def get_latest_blockhash(self, commitment: str = "finalized") -> Dict[str, Any]:
         pass
 
     @abstractmethod
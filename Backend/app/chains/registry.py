@@ -99,6 +99,7 @@ def register_solana():
                 "transaction_simulate",
                 "transaction_send",
                 "account_info",
+                "pda_derive",
             ],
             "data_types": [
                 "u8",
@@ -1,10 +1,11 @@
-from .rpc_client import SolanaRPCClient
+from .rpc_client import SolanaRPCClient, SolanaRPCError
 from .idl_loader import SolanaIDLLoader
 from .byte_packer import SolanaBytePacker
 from .tx_builder import SolanaTxBuilder
 
 __all__ = [
     "SolanaRPCClient",
+    "SolanaRPCError",
     "SolanaIDLLoader",
     "SolanaBytePacker",
     "SolanaTxBuilder"
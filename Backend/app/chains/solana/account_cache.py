@@ -0,0 +1,345 @@
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Coroutine, Dict, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from websockets.asyncio.client import connect
+
+from .account_data import get_account
+from .rpc_client import SolanaRPCClient
+from .sim_cache import simulation_cache
+from .slot_tracker import slot_tracker
+from ...core.configs import settings
+from ...utils import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping cost on top of the account data itself
+ENTRY_OVERHEAD_BYTES = 256
+MAX_RECONNECT_DELAY = 30.0
+
+
+# solana-test-validator serves pubsub one port above its HTTP RPC port
+VALIDATOR_RPC_PORT = 8899
+
+
+def websocket_url(rpc_url: str) -> str:
+    """
+    RPC pubsub endpoint for an HTTP RPC URL: the same host and port over
+    ws(s), except a local validator's 8899, whose pubsub is on 8900.
+    """
+    parts = urlsplit(rpc_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    netloc = parts.netloc
+    if parts.port == VALIDATOR_RPC_PORT:
+        netloc = f"{parts.hostname}:{VALIDATOR_RPC_PORT + 1}"
+    return urlunsplit((scheme, netloc, parts.path, parts.query, ""))
+
+
+class AccountEntry:
+    __slots__ = ("value", "slot", "size", "live", "reads")
+
+    def __init__(self, value: Optional[Dict[str, Any]], slot: Optional[int], live: bool):
+        self.value = value
+        self.slot = slot
+        self.live = live
+        self.reads = 0
+        data = (value or {}).get("data")
+        data_size = len(data[0]) if isinstance(data, list) and data else 0
+        self.size = data_size + ENTRY_OVERHEAD_BYTES
+
+
+class AccountCache:
+    """
+    In-process cache of base64 account data tagged with the slot it was read
+    at. Reads name how many slots behind the latest observed slot they accept.
+    Accounts with an active accountSubscribe stream are kept current by
+    notifications, so they are served regardless of age. Bounded by total
+    bytes, least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_subscriptions: int,
+        commitment: str,
+        subscribe_after_reads: int = 0,
+    ):
+        self.max_bytes = max_bytes
+        self.subscribe_after_reads = subscribe_after_reads
+        self.subscriptions = AccountSubscriber(self, max_subscriptions, commitment)
+        self._entries: "OrderedDict[Tuple[str, str], AccountEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def fetch(
+        self,
+        rpc_client: SolanaRPCClient,
+        pubkey: str,
+        max_staleness_slots: int,
+        subscribe: bool = False,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int], bool]:
+        """Returns (account value, slot it was read at, served from cache)."""
+        rpc_url = rpc_client.rpc_url
+        entry = self._get_fresh(rpc_url, pubkey, max_staleness_slots)
+        if entry is not None:
+            self.hits += 1
+            entry.reads += 1
+            if subscribe or (
+                self.subscribe_after_reads and entry.reads >= self.subscribe_after_reads
+            ):
+                self.subscriptions.watch(rpc_url, pubkey)
+            return entry.value, entry.slot, True
+
+        self.misses += 1
+        # Only data fetched after the stream was confirmed is covered by it
+        live = self.subscriptions.is_live(rpc_url, pubkey)
+        result = await get_account(rpc_client, pubkey, "base64")
+        value = result.get("value")
+        slot = result.get("context", {}).get("slot")
+        self.put(rpc_url, pubkey, value, slot, live)
+        if subscribe:
+            self.subscriptions.watch(rpc_url, pubkey)
+        return value, slot, False
+
+    def put(
+        self,
+        rpc_url: str,
+        pubkey: str,
+        value: Optional[Dict[str, Any]],
+        slot: Optional[int],
+        live: bool = False,
+    ) -> None:
+        key = (rpc_url, pubkey)
+        current = self._entries.get(key)
+        if current is not None and slot is not None and current.slot is not None:
+            if slot < current.slot:
+                return
+        entry = AccountEntry(value, slot, live)
+        if entry.size > self.max_bytes:
+            return
+        if current is not None:
+            entry.reads = current.reads
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.subscriptions.unwatch(*oldest)
+            self.evictions += 1
+
+    def discard(self, rpc_url: str, pubkey: str) -> None:
+        self._remove((rpc_url, pubkey))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "subscriptions": self.subscriptions.count(),
+        }
+
+    async def shutdown(self) -> None:
+        await self.subscriptions.shutdown()
+
+    def _get_fresh(
+        self, rpc_url: str, pubkey: str, max_staleness_slots: int
+    ) -> Optional[AccountEntry]:
+        entry = self._entries.get((rpc_url, pubkey))
+        if entry is None:
+            return None
+        if not (entry.live and self.subscriptions.is_live(rpc_url, pubkey)):
+            current = slot_tracker.estimate(rpc_url)
+            if entry.slot is None or current is None:
+                return None
+            if current - entry.slot > max_staleness_slots:
+                return None
+        self._entries.move_to_end((rpc_url, pubkey))
+        return entry
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+class _Stream:
+    def __init__(self, rpc_url: str):
+        self.rpc_url = rpc_url
+        self.ws_url = websocket_url(rpc_url)
+        self.pubkeys: Set[str] = set()
+        self.by_pubkey: Dict[str, int] = {}
+        self.by_subscription: Dict[int, str] = {}
+        self.pending: Dict[int, str] = {}
+        self.ws = None
+        self.task: Optional[asyncio.Task] = None
+        self.notifications = 0
+
+
+class AccountSubscriber:
+    """
+    One pubsub websocket per RPC endpoint carrying accountSubscribe streams
+    for the watched accounts. Notifications overwrite the cached account and
+    drop cached simulations that wrote to it. Reconnects with backoff and
+    resubscribes; while disconnected, entries fall back to slot staleness.
+    """
+
+    def __init__(self, cache: AccountCache, max_subscriptions: int, commitment: str):
+        self.cache = cache
+        self.max_subscriptions = max_subscriptions
+        self.commitment = commitment
+        self._streams: Dict[str, _Stream] = {}
+        self._ids = itertools.count(1)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def watch(self, rpc_url: str, pubkey: str) -> bool:
+        """Starts streaming an account; returns False when the endpoint is at its limit."""
+        if settings.RPC_TRANSPORT_MODE == "replay":
+            # Offline: there is no pubsub endpoint to connect to
+            return False
+        stream = self._streams.get(rpc_url)
+        if stream is None:
+            stream = self._streams[rpc_url] = _Stream(rpc_url)
+        if pubkey in stream.pubkeys:
+            return True
+        if len(stream.pubkeys) >= self.max_subscriptions:
+            return False
+        stream.pubkeys.add(pubkey)
+        if stream.task is None or stream.task.done():
+            stream.task = asyncio.create_task(self._run(stream))
+        elif stream.ws is not None:
+            self._spawn(self._subscribe(stream, pubkey))
+        return True
+
+    def unwatch(self, rpc_url: str, pubkey: str) -> None:
+        stream = self._streams.get(rpc_url)
+        if stream is None or pubkey not in stream.pubkeys:
+            return
+        stream.pubkeys.discard(pubkey)
+        subscription = stream.by_pubkey.pop(pubkey, None)
+        if subscription is not None:
+            stream.by_subscription.pop(subscription, None)
+            if stream.ws is not None:
+                self._spawn(self._send(stream, "accountUnsubscribe", [subscription]))
+
+    def is_live(self, rpc_url: str, pubkey: str) -> bool:
+        stream = self._streams.get(rpc_url)
+        return stream is not None and pubkey in stream.by_pubkey
+
+    def count(self) -> int:
+        return sum(len(stream.by_pubkey) for stream in self._streams.values())
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for stream in self._streams.values():
+            stream.pubkeys.clear()
+            if stream.task is not None:
+                stream.task.cancel()
+        self._streams.clear()
+
+    def _spawn(self, coro: Coroutine) -> None:
+        # The loop only keeps weak references to tasks
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Pubsub request failed: %s", task.exception())
+
+    async def _run(self, stream: _Stream) -> None:
+        delay = 1.0
+        while stream.pubkeys:
+            try:
+                async with connect(stream.ws_url, max_size=None) as ws:
+                    stream.ws = ws
+                    delay = 1.0
+                    for pubkey in list(stream.pubkeys):
+                        await self._subscribe(stream, pubkey)
+                    async for raw in ws:
+                        self._handle(stream, json.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Account stream to %s failed: %s", stream.ws_url, e)
+            finally:
+                stream.ws = None
+                stream.by_pubkey.clear()
+                stream.by_subscription.clear()
+                stream.pending.clear()
+            if stream.pubkeys:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _subscribe(self, stream: _Stream, pubkey: str) -> None:
+        request_id = await self._send(
+            stream,
+            "accountSubscribe",
+            [pubkey, {"encoding": "base64", "commitment": self.commitment}],
+        )
+        if request_id is not None:
+            stream.pending[request_id] = pubkey
+
+    async def _send(self, stream: _Stream, method: str, params: list) -> Optional[int]:
+        if stream.ws is None:
+            return None
+        request_id = next(self._ids)
+        payload = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        try:
+            await stream.ws.send(json.dumps(payload))
+        except Exception as e:
+            logger.debug("Could not send %s to %s: %s", method, stream.ws_url, e)
+            return None
+        return request_id
+
+    def _handle(self, stream: _Stream, message: Dict[str, Any]) -> None:
+        if "id" in message:
+            pubkey = stream.pending.pop(message["id"], None)
+            if pubkey is None:
+                return
+            if "error" in message:
+                logger.warning("accountSubscribe for %s failed: %s", pubkey, message["error"])
+                stream.pubkeys.discard(pubkey)
+                return
+            if pubkey not in stream.pubkeys or pubkey in stream.by_pubkey:
+                # Unwatched while the reply was in flight, or already subscribed
+                # by an earlier request: drop the server-side subscription
+                self._spawn(self._send(stream, "accountUnsubscribe", [message["result"]]))
+                return
+            stream.by_pubkey[pubkey] = message["result"]
+            stream.by_subscription[message["result"]] = pubkey
+            # Changes between the cached read and now were not streamed
+            self.cache.discard(stream.rpc_url, pubkey)
+            return
+
+        if message.get("method") != "accountNotification":
+            return
+        params = message.get("params", {})
+        pubkey = stream.by_subscription.get(params.get("subscription"))
+        if pubkey is None:
+            return
+        result = params.get("result", {})
+        slot = result.get("context", {}).get("slot")
+        stream.notifications += 1
+        slot_tracker.observe(stream.rpc_url, slot)
+        self.cache.put(stream.rpc_url, pubkey, result.get("value"), slot, live=True)
+        simulation_cache.invalidate_account(pubkey)
+
+
+account_cache = AccountCache(
+    settings.ACCOUNT_CACHE_MAX_BYTES,
+    settings.ACCOUNT_SUBSCRIPTION_MAX,
+    settings.ACCOUNT_SUBSCRIPTION_COMMITMENT,
+    settings.ACCOUNT_SUBSCRIBE_AFTER_READS,
+)
+cache_stats.register("accounts", account_cache.stats)
@@ -0,0 +1,237 @@
+import base64
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import base58
+
+from .rpc_client import SolanaRPCClient, SolanaRPCError
+from ...core.configs import settings
+from ...utils.executors import run_cpu
+
+try:
+    import zstandard
+except ImportError:  # base64+zstd needs zstandard; see the 'perf' extra
+    zstandard = None
+
+ZSTD_ENCODING = "base64+zstd"
+# JSON-RPC "invalid params", returned by nodes that don't accept an encoding
+INVALID_PARAMS = -32602
+# A zstd frame header is at most 18 bytes, i.e. 24 base64 characters
+_FRAME_HEADER_B64 = 24
+# dataSlice reads shorter than this are fetched as plain base64; the frame
+# overhead outweighs what compression saves on a few bytes
+ZSTD_MIN_SLICE_BYTES = 1024
+
+# RPC endpoints that rejected base64+zstd; they are asked for base64 from then on
+_zstd_unsupported: Set[str] = set()
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def base64_len(data: str) -> int:
+    """Length of the bytes a padded base64 string decodes to, without decoding it."""
+    if not data:
+        return 0
+    return len(data) // 4 * 3 - (data.endswith("==") + data.endswith("="))
+
+
+def _encoded_len(size: int) -> int:
+    return (size + 2) // 3 * 4
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise ValueError(f"{ZSTD_ENCODING} data needs the zstandard package")
+
+
+def _decompress(data: str) -> bytes:
+    # Frames from the RPC may omit the content size, which rules out
+    # ZstdDecompressor.decompress; a decompressobj handles both.
+    return zstandard.ZstdDecompressor().decompressobj().decompress(base64.b64decode(data))
+
+
+def _zstd_to_base64(data: str) -> str:
+    return base64.b64encode(_decompress(data)).decode("ascii")
+
+
+def _frame_size(data: str) -> Optional[int]:
+    """Decompressed size recorded in the frame header, if the encoder wrote one."""
+    try:
+        size = zstandard.frame_content_size(base64.b64decode(data[:_FRAME_HEADER_B64]))
+    except (zstandard.ZstdError, ValueError):
+        return None
+    return size if size >= 0 else None
+
+
+class TransferStats:
+    """Account data fetched from upstream RPC and what compression saved."""
+
+    def __init__(self):
+        self.accounts = 0
+        self.compressed = 0
+        self.wire_bytes = 0
+        self.data_bytes = 0
+        self.bytes_saved = 0
+
+    def record(self, wire_bytes: int, data_bytes: int, compressed: bool) -> None:
+        self.accounts += 1
+        self.wire_bytes += wire_bytes
+        self.data_bytes += data_bytes
+        if compressed:
+            self.compressed += 1
+            self.bytes_saved += _encoded_len(data_bytes) - wire_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "accounts": self.accounts,
+            "compressed_accounts": self.compressed,
+            "wire_bytes": self.wire_bytes,
+            "data_bytes": self.data_bytes,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+transfer_stats = TransferStats()
+
+
+async def account_bytes(value: Dict[str, Any]) -> bytes:
+    """Raw data of an account fetched as base64, base64+zstd or base58."""
+    data, encoding = value["data"][0], value["data"][1]
+    if encoding == ZSTD_ENCODING:
+        _require_zstd()
+        return await run_cpu(
+            _decompress, data, size=len(data), threshold=settings.ZSTD_OFFLOAD_MIN_BYTES
+        )
+    if encoding == "base58":
+        return base58.b58decode(data)
+    return await run_cpu(base64.b64decode, data, size=len(data))
+
+
+async def data_len(value: Dict[str, Any]) -> int:
+    """
+    Account data length. Taken from ``space`` when the node reports it, else
+    computed from the base64 length or the zstd frame header; only a
+    compressed frame without a recorded size is decompressed.
+    """
+    if value.get("space") is not None:
+        return value["space"]
+    data = value.get("data")
+    if isinstance(data, dict):  # jsonParsed
+        return data.get("space", 0)
+    if not isinstance(data, list) or not data or not isinstance(data[0], str):
+        return len(data) if isinstance(data, str) else 0
+    encoding = data[1] if len(data) > 1 else "base64"
+    if encoding == "base64":
+        return base64_len(data[0])
+    if encoding == ZSTD_ENCODING:
+        _require_zstd()
+        size = _frame_size(data[0])
+        if size is not None:
+            return size
+    return len(await account_bytes(value))
+
+
+def wire_encoding(
+    rpc_url: str, encoding: str, data_slice: Optional[Tuple[int, int]] = None
+) -> str:
+    """Encoding to ask upstream for: base64 reads travel as base64+zstd when enabled."""
+    if (
+        encoding == "base64"
+        and (data_slice is None or data_slice[1] >= ZSTD_MIN_SLICE_BYTES)
+        and settings.ACCOUNT_FETCH_ZSTD
+        and zstandard is not None
+        and rpc_url not in _zstd_unsupported
+    ):
+        return ZSTD_ENCODING
+    return encoding
+
+
+async def _normalize(value: Optional[Dict[str, Any]], encoding: str) -> Optional[Dict[str, Any]]:
+    """Records transfer stats and decompresses base64+zstd data when ``encoding`` is base64."""
+    if not value or not isinstance(value.get("data"), list) or len(value["data"]) < 2:
+        return value
+    data, wire = value["data"][0], value["data"][1]
+    if wire != ZSTD_ENCODING:
+        if wire == "base64":
+            transfer_stats.record(len(data), base64_len(data), False)
+        return value
+    if encoding == ZSTD_ENCODING:
+        size = value.get("space")
+        if size is None and zstandard is not None:
+            size = _frame_size(data)
+        if size is not None:
+            transfer_stats.record(len(data), size, True)
+        return value
+    _require_zstd()
+    plain = await run_cpu(
+        _zstd_to_base64, data, size=len(data), threshold=settings.ZSTD_OFFLOAD_MIN_BYTES
+    )
+    transfer_stats.record(len(data), base64_len(plain), True)
+    return {**value, "data": [plain, "base64"]}
+
+
+async def _request(
+    rpc_client: SolanaRPCClient,
+    encoding: str,
+    call: Any,
+    data_slice: Optional[Tuple[int, int]] = None,
+) -> Any:
+    """Runs ``call(wire_encoding)``, retrying with ``encoding`` if the node rejects zstd."""
+    wire = wire_encoding(rpc_client.rpc_url, encoding, data_slice)
+    try:
+        return await call(wire)
+    except SolanaRPCError as e:
+        if wire == encoding or e.code != INVALID_PARAMS:
+            raise
+        _zstd_unsupported.add(rpc_client.rpc_url)
+        return await call(encoding)
+
+
+async def get_account(
+    rpc_client: SolanaRPCClient, pubkey: str, encoding: str = "base64"
+) -> Dict[str, Any]:
+    """getAccountInfo result (``context`` and ``value``) with data in ``encoding``."""
+    result = await _request(
+        rpc_client,
+        encoding,
+        lambda wire: rpc_client.get_account_info_with_context(pubkey, wire),
+    )
+    return {**result, "value": await _normalize(result.get("value"), encoding)}
+
+
+async def get_multiple_accounts(
+    rpc_client: SolanaRPCClient,
+    pubkeys: List[str],
+    encoding: str = "base64",
+    data_slice: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Any]:
+    """getMultipleAccounts result with data in ``encoding``; missing accounts are None."""
+    result = await _request(
+        rpc_client,
+        encoding,
+        lambda wire: rpc_client.get_multiple_accounts(pubkeys, wire, data_slice),
+        data_slice,
+    )
+    values = [await _normalize(value, encoding) for value in result.get("value", [])]
+    return {**result, "value": values}
+
+
+async def get_program_accounts(
+    rpc_client: SolanaRPCClient,
+    program_id: str,
+    encoding: str = "base64",
+    filters: Optional[List[Dict[str, Any]]] = None,
+    data_slice: Optional[Tuple[int, int]] = None,
+) -> List[Dict[str, Any]]:
+    """getProgramAccounts ``{pubkey, account}`` entries with data in ``encoding``."""
+    result = await _request(
+        rpc_client,
+        encoding,
+        lambda wire: rpc_client.get_program_accounts(program_id, wire, filters, data_slice),
+        data_slice,
+    )
+    return [
+        {"pubkey": entry["pubkey"], "account": await _normalize(entry["account"], encoding)}
+        for entry in result
+    ]
@@ -1,9 +1,14 @@
 import struct
 import base58
 import base64
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional, Tuple
 from ..base.byte_packer import BaseBytePacker
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; bulk packing falls back to Python
+    np = None
+
 
 class SolanaBytePacker(BaseBytePacker):
     SUPPORTED_TYPES = [
@@ -22,6 +27,24 @@ class SolanaBytePacker(BaseBytePacker):
         "string",
         "bytes",
     ]
+    MAX_SEED_LENGTH = 32
+    # Little-endian NumPy formats for fixed-size types. u128/i128/pubkey are
+    # stored as raw void fields and filled from Python-converted bytes.
+    NUMPY_FORMATS = {
+        "u8": "<u1",
+        "u16": "<u2",
+        "u32": "<u4",
+        "u64": "<u8",
+        "i8": "<i1",
+        "i16": "<i2",
+        "i32": "<i4",
+        "i64": "<i8",
+        "bool": "<u1",
+        "u128": "V16",
+        "i128": "V16",
+        "pubkey": "V32",
+    }
+    INTEGER_TYPES = ("u8", "u16", "u32", "u64", "u128", "i8", "i16", "i32", "i64", "i128")
 
     def pack_field(self, field_type: str, value: Any) -> bytes:
         pack_methods = {
@@ -41,19 +64,101 @@ class SolanaBytePacker(BaseBytePacker):
             "bytes": self._pack_bytes,
         }
 
-        pack_fn = pack_methods.get(field_type.lower())
+        field_type = field_type.lower()
+        pack_fn = pack_methods.get(field_type)
         if not pack_fn:
             raise ValueError(f"Unknown type: {field_type}")
+        if field_type in self.INTEGER_TYPES:
+            self._check_int(field_type, value)
 
         return pack_fn(value)
 
     def pack_layout(self, layout: List[Dict[str, Any]]) -> bytes:
-        result = b""
-        for field in layout:
-            field_type = field.get("type")
-            value = field.get("value")
-            result += self.pack_field(field_type, value)
-        return result
+        return b"".join(
+            self.pack_field(field.get("type"), field.get("value")) for field in layout
+        )
+
+    def pack_columns(
+        self,
+        types: List[str],
+        columns: List[List[Any]],
+        prefix: bytes = b"",
+    ) -> Tuple[bytes, List[int], Optional[int]]:
+        """
+        Packs many rows that share one layout. ``columns[i]`` holds the values
+        of field ``types[i]`` for every row. Returns the concatenated buffer,
+        the N + 1 row boundary offsets into it, and the record size when every
+        field is fixed-size (None otherwise).
+        """
+        types = [t.lower() for t in types]
+        if not types:
+            raise ValueError("Layout has no fields")
+        if len(types) != len(columns):
+            raise ValueError(
+                f"Layout has {len(types)} fields but {len(columns)} columns were given"
+            )
+        for field_type in types:
+            if field_type not in self.SUPPORTED_TYPES:
+                raise ValueError(f"Unknown type: {field_type}")
+        rows = len(columns[0]) if columns else 0
+        if any(len(column) != rows for column in columns):
+            raise ValueError("All columns must have the same length")
+
+        if np is not None and all(t in self.NUMPY_FORMATS for t in types):
+            return self._pack_columns_numpy(types, columns, rows, prefix)
+
+        buffers = []
+        offsets = [0]
+        for row in zip(*columns):
+            packed = prefix + b"".join(
+                self.pack_field(field_type, value)
+                for field_type, value in zip(types, row)
+            )
+            buffers.append(packed)
+            offsets.append(offsets[-1] + len(packed))
+        record_size = None
+        if all(t not in ("string", "bytes") for t in types):
+            record_size = len(prefix) + sum(self._get_field_size(t, b"") for t in types)
+        return b"".join(buffers), offsets, record_size
+
+    def _pack_columns_numpy(
+        self, types: List[str], columns: List[List[Any]], rows: int, prefix: bytes
+    ) -> Tuple[bytes, List[int], int]:
+        fields = []
+        if prefix:
+            fields.append(("prefix", f"V{len(prefix)}"))
+        fields.extend((f"f{i}", self.NUMPY_FORMATS[t]) for i, t in enumerate(types))
+        # A list of (name, format) tuples yields a packed (unaligned) dtype
+        dtype = np.dtype(fields)
+        records = np.empty(rows, dtype=dtype)
+
+        if prefix:
+            records["prefix"] = np.void(prefix)
+        for i, (field_type, column) in enumerate(zip(types, columns)):
+            records[f"f{i}"] = self._numpy_column(field_type, column)
+
+        size = dtype.itemsize
+        return records.tobytes(), list(range(0, rows * size + 1, size)), size
+
+    def _numpy_column(self, field_type: str, column: List[Any]) -> Any:
+        fmt = self.NUMPY_FORMATS[field_type]
+        if field_type == "bool":
+            return np.asarray(column, dtype=bool).astype(fmt)
+        if field_type in ("u128", "i128", "pubkey"):
+            raw = b"".join(self.pack_field(field_type, value) for value in column)
+            return np.frombuffer(raw, dtype=fmt)
+        for value in column:
+            # np.asarray would truncate floats and parse numeric strings; the
+            # scalar packers reject both
+            self._check_int(field_type, value)
+        try:
+            return np.asarray(column, dtype=fmt)
+        except OverflowError:
+            if field_type.startswith("i"):
+                raise ValueError(f"Value out of range for {field_type}")
+            # Match the scalar packers, which truncate unsigned values
+            mask = (1 << (np.dtype(fmt).itemsize * 8)) - 1
+            return np.asarray([value & mask for value in column], dtype=fmt)
 
     def unpack_field(self, field_type: str, data: bytes) -> Any:
         unpack_methods = {
@@ -94,6 +199,32 @@ class SolanaBytePacker(BaseBytePacker):
     def get_supported_types(self) -> List[str]:
         return self.SUPPORTED_TYPES.copy()
 
+    def pack_seed(self, field_type: str, value: Any) -> bytes:
+        """
+        Encodes a PDA seed. Seeds are raw bytes, so strings and byte blobs are
+        not length-prefixed; every other type packs like an instruction field.
+        """
+        field_type = field_type.lower()
+        if field_type == "string":
+            seed = value.encode("utf-8")
+        elif field_type == "bytes":
+            seed = bytes(value) if isinstance(value, list) else self._pack_bytes(value)
+        else:
+            seed = self.pack_field(field_type, value)
+
+        if len(seed) > self.MAX_SEED_LENGTH:
+            raise ValueError(
+                f"Seed exceeds {self.MAX_SEED_LENGTH} bytes: {len(seed)} bytes"
+            )
+        return seed
+
+    @staticmethod
+    def _check_int(field_type: str, value: Any) -> None:
+        if not isinstance(value, int):
+            raise ValueError(
+                f"{field_type} values must be integers, got {type(value).__name__}"
+            )
+
     @staticmethod
     def _pack_u8(value: int) -> bytes:
         return struct.pack("<B", value & 0xFF)
@@ -112,27 +243,36 @@ class SolanaBytePacker(BaseBytePacker):
 
     @staticmethod
     def _pack_u128(value: int) -> bytes:
-        return value.to_bytes(16, byteorder="little", signed=False)
+        try:
+            return value.to_bytes(16, byteorder="little", signed=False)
+        except OverflowError:
+            raise ValueError(f"Value out of range for u128: {value}")
 
     @staticmethod
-    def _pack_i8(value: int) -> bytes:
-        return struct.pack("<b", value)
+    def _pack_signed(fmt: str, field_type: str, value: int) -> bytes:
+        try:
+            return struct.pack(fmt, value)
+        except struct.error:
+            raise ValueError(f"Value out of range for {field_type}: {value}")
 
-    @staticmethod
-    def _pack_i16(value: int) -> bytes:
-        return struct.pack("<h", value)
+    def _pack_i8(self, value: int) -> bytes:
+        return self._pack_signed("<b", "i8", value)
 
-    @staticmethod
-    def _pack_i32(value: int) -> bytes:
-        return struct.pack("<i", value)
+    def _pack_i16(self, value: int) -> bytes:
+        return self._pack_signed("<h", "i16", value)
 
-    @staticmethod
-    def _pack_i64(value: int) -> bytes:
-        return struct.pack("<q", value)
+    def _pack_i32(self, value: int) -> bytes:
+        return self._pack_signed("<i", "i32", value)
+
+    def _pack_i64(self, value: int) -> bytes:
+        return self._pack_signed("<q", "i64", value)
 
     @staticmethod
     def _pack_i128(value: int) -> bytes:
-        return value.to_bytes(16, byteorder="little", signed=True)
+        try:
+            return value.to_bytes(16, byteorder="little", signed=True)
+        except OverflowError:
+            raise ValueError(f"Value out of range for i128: {value}")
 
     @staticmethod
     def _pack_bool(value: bool) -> bytes:
@@ -141,9 +281,12 @@ class SolanaBytePacker(BaseBytePacker):
     @staticmethod
     def _pack_pubkey(value: str) -> bytes:
         try:
-            return base58.b58decode(value)
+            decoded = base58.b58decode(value)
         except Exception:
             raise ValueError(f"Invalid pubkey: {value}")
+        if len(decoded) != 32:
+            raise ValueError(f"Invalid pubkey: {value} decodes to {len(decoded)} bytes, not 32")
+        return decoded
 
     @staticmethod
     def _pack_string(value: str) -> bytes:
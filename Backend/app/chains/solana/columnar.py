@@ -0,0 +1,237 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from solders.pubkey import Pubkey
+
+from .idl_codec import IdlCodec, NUMPY_FORMATS, _defined_name
+
+try:
+    import numpy as np
+except ImportError:  # columnar decoding requires numpy; see the 'perf' extra
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+DISCRIMINATOR_FIELD = "_discriminator"
+
+
+class PubkeyColumn:
+    """
+    Column of raw 32-byte keys that converts to base58 only when read.
+    ``raw`` exposes the undecoded bytes as an (N, 32) uint8 array.
+    """
+
+    def __init__(self, values: Any):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> str:
+        return str(Pubkey.from_bytes(self.values[index].tobytes()))
+
+    @property
+    def raw(self) -> Any:
+        return np.frombuffer(self.values.tobytes(), dtype=np.uint8).reshape(-1, 32)
+
+    def to_list(self) -> List[str]:
+        return [str(Pubkey.from_bytes(bytes(key))) for key in self.raw]
+
+
+class ColumnarLayout:
+    """
+    Fixed-size account layout compiled to a packed little-endian NumPy
+    structured dtype, so N same-typed blobs decode with one ``frombuffer``.
+    """
+
+    def __init__(self, fields: List[Tuple[str, Any]], kinds: Dict[str, Any], skip: int):
+        if np is None:
+            raise ValueError("Columnar decoding requires numpy to be installed")
+        self.skip = skip
+        self.kinds = kinds
+        prefix = [(DISCRIMINATOR_FIELD, f"V{skip}")] if skip else []
+        self.dtype = np.dtype(prefix + fields)
+        self.record_size = self.dtype.itemsize - skip
+
+    @classmethod
+    def from_idl(cls, codec: IdlCodec, type_name: str, skip: int = 8) -> "ColumnarLayout":
+        if type_name not in codec.types:
+            raise ValueError(f"Type not found in IDL: {type_name}")
+        kinds: Dict[str, Any] = {}
+        dtype = _compile_dtype(codec, {"defined": type_name}, "", kinds)
+        return cls([(name, dtype.fields[name][0]) for name in dtype.names], kinds, skip)
+
+    @classmethod
+    def from_types(cls, types: List[str], skip: int = 0) -> "ColumnarLayout":
+        fields = []
+        kinds: Dict[str, Any] = {}
+        for index, field_type in enumerate(types):
+            if field_type not in NUMPY_FORMATS:
+                raise ValueError(f"Type is not fixed-size: {field_type}")
+            name = f"field_{index}"
+            fields.append((name, NUMPY_FORMATS[field_type]))
+            kinds[name] = _leaf_kind(field_type)
+        return cls(fields, kinds, skip)
+
+    def decode(
+        self, blobs: Sequence[bytes], discriminator: Optional[bytes] = None
+    ) -> "ColumnarBatch":
+        size = self.dtype.itemsize
+        for index, blob in enumerate(blobs):
+            if len(blob) < size:
+                raise ValueError(
+                    f"Account {index} has {len(blob)} bytes, layout needs {size}"
+                )
+        buffer = b"".join(blob[:size] for blob in blobs)
+        array = np.frombuffer(buffer, dtype=self.dtype, count=len(blobs))
+
+        mismatches: List[int] = []
+        if discriminator is not None and self.skip:
+            valid = array[DISCRIMINATOR_FIELD] == np.void(discriminator)
+            mismatches = np.flatnonzero(~valid).tolist()
+        return ColumnarBatch(array, self.kinds, mismatches)
+
+
+class ColumnarBatch:
+    """Decoded accounts as one structured array plus flattened column views."""
+
+    def __init__(self, array: Any, kinds: Dict[str, Any], mismatches: List[int]):
+        self.array = array
+        self.kinds = kinds
+        self.mismatches = mismatches
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def column(self, path: str) -> Any:
+        values = self.array
+        for part in path.split("."):
+            values = values[part]
+        kind = self.kinds.get(path)
+        if kind == "pubkey" and values.ndim == 1:
+            return PubkeyColumn(values)
+        return values
+
+    def columns(self) -> Dict[str, Any]:
+        return {path: self.column(path) for path in self.kinds}
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        """JSON-friendly columns: pubkeys as base58, wide ints as Python ints."""
+        result = {}
+        for path, kind in self.kinds.items():
+            values = self.column(path)
+            if isinstance(values, PubkeyColumn):
+                result[path] = values.to_list()
+            elif kind in ("u128", "i128"):
+                result[path] = _wide_ints(values, kind == "i128").tolist()
+            elif kind == "pubkey":
+                result[path] = _nested_pubkeys(values)
+            elif isinstance(kind, list):
+                result[path] = [kind[code] for code in values.tolist()]
+            else:
+                result[path] = values.tolist()
+        return result
+
+    def to_arrow(self) -> Any:
+        """
+        Arrow table with one column per leaf field. Pubkeys are kept as
+        fixed_size_binary(32), fieldless enums become dictionary arrays and
+        u128/i128 are rendered as decimal strings.
+        """
+        if pa is None:
+            raise ValueError("Arrow output requires pyarrow to be installed")
+        arrays = {}
+        for path, kind in self.kinds.items():
+            values = self.column(path)
+            if isinstance(values, PubkeyColumn):
+                arrays[path] = pa.FixedSizeBinaryArray.from_buffers(
+                    pa.binary(32), len(values), [None, pa.py_buffer(values.raw.tobytes())]
+                )
+            elif kind in ("u128", "i128"):
+                arrays[path] = pa.array([str(v) for v in _wide_ints(values, kind == "i128").ravel()])
+            elif isinstance(kind, list):
+                arrays[path] = pa.DictionaryArray.from_arrays(
+                    pa.array(values.astype("int32")), pa.array(kind)
+                )
+            elif kind == "pubkey":
+                arrays[path] = pa.array(_nested_pubkeys(values))
+            elif values.ndim > 1:
+                arrays[path] = pa.array(values.tolist())
+            else:
+                arrays[path] = pa.array(values)
+        return pa.table(arrays)
+
+    def to_arrow_ipc(self) -> bytes:
+        """Serializes ``to_arrow()`` as an Arrow IPC stream (readable by Parquet tooling)."""
+        table = self.to_arrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def _leaf_kind(type_name: str) -> str:
+    if type_name in ("publicKey", "pubkey"):
+        return "pubkey"
+    if type_name in ("u128", "i128", "bool"):
+        return type_name
+    return "number"
+
+
+def _wide_ints(values: Any, signed: bool) -> Any:
+    raw = values.tobytes()
+    ints = [
+        int.from_bytes(raw[i : i + 16], "little", signed=signed)
+        for i in range(0, len(raw), 16)
+    ]
+    return np.array(ints, dtype=object).reshape(values.shape)
+
+
+def _nested_pubkeys(values: Any) -> Any:
+    raw = values.tobytes()
+    keys = [str(Pubkey.from_bytes(raw[i : i + 32])) for i in range(0, len(raw), 32)]
+    return np.array(keys, dtype=object).reshape(values.shape).tolist()
+
+
+def _compile_dtype(codec: IdlCodec, type_def: Any, path: str, kinds: Dict[str, Any]) -> Any:
+    if isinstance(type_def, str):
+        if type_def not in NUMPY_FORMATS:
+            raise ValueError(f"Field '{path}' has variable-size type {type_def}")
+        kinds[path] = _leaf_kind(type_def)
+        return np.dtype(NUMPY_FORMATS[type_def])
+    if "array" in type_def:
+        item_type, length = type_def["array"]
+        return np.dtype((_compile_dtype(codec, item_type, path, kinds), (length,)))
+    if "defined" in type_def:
+        name = _defined_name(type_def)
+        if name not in codec.types:
+            raise ValueError(f"Type not found in IDL: {name}")
+        return _compile_dtype(codec, codec.types[name], path, kinds)
+    if "coption" in type_def:
+        prefix = f"{path}." if path else ""
+        kinds[f"{prefix}tag"] = "number"
+        inner = _compile_dtype(codec, type_def["coption"], f"{prefix}value", kinds)
+        return np.dtype([("tag", "<u4"), ("value", inner)])
+
+    kind = type_def.get("kind")
+    if kind == "struct":
+        fields = []
+        for index, field in enumerate(type_def.get("fields", [])):
+            if isinstance(field, dict) and "name" in field:
+                name, field_type = field["name"], field["type"]
+            else:
+                name, field_type = f"field_{index}", field
+            child = f"{path}.{name}" if path else name
+            fields.append((name, _compile_dtype(codec, field_type, child, kinds)))
+        return np.dtype(fields)
+    if kind == "enum":
+        variants = type_def.get("variants", [])
+        if any(v.get("fields") for v in variants):
+            raise ValueError(f"Field '{path}' is an enum with data, which is variable-size")
+        kinds[path] = [v["name"] for v in variants]
+        return np.dtype("<u1")
+    if kind == "type":
+        return _compile_dtype(codec, type_def["alias"], path, kinds)
+    raise ValueError(f"Field '{path}' has variable-size type {type_def}")
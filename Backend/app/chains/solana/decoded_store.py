@@ -0,0 +1,383 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import base58
+
+from ...core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 30.0
+
+# Stored body fields of an instruction record; the rest are columns
+_INSTRUCTION_BODY = ("program", "args", "accounts", "data_hex", "matched_by", "candidates", "error", "index", "inner_index")
+_EVENT_BODY = ("source", "data", "data_hex", "error")
+
+
+@dataclass
+class StoredRow:
+    key: str
+    kind: str  # instruction or event
+    program_id: str
+    name: Optional[str]
+    slot: int
+    block_time: Optional[int]
+    signature: str
+    failed: bool
+    body: Dict[str, Any]
+    accounts: List[str]
+
+
+def _is_pubkey(value: Any) -> bool:
+    if not isinstance(value, str) or not 32 <= len(value) <= 44:
+        return False
+    try:
+        return len(base58.b58decode(value)) == 32
+    except ValueError:
+        return False
+
+
+def _selected(name: Optional[str]) -> bool:
+    names = settings.DECODED_STORE_ACCOUNT_NAMES
+    return not names or name in names.split(",")
+
+
+def _instruction_row(
+    context: Dict[str, Any], ix: Dict[str, Any], index: int, inner_index: Optional[int]
+) -> StoredRow:
+    inner = "-" if inner_index is None else inner_index
+    body = {k: ix.get(k) for k in _INSTRUCTION_BODY}
+    body.update(index=index, inner_index=inner_index)
+    return StoredRow(
+        key=f"{context['signature']}:ix:{index}:{inner}",
+        kind="instruction",
+        program_id=ix["program_id"],
+        name=ix.get("name"),
+        slot=context["slot"],
+        block_time=context.get("block_time"),
+        signature=context["signature"],
+        failed=bool(context.get("failed")),
+        body=body,
+        accounts=sorted(
+            {a["pubkey"] for a in ix.get("accounts", []) if _selected(a.get("name"))}
+        ),
+    )
+
+
+def _event_row(context: Dict[str, Any], event: Dict[str, Any], ordinal: int) -> StoredRow:
+    data = event.get("data")
+    accounts = set()
+    if isinstance(data, dict):
+        accounts = {v for k, v in data.items() if _is_pubkey(v) and _selected(k)}
+    return StoredRow(
+        key=f"{context['signature']}:event:{event['program_id']}:{ordinal}",
+        kind="event",
+        program_id=event["program_id"],
+        name=event.get("name"),
+        slot=context["slot"],
+        block_time=context.get("block_time"),
+        signature=context["signature"],
+        failed=bool(context.get("failed")),
+        body={k: event.get(k) for k in _EVENT_BODY if k in event},
+        accounts=sorted(accounts),
+    )
+
+
+def rows_from_ingest(records: Iterable[Dict[str, Any]]) -> List[StoredRow]:
+    """Rows for block-ingestion records (one program's instructions and events)."""
+    rows = []
+    ordinals: Dict[Tuple[str, str], int] = {}
+    for record in records:
+        if record.get("type") == "instruction":
+            rows.append(_instruction_row(record, record, record["index"], record.get("inner_index")))
+        elif record.get("type") == "event":
+            key = (record["signature"], record["program_id"])
+            ordinals[key] = ordinals.get(key, 0) + 1
+            rows.append(_event_row(record, record, ordinals[key] - 1))
+    return rows
+
+
+def rows_from_transaction(tx: Dict[str, Any]) -> List[StoredRow]:
+    """Rows for a decoded confirmed transaction (every program's instructions and events)."""
+    if tx.get("slot") is None or tx.get("error"):
+        return []
+    rows = []
+    for ix in tx.get("instructions", []):
+        rows.append(_instruction_row(tx, ix, ix["index"], None))
+        for inner in ix.get("inner", []):
+            rows.append(_instruction_row(tx, inner, ix["index"], inner["index"]))
+    ordinals: Dict[str, int] = {}
+    for event in tx.get("events", []):
+        ordinal = ordinals.get(event["program_id"], 0)
+        ordinals[event["program_id"]] = ordinal + 1
+        rows.append(_event_row(tx, event, ordinal))
+    return rows
+
+
+def _encode_cursor(slot: int, row_id: int) -> str:
+    return f"{slot}:{row_id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        slot, row_id = cursor.split(":")
+        return int(slot), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class DecodedStore:
+    """
+    Decoded instructions and events kept in a local SQLite file, indexed by
+    program and name, slot, signature and account. Rows are keyed by
+    signature and position, so writing the same transaction twice (e.g. from
+    ingestion and a history crawl) stores it once. Writes are queued and
+    committed in batches by a background task; a full queue makes writers
+    wait rather than dropping rows, and a batch that fails to commit is
+    retried with backoff until it lands.
+    """
+
+    def __init__(self, path: str, batch_size: int, flush_seconds: float, max_pending: int):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.written = 0
+        self.batches = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    kind TEXT NOT NULL,
+                    program_id TEXT NOT NULL,
+                    name TEXT,
+                    slot INTEGER NOT NULL,
+                    block_time INTEGER,
+                    signature TEXT NOT NULL,
+                    failed INTEGER NOT NULL,
+                    body TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS records_program_name
+                    ON records (program_id, name, slot);
+                CREATE INDEX IF NOT EXISTS records_slot ON records (slot);
+                CREATE INDEX IF NOT EXISTS records_signature ON records (signature);
+                CREATE TABLE IF NOT EXISTS record_accounts (
+                    account TEXT NOT NULL,
+                    slot INTEGER NOT NULL,
+                    record_id INTEGER NOT NULL,
+                    PRIMARY KEY (account, slot, record_id)
+                ) WITHOUT ROWID;
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    async def write(self, rows: List[StoredRow]) -> None:
+        if not rows:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_pending)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run())
+        for row in rows:
+            await self._queue.put(row)
+
+    async def flush(self) -> None:
+        """Waits until every queued row is committed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            delay = 1.0
+            while True:
+                try:
+                    await asyncio.to_thread(self._insert, batch)
+                    break
+                except Exception as e:
+                    logger.warning(
+                        "Writing %d decoded rows failed, retrying in %.0fs: %s", len(batch), delay, e
+                    )
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+            for _ in batch:
+                queue.task_done()
+
+    def _insert(self, batch: List[StoredRow]) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in batch:
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO records "
+                        "(key, kind, program_id, name, slot, block_time, signature, failed, body) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            row.key,
+                            row.kind,
+                            row.program_id,
+                            row.name,
+                            row.slot,
+                            row.block_time,
+                            row.signature,
+                            int(row.failed),
+                            json.dumps(row.body, separators=(",", ":"), default=str),
+                        ),
+                    )
+                    if not cursor.rowcount:
+                        continue
+                    self.written += 1
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO record_accounts (account, slot, record_id) "
+                        "VALUES (?, ?, ?)",
+                        [(account, row.slot, cursor.lastrowid) for account in row.accounts],
+                    )
+                conn.execute("COMMIT")
+                self.batches += 1
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def query(
+        self,
+        program_id: Optional[str] = None,
+        name: Optional[str] = None,
+        kind: Optional[str] = None,
+        account: Optional[str] = None,
+        signature: Optional[str] = None,
+        min_slot: Optional[int] = None,
+        max_slot: Optional[int] = None,
+        since: Optional[int] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Matching rows newest first and the cursor for the next page (None on the last page)."""
+        table = "records r"
+        where: List[str] = []
+        params: List[Any] = []
+        if account is not None:
+            table += " JOIN record_accounts a ON a.record_id = r.id"
+            where.append("a.account = ?")
+            params.append(account)
+        for column, value in (
+            ("r.program_id", program_id),
+            ("r.name", name),
+            ("r.kind", kind),
+            ("r.signature", signature),
+        ):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if min_slot is not None:
+            where.append("r.slot >= ?")
+            params.append(min_slot)
+        if max_slot is not None:
+            where.append("r.slot <= ?")
+            params.append(max_slot)
+        if since is not None:
+            where.append("r.block_time >= ?")
+            params.append(since)
+        if cursor is not None:
+            slot, row_id = _decode_cursor(cursor)
+            where.append("(r.slot < ? OR (r.slot = ? AND r.id < ?))")
+            params += [slot, slot, row_id]
+
+        sql = (
+            "SELECT r.id, r.kind, r.program_id, r.name, r.slot, r.block_time, "
+            f"r.signature, r.failed, r.body FROM {table}"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.slot DESC, r.id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            fetched = self._connection().execute(sql, params).fetchall()
+        rows = [
+            {
+                "kind": kind_,
+                "program_id": program,
+                "name": name_,
+                "slot": slot_,
+                "block_time": block_time,
+                "signature": sig,
+                "failed": bool(failed),
+                "record": json.loads(body),
+            }
+            for _, kind_, program, name_, slot_, block_time, sig, failed, body in fetched[:limit]
+        ]
+        next_cursor = None
+        if len(fetched) > limit:
+            last = fetched[limit - 1]
+            next_cursor = _encode_cursor(last[4], last[0])
+        return rows, next_cursor
+
+    async def aquery(self, **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await asyncio.to_thread(lambda: self.query(**filters))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            records = self._connection().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        return {
+            "path": self.path,
+            "records": records,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "written": self.written,
+            "batches": self.batches,
+        }
+
+    async def astats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.stats)
+
+    async def shutdown(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Decoded store closed with %d rows unwritten", self._queue.qsize())
+        self._writer.cancel()
+        await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+decoded_store = DecodedStore(
+    settings.DECODED_STORE_PATH,
+    settings.DECODED_STORE_BATCH_SIZE,
+    settings.DECODED_STORE_FLUSH_SECONDS,
+    settings.DECODED_STORE_MAX_PENDING,
+)
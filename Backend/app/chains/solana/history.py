@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from .decoded_store import decoded_store, rows_from_transaction
+from .rpc_client import SolanaRPCClient, SolanaRPCError
+from .tx_decoder import decode_confirmed_transaction
+from ...core.configs import settings
+from ...utils.ordered import ordered_map
+
+logger = logging.getLogger(__name__)
+
+# getSignaturesForAddress returns at most this many signatures per call
+MAX_SIGNATURE_PAGE = 1000
+
+
+class HistoryCrawler:
+    """
+    Walks an address's signatures newest first with ``before``/``until``
+    cursors and fetches the transactions with up to ``concurrency``
+    getTransaction calls in flight. Results come back in signature order, so
+    the last one yielded is the cursor to resume from. With ``store`` each
+    transaction is also written to the decoded store.
+    """
+
+    def __init__(
+        self,
+        rpc_client: SolanaRPCClient,
+        address: str,
+        concurrency: int = 16,
+        include_failed: bool = True,
+        fetch_missing_idls: bool = True,
+        idls: Optional[Dict[str, Dict[str, Any]]] = None,
+        commitment: str = "confirmed",
+        store: bool = False,
+    ):
+        self.rpc_client = rpc_client
+        self.address = address
+        self.concurrency = concurrency
+        self.include_failed = include_failed
+        self.fetch_missing_idls = fetch_missing_idls
+        self.idls = idls
+        self.commitment = commitment
+        self.store = store and settings.DECODED_STORE_ENABLED
+        self.exhausted = False
+        self.pages = 0
+        self.transactions = 0
+        self.errors = 0
+
+    async def signatures(
+        self, before: Optional[str], until: Optional[str], limit: Optional[int]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Signature infos newest first, ``limit`` at most, fetched one page at a time."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = MAX_SIGNATURE_PAGE if remaining is None else min(remaining, MAX_SIGNATURE_PAGE)
+            page = await self.rpc_client.get_signatures_for_address(
+                self.address, before, until, page_size, self.commitment
+            )
+            self.pages += 1
+            for info in page:
+                before = info["signature"]
+                if info.get("err") is not None and not self.include_failed:
+                    continue
+                if remaining is not None:
+                    remaining -= 1
+                yield info
+                if remaining == 0:
+                    return
+            if len(page) < page_size:
+                self.exhausted = True
+                return
+
+    async def fetch(self, info: Dict[str, Any]) -> Dict[str, Any]:
+        """The decoded transaction, or an error record when it can't be fetched or decoded."""
+        signature = info["signature"]
+        retries = settings.HISTORY_FETCH_RETRIES
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    entry = await self.rpc_client.get_transaction(signature, self.commitment)
+                    break
+                except (SolanaRPCError, httpx.HTTPError):
+                    if attempt == retries:
+                        raise
+                await asyncio.sleep(0.2 * 2**attempt)
+            if entry is None:
+                raise ValueError("Transaction not available from this RPC endpoint")
+            decoded = await decode_confirmed_transaction(
+                self.rpc_client, entry, self.fetch_missing_idls, self.idls
+            )
+            self.transactions += 1
+            return decoded
+        except Exception as e:
+            self.errors += 1
+            return {
+                "signature": signature,
+                "slot": info.get("slot"),
+                "block_time": info.get("blockTime"),
+                "failed": info.get("err") is not None,
+                "error": str(e),
+            }
+
+    async def run(
+        self, before: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async for _, record in ordered_map(
+            self.signatures(before, until, limit), self.fetch, self.concurrency
+        ):
+            if self.store:
+                await decoded_store.write(rows_from_transaction(record))
+            yield record
+
+    def stats(self) -> Dict[str, int]:
+        return {"pages": self.pages, "transactions": self.transactions, "errors": self.errors}
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+async def stream_history(
+    crawler: HistoryCrawler,
+    before: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    NDJSON ``transaction`` records newest first, with ``cursor`` lines
+    carrying the signature to pass as ``before`` to continue. The final
+    cursor has ``done: true`` once the history (or ``until``) is reached.
+    """
+    cursor = before
+    sent_at = time.monotonic()
+    try:
+        async for record in crawler.run(before, until, limit):
+            cursor = record["signature"]
+            lines = _line({"type": "transaction", **record})
+            if time.monotonic() - sent_at >= settings.HISTORY_CURSOR_SECONDS:
+                lines += _line({"type": "cursor", "before": cursor, "done": False})
+                sent_at = time.monotonic()
+            yield lines
+        yield _line(
+            {"type": "cursor", "before": cursor, "done": crawler.exhausted, **crawler.stats()}
+        )
+    except Exception as e:
+        logger.warning("History crawl for %s failed: %s", crawler.address, e)
+        yield _line({"type": "error", "error": str(e), "before": cursor})
+    finally:
+        await crawler.rpc_client.close()
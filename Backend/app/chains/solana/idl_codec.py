@@ -0,0 +1,702 @@
+import re
+import json
+import struct
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solders.pubkey import Pubkey
+
+from ...utils import cache_stats
+from ...utils.shared_cache import get_shared_cache
+
+Decoder = Callable[[bytes, int], Tuple[Any, int]]
+Encoder = Callable[[Any, bytearray], None]
+
+ANCHOR_DISCRIMINATOR_SIZE = 8
+
+_STRUCT_FORMATS = {
+    "u8": "<B",
+    "u16": "<H",
+    "u32": "<I",
+    "u64": "<Q",
+    "i8": "<b",
+    "i16": "<h",
+    "i32": "<i",
+    "i64": "<q",
+    "f32": "<f",
+    "f64": "<d",
+}
+
+PRIMITIVE_SIZES = {
+    "bool": 1,
+    "u8": 1,
+    "i8": 1,
+    "u16": 2,
+    "i16": 2,
+    "u32": 4,
+    "i32": 4,
+    "f32": 4,
+    "u64": 8,
+    "i64": 8,
+    "f64": 8,
+    "u128": 16,
+    "i128": 16,
+    "publicKey": 32,
+    "pubkey": 32,
+}
+
+# NumPy formats for fixed-size primitives. Wide ints and pubkeys are kept as
+# raw void fields and converted lazily.
+NUMPY_FORMATS = {
+    "bool": "<u1",
+    "u8": "<u1",
+    "i8": "<i1",
+    "u16": "<u2",
+    "i16": "<i2",
+    "u32": "<u4",
+    "i32": "<i4",
+    "f32": "<f4",
+    "u64": "<u8",
+    "i64": "<i8",
+    "f64": "<f8",
+    "u128": "V16",
+    "i128": "V16",
+    "publicKey": "V32",
+    "pubkey": "V32",
+}
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+def sighash(namespace: str, name: str) -> bytes:
+    return hashlib.sha256(f"{namespace}:{name}".encode()).digest()[:8]
+
+
+def idl_fingerprint(idl: Dict[str, Any]) -> str:
+    raw = json.dumps(idl, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def _defined_name(type_def: Dict[str, Any]) -> str:
+    defined = type_def["defined"]
+    return defined["name"] if isinstance(defined, dict) else defined
+
+
+class IdlCodec:
+    """
+    Borsh codec compiled from an Anchor IDL (legacy or 0.30+).
+
+    Each type is compiled once into a closure ``(data, offset) -> (value,
+    new_offset)``; instruction, account and event discriminators are indexed
+    so raw bytes can be matched back to their IDL definition. Encoders are
+    compiled the same way into ``(value, out)`` closures that append to a
+    bytearray, taking values in the shape the decoders produce.
+    """
+
+    def __init__(self, idl: Dict[str, Any], fingerprint: Optional[str] = None):
+        self.idl = idl
+        self.fingerprint = fingerprint or idl_fingerprint(idl)
+        self.types: Dict[str, Dict[str, Any]] = {
+            t["name"]: t["type"] for t in idl.get("types", []) if t.get("type")
+        }
+        for acc in idl.get("accounts", []):
+            if acc.get("type"):
+                self.types.setdefault(acc["name"], acc["type"])
+        for event in idl.get("events", []):
+            if event.get("fields") is not None:
+                self.types.setdefault(
+                    event["name"], {"kind": "struct", "fields": event["fields"]}
+                )
+        self._decoders: Dict[str, Decoder] = {}
+        self._encoders: Dict[str, Encoder] = {}
+        self._layouts: Dict[str, Dict[str, Any]] = {}
+
+        self.instructions: Dict[bytes, Dict[str, Any]] = {}
+        self.instruction_names: Dict[str, bytes] = {}
+        for ix in idl.get("instructions", []):
+            disc = ix.get("discriminator")
+            disc = bytes(disc) if disc else sighash("global", _snake_case(ix["name"]))
+            self.instructions[disc] = ix
+            self.instruction_names[ix["name"]] = disc
+        self.accounts: Dict[bytes, str] = {}
+        for acc in idl.get("accounts", []):
+            disc = acc.get("discriminator")
+            self.accounts[bytes(disc) if disc else sighash("account", acc["name"])] = acc["name"]
+        self.events: Dict[bytes, str] = {}
+        for event in idl.get("events", []):
+            disc = event.get("discriminator")
+            self.events[bytes(disc) if disc else sighash("event", event["name"])] = event["name"]
+
+    # Decoding
+
+    def decode_type(self, type_def: Any, data: bytes, offset: int = 0) -> Tuple[Any, int]:
+        return self.compile(type_def)(data, offset)
+
+    def decode_defined(self, name: str, data: bytes, offset: int = 0) -> Any:
+        return self.compile({"defined": name})(data, offset)[0]
+
+    def decode_instruction(self, data: bytes) -> Optional[Tuple[str, Dict[str, Any]]]:
+        ix = self.instructions.get(bytes(data[:ANCHOR_DISCRIMINATOR_SIZE]))
+        if ix is None:
+            return None
+        decoder = self._args_decoder(ix)
+        args, _ = decoder(data, ANCHOR_DISCRIMINATOR_SIZE)
+        return ix["name"], args
+
+    def decode_account(self, data: bytes) -> Optional[Tuple[str, Any]]:
+        name = self.accounts.get(bytes(data[:ANCHOR_DISCRIMINATOR_SIZE]))
+        if name is None or name not in self.types:
+            return None
+        return name, self.decode_defined(name, data, ANCHOR_DISCRIMINATOR_SIZE)
+
+    def decode_event(self, data: bytes) -> Optional[Tuple[str, Any]]:
+        name = self.events.get(bytes(data[:ANCHOR_DISCRIMINATOR_SIZE]))
+        if name is None or name not in self.types:
+            return None
+        return name, self.decode_defined(name, data, ANCHOR_DISCRIMINATOR_SIZE)
+
+    def account_discriminator(self, name: str) -> Optional[bytes]:
+        return next((d for d, n in self.accounts.items() if n == name), None)
+
+    def precompile(self) -> int:
+        """
+        Compiles the decoders of every instruction, account and event up
+        front so first requests don't pay for it. Definitions using
+        unsupported types are skipped. Returns the number of decoders.
+        """
+        for ix in self.instructions.values():
+            try:
+                self._args_decoder(ix)
+            except ValueError:
+                pass
+        for name in set(self.accounts.values()) | set(self.events.values()):
+            if name in self.types:
+                try:
+                    self._compile_defined(name)
+                except ValueError:
+                    pass
+        return len(self._decoders)
+
+    # Compilation
+
+    def compile(self, type_def: Any) -> Decoder:
+        if isinstance(type_def, str):
+            return self._compile_primitive(type_def)
+        if "defined" in type_def:
+            return self._compile_defined(_defined_name(type_def))
+        if "option" in type_def:
+            inner = self.compile(type_def["option"])
+
+            def decode_option(data: bytes, offset: int) -> Tuple[Any, int]:
+                if data[offset] == 0:
+                    return None, offset + 1
+                return inner(data, offset + 1)
+
+            return decode_option
+        if "coption" in type_def:
+            inner = self.compile(type_def["coption"])
+            inner_size = self.fixed_size(type_def["coption"])
+
+            def decode_coption(data: bytes, offset: int) -> Tuple[Any, int]:
+                # COption is fixed-size: u32 tag followed by the (possibly zeroed) value
+                (tag,) = struct.unpack_from("<I", data, offset)
+                value, end = inner(data, offset + 4)
+                if inner_size is not None:
+                    end = offset + 4 + inner_size
+                return (value if tag else None), end
+
+            return decode_coption
+        if "vec" in type_def:
+            inner = self.compile(type_def["vec"])
+
+            def decode_vec(data: bytes, offset: int) -> Tuple[Any, int]:
+                (length,) = struct.unpack_from("<I", data, offset)
+                offset += 4
+                items = []
+                for _ in range(length):
+                    item, offset = inner(data, offset)
+                    items.append(item)
+                return items, offset
+
+            return decode_vec
+        if "array" in type_def:
+            item_type, length = type_def["array"]
+            if item_type == "u8":
+
+                def decode_byte_array(data: bytes, offset: int) -> Tuple[Any, int]:
+                    return list(data[offset : offset + length]), offset + length
+
+                return decode_byte_array
+            inner = self.compile(item_type)
+
+            def decode_array(data: bytes, offset: int) -> Tuple[Any, int]:
+                items = []
+                for _ in range(length):
+                    item, offset = inner(data, offset)
+                    items.append(item)
+                return items, offset
+
+            return decode_array
+        if "kind" in type_def:
+            return self._compile_type_def(type_def)
+        raise ValueError(f"Unsupported IDL type: {type_def}")
+
+    def _compile_defined(self, name: str) -> Decoder:
+        if name in self._decoders:
+            return self._decoders[name]
+        if name not in self.types:
+            raise ValueError(f"Type not found in IDL: {name}")
+
+        # Register a trampoline first so recursive types resolve to it
+        compiled: List[Decoder] = []
+
+        def decode_recursive(data: bytes, offset: int) -> Tuple[Any, int]:
+            return compiled[0](data, offset)
+
+        self._decoders[name] = decode_recursive
+        try:
+            decoder = self._compile_type_def(self.types[name])
+        except ValueError:
+            del self._decoders[name]
+            raise
+        compiled.append(decoder)
+        self._decoders[name] = decoder
+        return decoder
+
+    def _compile_type_def(self, type_def: Dict[str, Any]) -> Decoder:
+        kind = type_def.get("kind")
+        if kind == "struct":
+            return self._compile_fields(type_def.get("fields", []))
+        if kind == "enum":
+            variants = [
+                (v["name"], self._compile_fields(v["fields"]) if v.get("fields") else None)
+                for v in type_def.get("variants", [])
+            ]
+
+            def decode_enum(data: bytes, offset: int) -> Tuple[Any, int]:
+                try:
+                    name, fields_decoder = variants[data[offset]]
+                except IndexError:
+                    raise ValueError(f"Invalid enum variant index at offset {offset}")
+                offset += 1
+                if fields_decoder is None:
+                    return {"variant": name}, offset
+                fields, offset = fields_decoder(data, offset)
+                return {"variant": name, "fields": fields}, offset
+
+            return decode_enum
+        if kind == "type":
+            return self.compile(type_def["alias"])
+        raise ValueError(f"Unsupported type kind: {kind}")
+
+    def _compile_fields(self, fields: List[Any]) -> Decoder:
+        if fields and (not isinstance(fields[0], dict) or "name" not in fields[0]):
+            # Tuple struct / tuple variant: a list of bare types
+            decoders = [self.compile(f) for f in fields]
+
+            def decode_tuple(data: bytes, offset: int) -> Tuple[Any, int]:
+                values = []
+                for decoder in decoders:
+                    value, offset = decoder(data, offset)
+                    values.append(value)
+                return values, offset
+
+            return decode_tuple
+
+        named = [(f["name"], self.compile(f["type"])) for f in fields]
+
+        def decode_struct(data: bytes, offset: int) -> Tuple[Any, int]:
+            values = {}
+            for name, decoder in named:
+                values[name], offset = decoder(data, offset)
+            return values, offset
+
+        return decode_struct
+
+    def _args_decoder(self, ix: Dict[str, Any]) -> Decoder:
+        key = f"ix:{ix['name']}"
+        if key not in self._decoders:
+            self._decoders[key] = self._compile_fields(ix.get("args", []))
+        return self._decoders[key]
+
+    @staticmethod
+    def _compile_primitive(name: str) -> Decoder:
+        if name in _STRUCT_FORMATS:
+            unpack = struct.Struct(_STRUCT_FORMATS[name]).unpack_from
+            size = PRIMITIVE_SIZES[name]
+
+            def decode_number(data: bytes, offset: int) -> Tuple[Any, int]:
+                return unpack(data, offset)[0], offset + size
+
+            return decode_number
+        if name == "bool":
+            return lambda data, offset: (data[offset] != 0, offset + 1)
+        if name in ("u128", "i128"):
+            signed = name == "i128"
+            return lambda data, offset: (
+                int.from_bytes(data[offset : offset + 16], "little", signed=signed),
+                offset + 16,
+            )
+        if name in ("publicKey", "pubkey"):
+            return lambda data, offset: (
+                str(Pubkey.from_bytes(data[offset : offset + 32])),
+                offset + 32,
+            )
+        if name in ("string", "bytes"):
+            is_string = name == "string"
+
+            def decode_sized(data: bytes, offset: int) -> Tuple[Any, int]:
+                (length,) = struct.unpack_from("<I", data, offset)
+                raw = data[offset + 4 : offset + 4 + length]
+                value = raw.decode("utf-8") if is_string else bytes(raw).hex()
+                return value, offset + 4 + length
+
+            return decode_sized
+        raise ValueError(f"Unsupported IDL type: {name}")
+
+    # Encoding
+
+    def instruction(self, name: str) -> Tuple[bytes, Dict[str, Any]]:
+        """Discriminator and IDL definition of an instruction, by IDL or snake_case name."""
+        disc = self.instruction_names.get(name)
+        if disc is None:
+            disc = next(
+                (d for n, d in self.instruction_names.items() if _snake_case(n) == _snake_case(name)),
+                None,
+            )
+        if disc is None:
+            raise ValueError(f"Instruction not found in IDL: {name}")
+        return disc, self.instructions[disc]
+
+    def args_encoder(self, name: str) -> Callable[[Dict[str, Any]], bytes]:
+        """Compiled ``args -> instruction data`` for an instruction, discriminator included."""
+        disc, ix = self.instruction(name)
+        key = f"ix:{ix['name']}"
+        if key not in self._encoders:
+            self._encoders[key] = self._compile_fields_encoder(ix.get("args", []))
+        encode_args = self._encoders[key]
+
+        def encode(args: Dict[str, Any]) -> bytes:
+            out = bytearray(disc)
+            encode_args(args, out)
+            return bytes(out)
+
+        return encode
+
+    def encode_instruction(self, name: str, args: Dict[str, Any]) -> bytes:
+        return self.args_encoder(name)(args)
+
+    def compile_encoder(self, type_def: Any) -> Encoder:
+        if isinstance(type_def, str):
+            return self._compile_primitive_encoder(type_def)
+        if "defined" in type_def:
+            return self._compile_defined_encoder(_defined_name(type_def))
+        if "option" in type_def:
+            inner = self.compile_encoder(type_def["option"])
+
+            def encode_option(value: Any, out: bytearray) -> None:
+                if value is None:
+                    out.append(0)
+                else:
+                    out.append(1)
+                    inner(value, out)
+
+            return encode_option
+        if "coption" in type_def:
+            inner = self.compile_encoder(type_def["coption"])
+            inner_size = self.fixed_size(type_def["coption"])
+            if inner_size is None:
+                raise ValueError(f"Unsupported COption of a variable-size type: {type_def}")
+
+            def encode_coption(value: Any, out: bytearray) -> None:
+                if value is None:
+                    out += bytes(4 + inner_size)
+                else:
+                    out += b"\x01\x00\x00\x00"
+                    inner(value, out)
+
+            return encode_coption
+        if "vec" in type_def:
+            if type_def["vec"] == "u8":
+                return self._compile_primitive_encoder("bytes")
+            inner = self.compile_encoder(type_def["vec"])
+
+            def encode_vec(value: Any, out: bytearray) -> None:
+                out += struct.pack("<I", len(value))
+                for item in value:
+                    inner(item, out)
+
+            return encode_vec
+        if "array" in type_def:
+            item_type, length = type_def["array"]
+            if item_type == "u8":
+
+                def encode_byte_array(value: Any, out: bytearray) -> None:
+                    raw = bytes.fromhex(value) if isinstance(value, str) else bytes(value)
+                    if len(raw) != length:
+                        raise ValueError(f"Expected {length} bytes, got {len(raw)}")
+                    out += raw
+
+                return encode_byte_array
+            inner = self.compile_encoder(item_type)
+
+            def encode_array(value: Any, out: bytearray) -> None:
+                if len(value) != length:
+                    raise ValueError(f"Expected {length} items, got {len(value)}")
+                for item in value:
+                    inner(item, out)
+
+            return encode_array
+        if "kind" in type_def:
+            return self._compile_type_def_encoder(type_def)
+        raise ValueError(f"Unsupported IDL type: {type_def}")
+
+    def _compile_defined_encoder(self, name: str) -> Encoder:
+        if name in self._encoders:
+            return self._encoders[name]
+        if name not in self.types:
+            raise ValueError(f"Type not found in IDL: {name}")
+
+        compiled: List[Encoder] = []
+
+        def encode_recursive(value: Any, out: bytearray) -> None:
+            compiled[0](value, out)
+
+        self._encoders[name] = encode_recursive
+        try:
+            encoder = self._compile_type_def_encoder(self.types[name])
+        except ValueError:
+            del self._encoders[name]
+            raise
+        compiled.append(encoder)
+        self._encoders[name] = encoder
+        return encoder
+
+    def _compile_type_def_encoder(self, type_def: Dict[str, Any]) -> Encoder:
+        kind = type_def.get("kind")
+        if kind == "struct":
+            return self._compile_fields_encoder(type_def.get("fields", []))
+        if kind == "enum":
+            variants = {
+                v["name"]: (
+                    index,
+                    self._compile_fields_encoder(v["fields"]) if v.get("fields") else None,
+                )
+                for index, v in enumerate(type_def.get("variants", []))
+            }
+
+            def encode_enum(value: Any, out: bytearray) -> None:
+                # A variant name, or {"variant": name, "fields": ...} as decoded
+                if isinstance(value, str):
+                    name, fields = value, None
+                else:
+                    name, fields = value["variant"], value.get("fields")
+                if name not in variants:
+                    raise ValueError(f"Unknown enum variant: {name}")
+                index, fields_encoder = variants[name]
+                out.append(index)
+                if fields_encoder is not None:
+                    fields_encoder(fields, out)
+
+            return encode_enum
+        if kind == "type":
+            return self.compile_encoder(type_def["alias"])
+        raise ValueError(f"Unsupported type kind: {kind}")
+
+    def _compile_fields_encoder(self, fields: List[Any]) -> Encoder:
+        if fields and (not isinstance(fields[0], dict) or "name" not in fields[0]):
+            encoders = [self.compile_encoder(f) for f in fields]
+
+            def encode_tuple(value: Any, out: bytearray) -> None:
+                if len(value) != len(encoders):
+                    raise ValueError(f"Expected {len(encoders)} values, got {len(value)}")
+                for encoder, item in zip(encoders, value):
+                    encoder(item, out)
+
+            return encode_tuple
+
+        named = [(f["name"], self.compile_encoder(f["type"])) for f in fields]
+
+        def encode_struct(value: Any, out: bytearray) -> None:
+            for name, encoder in named:
+                if name not in value:
+                    raise ValueError(f"Missing field: {name}")
+                encoder(value[name], out)
+
+        return encode_struct
+
+    @staticmethod
+    def _compile_primitive_encoder(name: str) -> Encoder:
+        if name in _STRUCT_FORMATS:
+            pack = struct.Struct(_STRUCT_FORMATS[name]).pack
+            convert = float if name in ("f32", "f64") else int
+
+            def encode_number(value: Any, out: bytearray) -> None:
+                try:
+                    out += pack(convert(value))
+                except struct.error:
+                    raise ValueError(f"{value} is out of range for {name}")
+
+            return encode_number
+        if name == "bool":
+
+            def encode_bool(value: Any, out: bytearray) -> None:
+                out.append(1 if value else 0)
+
+            return encode_bool
+        if name in ("u128", "i128"):
+            signed = name == "i128"
+
+            def encode_wide(value: Any, out: bytearray) -> None:
+                try:
+                    out += int(value).to_bytes(16, "little", signed=signed)
+                except OverflowError:
+                    raise ValueError(f"{value} is out of range for {name}")
+
+            return encode_wide
+        if name in ("publicKey", "pubkey"):
+
+            def encode_pubkey(value: Any, out: bytearray) -> None:
+                out += bytes(Pubkey.from_string(value))
+
+            return encode_pubkey
+        if name in ("string", "bytes"):
+            is_string = name == "string"
+
+            def encode_sized(value: Any, out: bytearray) -> None:
+                if is_string:
+                    raw = value.encode("utf-8")
+                else:
+                    raw = bytes.fromhex(value) if isinstance(value, str) else bytes(value)
+                out += struct.pack("<I", len(raw))
+                out += raw
+
+            return encode_sized
+        raise ValueError(f"Unsupported IDL type: {name}")
+
+    # Layout metadata
+
+    def fixed_size(self, type_def: Any, _seen: Optional[set] = None) -> Optional[int]:
+        """Byte size of a type, or None if it is variable-size."""
+        if isinstance(type_def, str):
+            return PRIMITIVE_SIZES.get(type_def)
+        if "array" in type_def:
+            item_size = self.fixed_size(type_def["array"][0], _seen)
+            return None if item_size is None else item_size * type_def["array"][1]
+        if "coption" in type_def:
+            inner = self.fixed_size(type_def["coption"], _seen)
+            return None if inner is None else 4 + inner
+        if "defined" in type_def:
+            name = _defined_name(type_def)
+            seen = _seen or set()
+            if name in seen or name not in self.types:
+                return None
+            return self.fixed_size(self.types[name], seen | {name})
+        kind = type_def.get("kind")
+        if kind == "struct":
+            total = 0
+            for field in type_def.get("fields", []):
+                size = self.fixed_size(
+                    field["type"] if isinstance(field, dict) and "type" in field else field,
+                    _seen,
+                )
+                if size is None:
+                    return None
+                total += size
+            return total
+        if kind == "enum":
+            # Only fieldless enums have a fixed size
+            if all(not v.get("fields") for v in type_def.get("variants", [])):
+                return 1
+            return None
+        if kind == "type":
+            return self.fixed_size(type_def["alias"], _seen)
+        return None
+
+    async def layout(self, type_name: str) -> Dict[str, Any]:
+        """
+        Flattened byte layout of a defined type: every leaf field of its
+        fixed-size prefix with its dotted path, offset, size and type. Layouts
+        are kept on the codec and in the shared cache, keyed by IDL fingerprint.
+        """
+        layout = self._layouts.get(type_name)
+        if layout is not None:
+            return layout
+        cache = get_shared_cache()
+        # v2: tuple fields are named by their index within the tuple
+        cache_key = f"{self.fingerprint}|{type_name}|v2"
+        if cache:
+            cached = await cache.aget_json("layout", cache_key)
+            if cached is not None:
+                self._layouts[type_name] = cached
+                return cached
+
+        if type_name not in self.types:
+            raise ValueError(f"Type not found in IDL: {type_name}")
+        fields: List[Dict[str, Any]] = []
+        self._collect_layout(self.types[type_name], "", 0, fields)
+        layout = {
+            "type": type_name,
+            "size": self.fixed_size({"defined": type_name}),
+            "prefix_size": fields[-1]["offset"] + fields[-1]["size"] if fields else 0,
+            "fields": fields,
+        }
+        self._layouts[type_name] = layout
+        if cache:
+            await cache.aset_json("layout", cache_key, layout)
+        return layout
+
+    def _collect_layout(
+        self, type_def: Any, path: str, offset: int, out: List[Dict[str, Any]]
+    ) -> Optional[int]:
+        # Returns the end offset, or None once a variable-size field is hit
+        if isinstance(type_def, dict) and "defined" in type_def:
+            name = _defined_name(type_def)
+            inner = self.types.get(name, {})
+            if inner.get("kind") == "struct":
+                return self._collect_layout(inner, path, offset, out)
+        if isinstance(type_def, dict) and type_def.get("kind") == "struct":
+            for i, field in enumerate(type_def.get("fields", [])):
+                if isinstance(field, dict) and "name" in field:
+                    name, field_type = field["name"], field["type"]
+                else:
+                    name, field_type = str(i), field
+                child = f"{path}.{name}" if path else name
+                offset = self._collect_layout(field_type, child, offset, out)
+                if offset is None:
+                    return None
+            return offset
+
+        size = self.fixed_size(type_def)
+        if size is None:
+            return None
+        out.append({"path": path, "offset": offset, "size": size, "type": type_def})
+        return offset + size
+
+
+_codecs: "OrderedDict[Tuple[str, str], IdlCodec]" = OrderedDict()
+MAX_CODECS = 256
+cache_stats.register("idl_codecs", lambda: {"entries": len(_codecs), "max_entries": MAX_CODECS})
+
+
+def get_codec(
+    program_id: str, idl: Dict[str, Any], fingerprint: Optional[str] = None
+) -> IdlCodec:
+    """
+    Returns the compiled codec for an IDL, reusing it while the IDL is
+    unchanged. Pass the fingerprint cached with the IDL when there is one;
+    computing it serializes the whole IDL.
+    """
+    key = (program_id, fingerprint or idl_fingerprint(idl))
+    codec = _codecs.get(key)
+    if codec is None:
+        codec = IdlCodec(idl, key[1])
+        _codecs[key] = codec
+        while len(_codecs) > MAX_CODECS:
+            _codecs.popitem(last=False)
+    else:
+        _codecs.move_to_end(key)
+    return codec
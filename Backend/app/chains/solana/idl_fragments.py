@@ -0,0 +1,190 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .idl_loader import SolanaIDLLoader
+from ...core.configs import settings
+from ...utils import cache_stats
+from ...utils.shared_cache import get_shared_cache
+
+IDL_SECTIONS = ("instructions", "accounts", "types", "events", "errors", "raw_idl")
+# "names" is a modifier: selected sections list only their item names
+IDL_FIELDS = IDL_SECTIONS + ("names",)
+METHOD_FIELDS = ("name", "discriminator", "accounts", "args")
+MAX_FRAGMENT_SETS = 256
+
+_fragments: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+cache_stats.register(
+    "idl_fragments", lambda: {"entries": len(_fragments), "max_entries": MAX_FRAGMENT_SETS}
+)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def build_fragments(idl_loader: SolanaIDLLoader, idl: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Serializes every selectable part of an IDL response once: each section,
+    each section's names, each instruction attribute and the raw IDL.
+    Responses are then assembled by joining strings.
+    """
+    instructions = idl_loader.parse_instructions(idl)
+    sections = {
+        "instructions": [
+            {
+                "name": ix["name"],
+                "discriminator": ix.get("discriminator"),
+                "accounts": ix["accounts"],
+                "args": ix["args"],
+            }
+            for ix in instructions
+        ],
+        "accounts": [
+            {"name": acc["name"], "type_def": acc.get("type") or {}}
+            for acc in idl_loader.parse_accounts(idl)
+        ],
+        "types": [
+            {"name": t["name"], "type_def": t.get("type") or {}}
+            for t in idl_loader.parse_types(idl)
+        ],
+        "events": idl_loader.parse_events(idl),
+        "errors": idl_loader.parse_errors(idl),
+    }
+    return {
+        "version": _dumps(idl.get("version")),
+        "name": _dumps(idl.get("name")),
+        "sections": {name: _dumps(items) for name, items in sections.items()},
+        "names": {
+            name: _dumps([{"name": item.get("name")} for item in items])
+            for name, items in sections.items()
+        },
+        "instruction_order": [ix["name"] for ix in sections["instructions"]],
+        "instructions": {
+            ix["name"]: {field: _dumps(ix[field]) for field in METHOD_FIELDS}
+            for ix in sections["instructions"]
+        },
+        "raw_idl": _dumps(idl),
+    }
+
+
+async def get_idl_fragments(
+    idl_loader: SolanaIDLLoader, program_id: str, force: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Fragments for a program's IDL from memory, then the shared cache, then a
+    fresh fetch. ``force`` rebuilds them from the IDL in the shared cache.
+    """
+    key = f"{idl_loader.rpc_url}|{program_id}"
+    entry = _fragments.get(key)
+    if not force and entry is not None and entry[1] > time.monotonic():
+        _fragments.move_to_end(key)
+        return entry[0]
+
+    cache = get_shared_cache()
+    fragments = await cache.aget_json("idl_fragments", key) if cache and not force else None
+    if fragments is None:
+        idl = await idl_loader.fetch_idl(program_id)
+        if not idl:
+            return None
+        fragments = await asyncio.to_thread(build_fragments, idl_loader, idl)
+        if cache:
+            await cache.aset_json(
+                "idl_fragments", key, fragments, settings.IDL_CACHE_TTL_SECONDS
+            )
+
+    _fragments[key] = (fragments, time.monotonic() + settings.IDL_CACHE_TTL_SECONDS)
+    _fragments.move_to_end(key)
+    while len(_fragments) > MAX_FRAGMENT_SETS:
+        _fragments.popitem(last=False)
+    return fragments
+
+
+def parse_selection(value: Optional[str], allowed: Iterable[str]) -> Optional[Set[str]]:
+    """Comma-separated selection, or None when absent. Raises ValueError on unknown names."""
+    if not value:
+        return None
+    selected = {part.strip() for part in value.split(",") if part.strip()}
+    unknown = selected - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s) {', '.join(sorted(unknown))}; expected {', '.join(allowed)}"
+        )
+    return selected
+
+
+def _instruction_names(fragments: Dict[str, Any], wanted: Optional[List[str]]) -> List[str]:
+    if wanted is None:
+        return fragments["instruction_order"]
+    missing = [name for name in wanted if name not in fragments["instructions"]]
+    if missing:
+        raise KeyError(f"Instruction not found: {', '.join(missing)}")
+    return wanted
+
+
+def _instruction_list(
+    fragments: Dict[str, Any], names: List[str], fields: Iterable[str]
+) -> str:
+    items = []
+    for name in names:
+        attrs = fragments["instructions"][name]
+        items.append("{" + ",".join(f'"{f}":{attrs[f]}' for f in fields) + "}")
+    return "[" + ",".join(items) + "]"
+
+
+def render_idl(
+    fragments: Dict[str, Any],
+    program_id: str,
+    fields: Optional[Set[str]] = None,
+    instructions: Optional[List[str]] = None,
+) -> str:
+    """
+    IDLResponse JSON for the selected sections. No selection returns every
+    section plus raw_idl; ``instruction=`` alone returns just those
+    instructions; ``names`` alone lists the names in every section.
+    """
+    if fields is None:
+        fields = {"instructions"} if instructions else set(IDL_SECTIONS)
+    names_only = "names" in fields
+    sections = fields - {"names"} or set(IDL_SECTIONS) - {"raw_idl"}
+
+    parts = [
+        f'"chain":"solana","program_id":{_dumps(program_id)}',
+        f'"version":{fragments["version"]},"name":{fragments["name"]}',
+    ]
+    for section in IDL_SECTIONS:
+        if section not in sections:
+            continue
+        if section == "raw_idl":
+            fragment = fragments["raw_idl"]
+        elif section == "instructions" and instructions is not None:
+            names = _instruction_names(fragments, instructions)
+            fragment = _instruction_list(
+                fragments, names, ("name",) if names_only else METHOD_FIELDS
+            )
+        elif names_only:
+            fragment = fragments["names"][section]
+        else:
+            fragment = fragments["sections"][section]
+        parts.append(f'"{section}":{fragment}')
+    return "{" + ",".join(parts) + "}"
+
+
+def render_methods(
+    fragments: Dict[str, Any],
+    program_id: str,
+    fields: Optional[Set[str]] = None,
+    instructions: Optional[List[str]] = None,
+) -> str:
+    """IDLMethodsResponse JSON with the selected instruction attributes (name is always included)."""
+    selected = [f for f in METHOD_FIELDS if fields is None or f in fields or f == "name"]
+    names = _instruction_names(fragments, instructions)
+    if fields is None and instructions is None:
+        methods = fragments["sections"]["instructions"]
+    else:
+        methods = _instruction_list(fragments, names, selected)
+    return (
+        f'{{"chain":"solana","program_id":{_dumps(program_id)},"methods":{methods}}}'
+    )
@@ -1,13 +1,19 @@
-from http import client
 import json
 import zlib
 import base64
+import struct
 import hashlib
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 from solders.pubkey import Pubkey
 from solana.rpc.async_api import AsyncClient
 from ..base.idl_loader import BaseIDLLoader
+from .idl_codec import idl_fingerprint
 from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+from ...utils import cache_stats
+from ...utils.executors import run_cpu
+from ...utils.shared_cache import get_shared_cache
 from anchorpy.provider import Provider, Wallet
 from anchorpy.program.core import Program
 from anchorpy import Idl
@@ -15,12 +21,62 @@ from anchorpy import Idl
 
 ANCHOR_IDL_SEED = b"anchor:idl"
 ANCHOR_DISCRIMINATOR_SIZE = 8
+# discriminator (8) + authority (32) + compressed data length (u32)
+IDL_ACCOUNT_HEADER_SIZE = ANCHOR_DISCRIMINATOR_SIZE + 32 + 4
 
 
-def get_idl_address(program_id: str) -> Tuple[Pubkey, int]:
+@lru_cache(maxsize=4096)
+def get_idl_address(program_id: str) -> Pubkey:
+    """
+    Anchor stores the IDL at create_with_seed(base, "anchor:idl", program_id),
+    where base is the program's empty-seed PDA.
+    """
     program_pubkey = Pubkey.from_string(program_id)
-    seeds = [ANCHOR_IDL_SEED]
-    return Pubkey.find_program_address(seeds, program_pubkey)
+    base, _ = Pubkey.find_program_address([], program_pubkey)
+    return Pubkey.create_with_seed(base, ANCHOR_IDL_SEED.decode(), program_pubkey)
+
+
+cache_stats.register("idl_addresses", lambda: get_idl_address.cache_info()._asdict())
+
+
+def decode_idl_account(data: bytes) -> Dict[str, Any]:
+    """
+    Decodes raw IDL account data (discriminator, authority, length-prefixed
+    zlib payload) into a normalized IDL dictionary.
+    """
+    if len(data) < IDL_ACCOUNT_HEADER_SIZE:
+        raise ValueError("IDL account data is too short")
+    (data_len,) = struct.unpack_from("<I", data, IDL_ACCOUNT_HEADER_SIZE - 4)
+    compressed = data[IDL_ACCOUNT_HEADER_SIZE : IDL_ACCOUNT_HEADER_SIZE + data_len]
+    return normalize_idl(json.loads(zlib.decompress(compressed)))
+
+
+def is_new_idl_format(idl: Dict[str, Any]) -> bool:
+    """Anchor 0.30+ IDLs carry the program address and a metadata.spec block."""
+    return "address" in idl or "spec" in idl.get("metadata", {})
+
+
+def normalize_idl(idl: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lifts the fields the routers read (name, version, account types) to the
+    same place for legacy and 0.30+ IDLs. The original keys are kept as-is.
+    """
+    if not is_new_idl_format(idl):
+        return idl
+
+    normalized = dict(idl)
+    metadata = idl.get("metadata", {})
+    normalized.setdefault("name", metadata.get("name"))
+    normalized.setdefault("version", metadata.get("version"))
+
+    # 0.30+ account entries only hold name + discriminator; the layout lives
+    # in `types` under the same name.
+    types_by_name = {t.get("name"): t.get("type") for t in idl.get("types", [])}
+    normalized["accounts"] = [
+        {**acc, "type": acc.get("type") or types_by_name.get(acc.get("name"))}
+        for acc in idl.get("accounts", [])
+    ]
+    return normalized
 
 
 def compute_discriminator(name: str, prefix: str = "global") -> bytes:
@@ -33,13 +89,75 @@ class SolanaIDLLoader(BaseIDLLoader):
         self.rpc_client = rpc_client
         self.rpc_url = rpc_client.rpc_url
 
-    async def fetch_idl(self, program_id: str):
-        client = AsyncClient(self.rpc_url)
+    async def fetch_idl(self, program_id: str, force: bool = False):
+        """The program's IDL from the shared cache, or from chain (always with ``force``)."""
+        entry = await self.fetch_idl_entry(program_id, force)
+        return entry[0] if entry else None
+
+    async def fetch_idl_entry(
+        self, program_id: str, force: bool = False
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        ``(idl, fingerprint)`` like fetch_idl. The fingerprint is computed once
+        when the IDL is fetched from chain and cached alongside it, so codec
+        lookups don't re-serialize the IDL.
+        """
+        cache = get_shared_cache()
+        cache_key = f"{self.rpc_url}|{program_id}"
+        if cache and not force:
+            cached = await cache.aget_json("idl", cache_key)
+            # Entries from before fingerprints were stored are refetched
+            if cached is not None and "fingerprint" in cached:
+                return cached["idl"], cached["fingerprint"]
+
+        idl_dict = await self.fetch_idl_native(program_id)
+        if idl_dict is None:
+            return None
+        fingerprint = idl_fingerprint(idl_dict)
+        if cache:
+            await cache.aset_json(
+                "idl",
+                cache_key,
+                {"fingerprint": fingerprint, "idl": idl_dict},
+                settings.IDL_CACHE_TTL_SECONDS,
+            )
+        return idl_dict, fingerprint
+
+    async def fetch_idl_native(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Reads the IDL account through the RPC client and decodes it directly,
+        without building an anchorpy Program. Supports legacy and 0.30+ IDLs.
+        """
+        idl_address = get_idl_address(program_id)
+        account = await self.rpc_client.get_account_info(str(idl_address), "base64")
+        if not account or not account.get("data"):
+            return None
+        raw = base64.b64decode(account["data"][0])
+        # Sized by the inflated JSON; IDLs compress roughly 8x
+        return await run_cpu(decode_idl_account, raw, size=len(raw) * 8)
+
+    async def fetch_idl_anchorpy(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetches the IDL through anchorpy's Program plumbing. Kept as a
+        reference path for benchmarks; only understands legacy IDLs. solana-py
+        has no transport hook, so this always talks to ``rpc_url`` directly and
+        refuses to run under a fake, record or replay transport.
+        """
+        if self.rpc_client.transport is not None:
+            raise ValueError("anchorpy fetch cannot use the configured RPC transport")
+        client = self._async_client()
         provider = Provider(client, Wallet.dummy())
-        idl = await Program.fetch_idl(Pubkey.from_string(program_id), provider)
+        try:
+            idl = await Program.fetch_idl(Pubkey.from_string(program_id), provider)
+        finally:
+            await client.close()
 
         return json.loads(idl.to_json()) if idl else None
 
+    def _async_client(self) -> AsyncClient:
+        """solana-py client for anchorpy, with the RPC client's endpoint and timeout."""
+        return AsyncClient(self.rpc_url, timeout=self.rpc_client.timeout)
+
     async def get_idl_with_fallback(
         self, program_id: str, idl_content: Optional[Dict[str, Any]] = None
     ) -> Optional[Dict[str, Any]]:
@@ -50,12 +168,24 @@ class SolanaIDLLoader(BaseIDLLoader):
             return idl_content
         return await self.fetch_idl(program_id)
 
-    def get_program(self, program_id: str, idl_dict: Dict[str, Any]) -> Program:
+    async def get_idl_entry_with_fallback(
+        self, program_id: str, idl_content: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        ``(idl, fingerprint)`` like get_idl_with_fallback; the fingerprint is
+        None for provided content.
+        """
+        if idl_content:
+            return idl_content, None
+        return await self.fetch_idl_entry(program_id)
+
+    async def get_program(self, program_id: str, idl_dict: Dict[str, Any]) -> Program:
         """
         Constructs an Anchor Program instance from a provided IDL dictionary.
         """
-        idl = Idl.from_json(json.dumps(idl_dict))
-        client = AsyncClient(self.rpc_url)
+        raw = json.dumps(idl_dict)
+        idl = await run_cpu(Idl.from_json, raw, size=len(raw))
+        client = self._async_client()
         provider = Provider(client, Wallet.dummy())
         return Program(idl, Pubkey.from_string(program_id), provider)
 
@@ -0,0 +1,379 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import base58
+import httpx
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from .decoded_store import decoded_store, rows_from_ingest
+from .idl_codec import ANCHOR_DISCRIMINATOR_SIZE, IdlCodec
+from .rpc_client import SolanaRPCClient, SolanaRPCError
+from .tx_decoder import (
+    EVENT_IX_TAG,
+    account_metas,
+    decode_event,
+    decode_instruction,
+    logged_events,
+)
+from ...core.configs import settings
+from ...utils.ordered import ordered_map
+
+logger = logging.getLogger(__name__)
+
+# getBlock errors for slots that produced no block (or were pruned from storage)
+SKIPPED_SLOT_CODES = (-32007, -32009)
+# getBlocks accepts ranges of up to 500,000 slots; smaller pages start streaming sooner
+GET_BLOCKS_PAGE = 10_000
+
+_OUTPUT_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class BlockIngestor:
+    """
+    Streams one program's instructions and events over a slot range. Blocks
+    are fetched with up to ``concurrency`` getBlock calls in flight and
+    yielded in slot order, so the last yielded slot is always a safe resume
+    point. With ``store`` the records are also written to the decoded store.
+    """
+
+    def __init__(
+        self,
+        rpc_client: SolanaRPCClient,
+        program_id: str,
+        codec: Optional[IdlCodec] = None,
+        concurrency: int = 8,
+        include_failed: bool = False,
+        include_events: bool = True,
+        commitment: str = "finalized",
+        store: bool = False,
+    ):
+        self.rpc_client = rpc_client
+        self.program_id = program_id
+        self.program_key = bytes(Pubkey.from_string(program_id))
+        self.codec = codec
+        self.concurrency = concurrency
+        self.include_failed = include_failed
+        self.include_events = include_events
+        self.commitment = commitment
+        self.store = store and settings.DECODED_STORE_ENABLED
+        self.blocks = 0
+        self.skipped = 0
+        self.transactions = 0
+
+    async def slots(self, start_slot: int, end_slot: int) -> AsyncIterator[int]:
+        """Slots in the range that produced a block, one getBlocks page at a time."""
+        page_start = start_slot
+        while page_start <= end_slot:
+            page_end = min(page_start + GET_BLOCKS_PAGE - 1, end_slot)
+            for slot in await self.rpc_client.get_blocks(page_start, page_end, self.commitment):
+                yield slot
+            page_start = page_end + 1
+
+    async def fetch(self, slot: int) -> Optional[Dict[str, Any]]:
+        """The block at ``slot``, or None when it was skipped. Transient errors are retried."""
+        retries = settings.INGEST_BLOCK_RETRIES
+        for attempt in range(retries + 1):
+            try:
+                return await self.rpc_client.get_block(slot, self.commitment)
+            except SolanaRPCError as e:
+                if e.code in SKIPPED_SLOT_CODES:
+                    return None
+                if attempt == retries:
+                    raise
+            except httpx.HTTPError:
+                if attempt == retries:
+                    raise
+            await asyncio.sleep(0.2 * 2**attempt)
+        return None
+
+    async def run(
+        self, start_slot: int, end_slot: int
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yields ``(slot, records)`` for every produced slot in the range, in order."""
+        async for slot, block in ordered_map(
+            self.slots(start_slot, end_slot), self.fetch, self.concurrency
+        ):
+            records = self.extract(slot, block)
+            if self.store:
+                await decoded_store.write(rows_from_ingest(records))
+            yield slot, records
+
+    def extract(self, slot: int, block: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if block is None:
+            self.skipped += 1
+            return []
+        self.blocks += 1
+        records: List[Dict[str, Any]] = []
+        for entry in block.get("transactions") or []:
+            meta = entry.get("meta") or {}
+            failed = meta.get("err") is not None
+            if failed and not self.include_failed:
+                continue
+            raw = base64.b64decode(entry["transaction"][0])
+            loaded = meta.get("loadedAddresses") or {}
+            # Cheap filter before parsing: the program must be a static key or a loaded address
+            if self.program_key not in raw and self.program_id not in (
+                loaded.get("writable", []) + loaded.get("readonly", [])
+            ):
+                continue
+            self.transactions += 1
+            tx = VersionedTransaction.from_bytes(raw)
+            account_keys = account_metas(
+                tx.message, loaded.get("writable", []), loaded.get("readonly", [])
+            )
+            context = {
+                "slot": slot,
+                "block_time": block.get("blockTime"),
+                "signature": str(tx.signatures[0]),
+                "failed": failed,
+            }
+            records += self._transaction_records(tx, meta, account_keys, context)
+        return records
+
+    def _transaction_records(
+        self,
+        tx: VersionedTransaction,
+        meta: Dict[str, Any],
+        account_keys: List[Dict[str, Any]],
+        context: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        records = []
+        overrides = {self.program_id: self.codec} if self.codec else {}
+
+        def add_instruction(index: int, inner_index: Optional[int], data: bytes, accounts: List[int]):
+            if data[:ANCHOR_DISCRIMINATOR_SIZE] == EVENT_IX_TAG:
+                if self.include_events:
+                    records.append(self._event(data[ANCHOR_DISCRIMINATOR_SIZE:], "cpi", context))
+                return
+            metas = [dict(account_keys[a]) for a in accounts]
+            decoded = decode_instruction(
+                self.rpc_client.rpc_url, index, self.program_id, data, metas, overrides
+            )
+            records.append({"type": "instruction", **context, "inner_index": inner_index, **decoded})
+
+        for i, ix in enumerate(tx.message.instructions):
+            if account_keys[ix.program_id_index]["pubkey"] == self.program_id:
+                add_instruction(i, None, bytes(ix.data), list(bytes(ix.accounts)))
+        for group in meta.get("innerInstructions") or []:
+            for j, ix in enumerate(group.get("instructions", [])):
+                if account_keys[ix["programIdIndex"]]["pubkey"] == self.program_id:
+                    add_instruction(group["index"], j, base58.b58decode(ix["data"]), ix["accounts"])
+
+        if self.include_events:
+            for program_id, payload in logged_events(meta.get("logMessages") or []):
+                if program_id == self.program_id:
+                    records.append(self._event(payload, "log", context))
+        return records
+
+    def _event(self, data: bytes, source: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": "event", **context, **decode_event(self.codec, self.program_id, data, source)}
+
+    def stats(self) -> Dict[str, int]:
+        return {"blocks": self.blocks, "skipped": self.skipped, "transactions": self.transactions}
+
+
+def dumps_record(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+async def stream_ndjson(
+    ingestor: BlockIngestor, start_slot: int, end_slot: int
+) -> AsyncIterator[str]:
+    """
+    NDJSON records followed by ``checkpoint`` lines carrying the last
+    completed slot; a client that disconnects resumes from the next slot.
+    Failures end the stream with an ``error`` line.
+    """
+    last_slot: Optional[int] = None
+    saved_at = time.monotonic()
+    try:
+        async for slot, records in ingestor.run(start_slot, end_slot):
+            last_slot = slot
+            lines = "".join(dumps_record(r) for r in records)
+            if time.monotonic() - saved_at >= settings.INGEST_CHECKPOINT_SECONDS:
+                lines += dumps_record({"type": "checkpoint", "last_slot": slot})
+                saved_at = time.monotonic()
+            if lines:
+                yield lines
+        yield dumps_record({"type": "checkpoint", "last_slot": end_slot, **ingestor.stats()})
+    except Exception as e:
+        logger.warning("Streaming ingestion failed: %s", e)
+        yield dumps_record({"type": "error", "error": str(e), "last_slot": last_slot})
+    finally:
+        await ingestor.rpc_client.close()
+
+
+def output_path(name: str) -> str:
+    """Path of a named ingestion output under INGEST_OUTPUT_DIR."""
+    if not _OUTPUT_NAME.match(name) or name.startswith("."):
+        raise ValueError("output must be a file name of letters, digits, '.', '_' or '-'")
+    if not name.endswith(".ndjson"):
+        name += ".ndjson"
+    return os.path.join(settings.INGEST_OUTPUT_DIR, name)
+
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+@dataclass
+class IngestJob:
+    name: str
+    path: str
+    rpc_url: str
+    program_id: str
+    start_slot: int
+    end_slot: int
+    status: str = "running"  # running, done, failed or cancelled
+    last_slot: Optional[int] = None
+    records: int = 0
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    ingestor: Optional[BlockIngestor] = field(default=None, repr=False)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "program_id": self.program_id,
+            "start_slot": self.start_slot,
+            "end_slot": self.end_slot,
+            "status": self.status,
+            "last_slot": self.last_slot,
+            "records": self.records,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            **(self.ingestor.stats() if self.ingestor else {}),
+        }
+
+
+class IngestJobs:
+    """
+    Background ingestions writing NDJSON files. Each file has a checkpoint
+    next to it holding the last completed slot and the file size at that
+    point; resuming truncates the file back to that size and continues from
+    the next slot, so output is never duplicated.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, IngestJob] = {}
+
+    def start(self, name: str, ingestor: BlockIngestor, start_slot: int, end_slot: int, resume: bool) -> IngestJob:
+        path = output_path(name)
+        current = self._jobs.get(path)
+        if current is not None and current.status == "running":
+            raise ValueError(f"Ingestion {name} is already running")
+
+        checkpoint = _read_checkpoint(path + ".checkpoint") if resume else None
+        if checkpoint is not None:
+            if checkpoint["program_id"] != ingestor.program_id:
+                raise ValueError(
+                    f"Checkpoint for {name} is for program {checkpoint['program_id']}"
+                )
+            start_slot = checkpoint["last_slot"] + 1
+            end_slot = checkpoint["end_slot"]
+
+        job = IngestJob(
+            name=name,
+            path=path,
+            rpc_url=ingestor.rpc_client.rpc_url,
+            program_id=ingestor.program_id,
+            start_slot=checkpoint["start_slot"] if checkpoint else start_slot,
+            end_slot=end_slot,
+            last_slot=checkpoint["last_slot"] if checkpoint else None,
+            records=checkpoint["records"] if checkpoint else 0,
+            ingestor=ingestor,
+        )
+        offset = checkpoint["offset"] if checkpoint else 0
+        job.task = asyncio.create_task(self._run(job, start_slot, offset))
+        self._jobs[path] = job
+        return job
+
+    def get(self, name: str) -> Optional[IngestJob]:
+        return self._jobs.get(output_path(name))
+
+    def all(self) -> List[IngestJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, name: str) -> Optional[IngestJob]:
+        job = self.get(name)
+        if job is not None and job.task is not None and not job.task.done():
+            job.task.cancel()
+        return job
+
+    async def shutdown(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: IngestJob, start_slot: int, offset: int) -> None:
+        os.makedirs(os.path.dirname(job.path), exist_ok=True)
+        checkpoint_path = job.path + ".checkpoint"
+        ingestor = job.ingestor
+        f = open(job.path, "ab")
+        f.truncate(offset)
+        f.seek(offset)
+        saved_at = time.monotonic()
+
+        def save(last_slot: int) -> Dict[str, Any]:
+            f.flush()
+            return {
+                "program_id": job.program_id,
+                "rpc_url": job.rpc_url,
+                "start_slot": job.start_slot,
+                "end_slot": job.end_slot,
+                "last_slot": last_slot,
+                "offset": f.tell(),
+                "records": job.records,
+            }
+
+        try:
+            async for slot, records in ingestor.run(start_slot, job.end_slot):
+                if records:
+                    f.write("".join(dumps_record(r) for r in records).encode("utf-8"))
+                    job.records += len(records)
+                job.last_slot = slot
+                if time.monotonic() - saved_at >= settings.INGEST_CHECKPOINT_SECONDS:
+                    await asyncio.to_thread(_write_checkpoint, checkpoint_path, save(slot))
+                    saved_at = time.monotonic()
+            # Skipped slots after the last produced block are complete too
+            job.last_slot = job.end_slot
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.warning("Ingestion %s failed: %s", job.name, e)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            if job.last_slot is not None:
+                _write_checkpoint(checkpoint_path, save(job.last_slot))
+            f.close()
+            job.finished_at = time.time()
+            await ingestor.rpc_client.close()
+
+
+ingest_jobs = IngestJobs()
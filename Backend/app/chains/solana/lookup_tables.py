@@ -0,0 +1,66 @@
+import base64
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from solders.address_lookup_table_account import AddressLookupTable
+
+from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+from ...utils import cache_stats
+
+
+class LookupTableCache:
+    """
+    Address lookup table contents per RPC endpoint. Tables are append-only,
+    so cached addresses never go stale; a table is refetched only when an
+    index points past the addresses we hold.
+    """
+
+    def __init__(self, max_tables: int):
+        self.max_tables = max_tables
+        self._tables: "OrderedDict[Tuple[str, str], List[str]]" = OrderedDict()
+        self.hits = 0
+        self.fetches = 0
+
+    async def resolve(
+        self, rpc_client: SolanaRPCClient, address: str, indexes: List[int]
+    ) -> List[str]:
+        """Addresses at ``indexes`` in the table, in the same order."""
+        key = (rpc_client.rpc_url, address)
+        addresses = self._tables.get(key)
+        if addresses is None or (indexes and max(indexes) >= len(addresses)):
+            addresses = await self._fetch(rpc_client, address)
+            self._tables[key] = addresses
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        else:
+            self.hits += 1
+        self._tables.move_to_end(key)
+
+        if indexes and max(indexes) >= len(addresses):
+            raise ValueError(
+                f"Lookup table {address} has {len(addresses)} addresses, index {max(indexes)} requested"
+            )
+        return [addresses[i] for i in indexes]
+
+    def cached(self, rpc_url: str, address: str, indexes: List[int]) -> Optional[List[str]]:
+        """Like ``resolve`` without fetching: None unless the held addresses cover ``indexes``."""
+        addresses = self._tables.get((rpc_url, address))
+        if addresses is None or (indexes and max(indexes) >= len(addresses)):
+            return None
+        return [addresses[i] for i in indexes]
+
+    def stats(self) -> Dict[str, int]:
+        return {"tables": len(self._tables), "hits": self.hits, "fetches": self.fetches}
+
+    async def _fetch(self, rpc_client: SolanaRPCClient, address: str) -> List[str]:
+        self.fetches += 1
+        info = await rpc_client.get_account_info(address, "base64")
+        if not info:
+            raise ValueError(f"Lookup table not found: {address}")
+        table = AddressLookupTable.deserialize(base64.b64decode(info["data"][0]))
+        return [str(pubkey) for pubkey in table.addresses]
+
+
+lookup_table_cache = LookupTableCache(settings.LOOKUP_TABLE_CACHE_SIZE)
+cache_stats.register("lookup_tables", lookup_table_cache.stats)
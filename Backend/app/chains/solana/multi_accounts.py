@@ -0,0 +1,166 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from .account_data import ZSTD_ENCODING, account_bytes, data_len, get_multiple_accounts
+from .idl_codec import IdlCodec
+from .projection import MULTIPLE_ACCOUNTS_LIMIT
+from .rpc_client import SolanaRPCClient
+from ...utils.executors import run_cpu
+from ...utils.ordered import ordered_map
+
+logger = logging.getLogger(__name__)
+
+
+class MultiAccountReader:
+    """
+    Reads any number of accounts with getMultipleAccounts: pubkeys go out in
+    chunks of 100 with up to ``concurrency`` calls in flight, and results
+    come back in input order, None for accounts that don't exist. With a
+    codec, accounts whose discriminator it knows are decoded (only those
+    owned by ``owner`` when one is given).
+    """
+
+    def __init__(
+        self,
+        rpc_client: SolanaRPCClient,
+        encoding: str = "base64",
+        data_slice: Optional[Tuple[int, int]] = None,
+        concurrency: int = 8,
+        codec: Optional[IdlCodec] = None,
+        owner: Optional[str] = None,
+    ):
+        if codec is not None and (encoding not in ("base64", ZSTD_ENCODING) or data_slice):
+            raise ValueError("Decoding needs whole accounts in base64 or base64+zstd")
+        self.rpc_client = rpc_client
+        self.encoding = encoding
+        self.data_slice = data_slice
+        self.concurrency = concurrency
+        self.codec = codec
+        self.owner = owner
+        self.calls = 0
+        self.found = 0
+        self.missing = 0
+        self.slot: Optional[int] = None
+
+    async def chunks(
+        self, pubkeys: Sequence[str]
+    ) -> AsyncIterator[Tuple[int, List[Optional[Dict[str, Any]]]]]:
+        """``(index of the chunk's first pubkey, entries)`` per chunk, in input order."""
+
+        async def starts() -> AsyncIterator[int]:
+            for start in range(0, len(pubkeys), MULTIPLE_ACCOUNTS_LIMIT):
+                yield start
+
+        async def fetch(start: int) -> List[Optional[Dict[str, Any]]]:
+            return await self._fetch(pubkeys[start : start + MULTIPLE_ACCOUNTS_LIMIT])
+
+        async for start, entries in ordered_map(starts(), fetch, self.concurrency):
+            yield start, entries
+
+    async def read(self, pubkeys: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        entries: List[Optional[Dict[str, Any]]] = []
+        async for _, chunk in self.chunks(pubkeys):
+            entries.extend(chunk)
+        return entries
+
+    async def _fetch(self, pubkeys: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        result = await get_multiple_accounts(
+            self.rpc_client, list(pubkeys), self.encoding, self.data_slice
+        )
+        self.calls += 1
+        slot = result.get("context", {}).get("slot")
+        if slot is not None:
+            # Every value is at least as recent as the oldest call's slot
+            self.slot = slot if self.slot is None else min(self.slot, slot)
+
+        entries: List[Optional[Dict[str, Any]]] = []
+        for pubkey, value in zip(pubkeys, result["value"]):
+            if value is None:
+                self.missing += 1
+                entries.append(None)
+                continue
+            self.found += 1
+            data = value.get("data")
+            entries.append(
+                {
+                    "pubkey": pubkey,
+                    "lamports": value.get("lamports", 0),
+                    "owner": value.get("owner", ""),
+                    "executable": value.get("executable", False),
+                    "rent_epoch": value.get("rentEpoch", 0),
+                    "data": data[0] if isinstance(data, list) and data else data,
+                    "data_len": await data_len(value),
+                }
+            )
+        if self.codec is not None:
+            await self._decode(entries, result["value"])
+        return entries
+
+    async def _decode(
+        self, entries: List[Optional[Dict[str, Any]]], values: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        targets = [
+            (entry, value)
+            for entry, value in zip(entries, values)
+            if entry is not None and (self.owner is None or entry["owner"] == self.owner)
+        ]
+        blobs = [await account_bytes(value) for _, value in targets]
+        decoded = await run_cpu(self._decode_all, blobs, size=sum(len(b) for b in blobs))
+        for (entry, _), (account_type, fields, error) in zip(targets, decoded):
+            entry.update(account_type=account_type, decoded=fields)
+            if error:
+                entry["decode_error"] = error
+
+    def _decode_all(self, blobs: List[bytes]) -> List[Tuple[Optional[str], Any, Optional[str]]]:
+        out = []
+        for blob in blobs:
+            try:
+                result = self.codec.decode_account(blob)
+            except Exception as e:
+                out.append((None, None, str(e)))
+                continue
+            out.append((result[0], result[1], None) if result else (None, None, None))
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slot": self.slot,
+            "found": self.found,
+            "missing": self.missing,
+            "rpc_calls": self.calls,
+        }
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+
+async def stream_accounts(reader: MultiAccountReader, pubkeys: Sequence[str]) -> AsyncIterator[str]:
+    """
+    NDJSON ``account`` lines in input order, one per pubkey (``account`` is
+    null when it doesn't exist), then a ``summary`` line. Failures end the
+    stream with an ``error`` line whose ``next_index`` is the first pubkey
+    not returned.
+    """
+    next_index = 0
+    try:
+        async for start, entries in reader.chunks(pubkeys):
+            yield "".join(
+                _line(
+                    {
+                        "type": "account",
+                        "index": start + i,
+                        "pubkey": pubkeys[start + i],
+                        "account": entry,
+                    }
+                )
+                for i, entry in enumerate(entries)
+            )
+            next_index = start + len(entries)
+        yield _line({"type": "summary", **reader.stats()})
+    except Exception as e:
+        logger.warning("Multi-account read failed at index %d: %s", next_index, e)
+        yield _line({"type": "error", "error": str(e), "next_index": next_index})
+    finally:
+        await reader.rpc_client.close()
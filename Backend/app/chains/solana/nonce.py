@@ -0,0 +1,274 @@
+import asyncio
+import base64
+import json
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+
+from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+from ...utils.shared_cache import SharedCache, get_shared_cache
+
+# Versions (u32) + State (u32) + authority (32) + durable nonce (32) + lamports_per_signature (u64)
+NONCE_ACCOUNT_SIZE = 80
+NONCE_STATE_INITIALIZED = 1
+
+
+def parse_nonce_account(data: bytes) -> Dict[str, str]:
+    if len(data) < NONCE_ACCOUNT_SIZE:
+        raise ValueError("Account data is too short for a nonce account")
+    (state,) = struct.unpack_from("<I", data, 4)
+    if state != NONCE_STATE_INITIALIZED:
+        raise ValueError("Nonce account is not initialized")
+    return {
+        "authority": str(Pubkey.from_bytes(data[8:40])),
+        "nonce": str(Hash.from_bytes(data[40:72])),
+    }
+
+
+@dataclass
+class NonceAccount:
+    address: str
+    authority: Optional[str] = None
+    nonce: Optional[str] = None
+    in_use: bool = False
+    fetched_at: Optional[float] = None
+    uses: int = 0
+    # Nonce consumed by the last sent transaction, until the chain shows a newer one
+    spent: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.nonce is not None and self.spent is None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "address": self.address,
+            "authority": self.authority,
+            "nonce": self.nonce,
+            "in_use": self.in_use,
+            "uses": self.uses,
+            "awaiting_advance": self.spent is not None,
+        }
+
+
+# Shared-cache namespaces: registrations and nonce state (entries) and
+# checkouts (leases), all keyed "rpc_url|address"
+ACCOUNT_NAMESPACE = "nonce_account"
+STATE_NAMESPACE = "nonce_state"
+LEASE_NAMESPACE = "nonce"
+
+
+def _shared_key(rpc_url: str, address: str) -> str:
+    return f"{rpc_url}|{address}"
+
+
+class NoncePool:
+    """
+    Durable nonce accounts registered per RPC endpoint, with their current
+    nonce values cached so transactions can be built without fetching a
+    blockhash. A nonce is consumed once a transaction using it lands, so
+    accounts released as used are refreshed before they are handed out again,
+    and are only handed out once the refresh shows a nonce other than the one
+    used: until the transaction lands the chain still reports the old value.
+
+    Registrations, checkouts and nonce values are kept in the shared cache,
+    so every worker on the host hands out each account to one caller at a
+    time. Checkouts are leases that lapse after ``lease_seconds`` if never
+    released. Without the shared cache the pool is per process and must be
+    run with a single worker.
+    """
+
+    def __init__(self, lease_seconds: float):
+        self.lease_seconds = lease_seconds
+        self._accounts: Dict[str, Dict[str, NonceAccount]] = {}
+
+    async def register(
+        self, rpc_url: str, address: str, authority: Optional[str] = None
+    ) -> NonceAccount:
+        Pubkey.from_string(address)
+        account = self._register_local(rpc_url, address, authority)
+        cache = get_shared_cache()
+        if cache:
+            await cache.aset_json(
+                ACCOUNT_NAMESPACE, _shared_key(rpc_url, address), {"authority": account.authority}
+            )
+        return account
+
+    async def remove(self, rpc_url: str, address: str) -> None:
+        self._accounts.get(rpc_url, {}).pop(address, None)
+        cache = get_shared_cache()
+        if cache:
+            key = _shared_key(rpc_url, address)
+            await cache.adelete(ACCOUNT_NAMESPACE, key)
+            await cache.adelete(STATE_NAMESPACE, key)
+            await cache.aend_lease(LEASE_NAMESPACE, key)
+
+    async def list(self, rpc_url: str) -> List[NonceAccount]:
+        cache = get_shared_cache()
+        if cache:
+            await asyncio.to_thread(self._sync, cache, rpc_url)
+        return list(self._accounts.get(rpc_url, {}).values())
+
+    async def refresh(self, rpc_client: SolanaRPCClient, address: str) -> NonceAccount:
+        """
+        Fetches the account's current nonce. Addresses that aren't registered
+        get a throwaway record, so they never become acquirable.
+        """
+        account = self._accounts.get(rpc_client.rpc_url, {}).get(address)
+        pooled = account is not None
+        if not pooled:
+            Pubkey.from_string(address)
+            account = NonceAccount(address=address)
+        info = await rpc_client.get_account_info(address, "base64")
+        if not info:
+            raise ValueError(f"Nonce account not found: {address}")
+        state = parse_nonce_account(base64.b64decode(info["data"][0]))
+        account.nonce = state["nonce"]
+        if account.nonce != account.spent:
+            account.spent = None
+        account.authority = account.authority or state["authority"]
+        account.fetched_at = time.time()
+        if pooled:
+            await self._publish(rpc_client.rpc_url, account)
+        return account
+
+    async def get(self, rpc_client: SolanaRPCClient, address: str) -> NonceAccount:
+        """
+        Returns the account with an unused nonce value, fetching it only if
+        needed. Accounts outside the pool are fetched every time and are not
+        added to it.
+        """
+        pooled = {a.address: a for a in await self.list(rpc_client.rpc_url)}
+        account = pooled.get(address)
+        if account is None or not account.ready:
+            account = await self.refresh(rpc_client, address)
+        if not account.ready:
+            raise ValueError(
+                f"Nonce account {address} has not advanced since its last use; "
+                "the transaction using it has not landed yet"
+            )
+        return account
+
+    async def acquire(self, rpc_client: SolanaRPCClient) -> NonceAccount:
+        """
+        Checks out a free account, preferring ones whose unused nonce is
+        already cached so the common path makes no RPC call. Otherwise used
+        accounts are refreshed in turn until one has advanced.
+        """
+        rpc_url = rpc_client.rpc_url
+        accounts = await self.list(rpc_url)
+        if not accounts:
+            raise ValueError("No nonce accounts registered for this RPC endpoint")
+        leased = 0
+        # Ready accounts first; sorted() is stable so registration order is kept
+        for account in sorted(accounts, key=lambda a: not a.ready):
+            if not await self._lease(rpc_url, account):
+                continue
+            leased += 1
+            try:
+                cache = get_shared_cache()
+                if cache:
+                    # Another worker may have used it between the sync and the lease
+                    await asyncio.to_thread(self._load_state, cache, rpc_url, account)
+                if not account.ready:
+                    await self.refresh(rpc_client, account.address)
+            except Exception:
+                await self._end_lease(rpc_url, account)
+                raise
+            if account.ready:
+                return account
+            await self._end_lease(rpc_url, account)
+        if not leased:
+            raise ValueError("Every nonce account for this RPC endpoint is checked out")
+        raise ValueError(
+            "No free nonce account has advanced since its last use; "
+            "the transactions using them have not landed yet"
+        )
+
+    async def release(self, rpc_url: str, address: str, used: bool = True) -> None:
+        # Synced first: the account may have been checked out by another worker
+        pooled = {a.address: a for a in await self.list(rpc_url)}
+        account = pooled.get(address)
+        if account is None:
+            return
+        if used:
+            account.uses += 1
+            account.spent = account.nonce or account.spent
+            account.nonce = None
+        else:
+            # The caller says the last nonce was never consumed (e.g. the send was dropped)
+            account.spent = None
+        await self._publish(rpc_url, account)
+        await self._end_lease(rpc_url, account)
+
+    def _register_local(
+        self, rpc_url: str, address: str, authority: Optional[str] = None
+    ) -> NonceAccount:
+        accounts = self._accounts.setdefault(rpc_url, {})
+        account = accounts.get(address)
+        if account is None:
+            account = accounts[address] = NonceAccount(address=address, authority=authority)
+        elif authority:
+            account.authority = authority
+        return account
+
+    def _sync(self, cache: SharedCache, rpc_url: str) -> None:
+        """Mirrors the shared registrations, leases and nonce state of ``rpc_url``."""
+        prefix = _shared_key(rpc_url, "")
+        registered = {}
+        for key, raw in cache.iter_namespace(ACCOUNT_NAMESPACE):
+            if key.startswith(prefix):
+                registered[key[len(prefix) :]] = json.loads(raw).get("authority")
+        accounts = self._accounts.setdefault(rpc_url, {})
+        for address in [a for a in accounts if a not in registered]:
+            del accounts[address]
+        for address, authority in registered.items():
+            self._register_local(rpc_url, address, authority)
+
+        leased = cache.leased(LEASE_NAMESPACE, (prefix + a for a in accounts))
+        for address, account in accounts.items():
+            account.in_use = prefix + address in leased
+            self._load_state(cache, rpc_url, account)
+
+    def _load_state(self, cache: SharedCache, rpc_url: str, account: NonceAccount) -> None:
+        state = cache.get_json(STATE_NAMESPACE, _shared_key(rpc_url, account.address))
+        if state is not None:
+            account.nonce = state["nonce"]
+            account.spent = state["spent"]
+            account.uses = state["uses"]
+
+    async def _publish(self, rpc_url: str, account: NonceAccount) -> None:
+        cache = get_shared_cache()
+        if cache:
+            await cache.aset_json(
+                STATE_NAMESPACE,
+                _shared_key(rpc_url, account.address),
+                {"nonce": account.nonce, "spent": account.spent, "uses": account.uses},
+            )
+
+    async def _lease(self, rpc_url: str, account: NonceAccount) -> bool:
+        cache = get_shared_cache()
+        if cache:
+            taken = await cache.atry_lease(
+                LEASE_NAMESPACE, _shared_key(rpc_url, account.address), self.lease_seconds
+            )
+            account.in_use = True  # by us, or by whoever holds the lease
+            return taken
+        if account.in_use:
+            return False
+        account.in_use = True
+        return True
+
+    async def _end_lease(self, rpc_url: str, account: NonceAccount) -> None:
+        account.in_use = False
+        cache = get_shared_cache()
+        if cache:
+            await cache.aend_lease(LEASE_NAMESPACE, _shared_key(rpc_url, account.address))
+
+
+nonce_pool = NoncePool(settings.NONCE_LEASE_SECONDS)
@@ -0,0 +1,304 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import base58
+from solders.pubkey import Pubkey
+
+from .byte_packer import SolanaBytePacker
+from ...core.configs import settings
+from ...utils import cache_stats
+from ...utils.executors import process_pool, process_workers
+
+logger = logging.getLogger(__name__)
+
+SeedTuple = Tuple[bytes, ...]
+PDAKey = Tuple[str, SeedTuple]
+PDAResult = Tuple[str, int]
+
+# IDL seed type names -> SolanaBytePacker field types
+IDL_SEED_TYPES = {
+    "publicKey": "pubkey",
+    "pubkey": "pubkey",
+    "string": "string",
+    "bytes": "bytes",
+    "bool": "bool",
+    "u8": "u8",
+    "u16": "u16",
+    "u32": "u32",
+    "u64": "u64",
+    "u128": "u128",
+    "i8": "i8",
+    "i16": "i16",
+    "i32": "i32",
+    "i64": "i64",
+    "i128": "i128",
+}
+
+
+# Solana's limit; past it (or SolanaBytePacker.MAX_SEED_LENGTH) solders panics
+# with a BaseException instead of raising
+MAX_SEEDS = 16
+
+
+def check_pda_key(program_id: str, seeds: SeedTuple) -> None:
+    """Raises ValueError for keys find_program_address can't derive."""
+    if len(seeds) > MAX_SEEDS:
+        raise ValueError(f"At most {MAX_SEEDS} seeds are allowed, got {len(seeds)}")
+    for seed in seeds:
+        if len(seed) > SolanaBytePacker.MAX_SEED_LENGTH:
+            raise ValueError(
+                f"Seed exceeds {SolanaBytePacker.MAX_SEED_LENGTH} bytes: {len(seed)} bytes"
+            )
+    try:
+        Pubkey.from_string(program_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid program_id {program_id!r}: {e}")
+
+
+def find_program_address(program_id: str, seeds: SeedTuple) -> PDAResult:
+    check_pda_key(program_id, seeds)
+    pubkey, bump = Pubkey.find_program_address(
+        list(seeds), Pubkey.from_string(program_id)
+    )
+    return str(pubkey), bump
+
+
+def _derive_chunk(items: Sequence[PDAKey]) -> List[PDAResult]:
+    # Runs inside pool workers, so it must stay a module-level function.
+    return [find_program_address(program_id, seeds) for program_id, seeds in items]
+
+
+class PDACache:
+    """Bounded LRU of (program_id, seeds) -> (address, bump)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[PDAKey, PDAResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: PDAKey) -> Optional[PDAResult]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: PDAKey, result: PDAResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+pda_cache = PDACache(settings.PDA_CACHE_SIZE)
+cache_stats.register("pda", pda_cache.stats)
+
+
+async def derive_pdas(items: Sequence[PDAKey]) -> List[PDAResult]:
+    """
+    Derives many PDAs, answering repeats from the LRU. Misses are ground
+    inline for small batches and fanned out to a process pool for large ones,
+    since find_program_address is pure CPU (SHA-256 over bump candidates).
+    """
+    results: List[Optional[PDAResult]] = [None] * len(items)
+    pending: Dict[PDAKey, List[int]] = {}
+    for index, key in enumerate(items):
+        cached = pda_cache.get(key)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.setdefault(key, []).append(index)
+
+    misses = list(pending.keys())
+    if len(misses) >= settings.PDA_PROCESS_POOL_THRESHOLD:
+        pool = process_pool()
+        chunk_size = max(1, len(misses) // (process_workers() * 4))
+        chunks = [misses[i : i + chunk_size] for i in range(0, len(misses), chunk_size)]
+        loop = asyncio.get_running_loop()
+        chunk_results = await asyncio.gather(
+            *(loop.run_in_executor(pool, _derive_chunk, chunk) for chunk in chunks)
+        )
+        derived = [result for chunk in chunk_results for result in chunk]
+    else:
+        derived = _derive_chunk(misses)
+
+    for key, result in zip(misses, derived):
+        pda_cache.put(key, result)
+        for index in pending[key]:
+            results[index] = result
+    return results
+
+
+def _flatten_accounts(accounts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    flat = []
+    for acc in accounts:
+        if "accounts" in acc:
+            flat.extend(_flatten_accounts(acc["accounts"]))
+        else:
+            flat.append(acc)
+    return flat
+
+
+def _lookup_path(values: Dict[str, Any], path: str) -> Any:
+    value: Any = values
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            raise KeyError(path)
+        value = value[part]
+    return value
+
+
+def _arg_type(ix: Dict[str, Any], idl: Dict[str, Any], path: str) -> Any:
+    parts = path.split(".")
+    arg = next((a for a in ix.get("args", []) if a.get("name") == parts[0]), None)
+    if arg is None:
+        raise KeyError(path)
+    arg_type = arg.get("type")
+    types = {t.get("name"): t.get("type", {}) for t in idl.get("types", [])}
+    for part in parts[1:]:
+        defined = arg_type.get("defined") if isinstance(arg_type, dict) else None
+        type_name = defined.get("name") if isinstance(defined, dict) else defined
+        fields = types.get(type_name, {}).get("fields", [])
+        field = next((f for f in fields if f.get("name") == part), None)
+        if field is None:
+            raise KeyError(path)
+        arg_type = field.get("type")
+    return arg_type
+
+
+def encode_idl_seed(packer: SolanaBytePacker, idl_type: Any, value: Any) -> bytes:
+    """Encodes a seed value according to its IDL type."""
+    if isinstance(idl_type, dict) and "array" in idl_type:
+        return bytes(value)
+    field_type = IDL_SEED_TYPES.get(idl_type) if isinstance(idl_type, str) else None
+    if field_type is None:
+        raise ValueError(f"Unsupported seed type: {idl_type}")
+    return packer.pack_seed(field_type, value)
+
+
+def _encode_const_seed(packer: SolanaBytePacker, seed: Dict[str, Any]) -> bytes:
+    value = seed.get("value")
+    if "type" in seed:
+        return encode_idl_seed(packer, seed["type"], value)
+    # Anchor 0.30+ stores const seeds as raw byte arrays
+    return bytes(value)
+
+
+def _program_for_pda(pda: Dict[str, Any], program_id: str, known: Dict[str, str]) -> Optional[str]:
+    program = pda.get("program") or pda.get("programId")
+    if not program:
+        return program_id
+    kind = program.get("kind")
+    if kind == "const":
+        value = program.get("value")
+        if isinstance(value, str):
+            return value
+        return base58.b58encode(bytes(value)).decode("utf-8")
+    if kind == "account":
+        return known.get(program.get("path"))
+    return None
+
+
+def collect_instruction_pdas(
+    idl: Dict[str, Any],
+    program_id: str,
+    instruction_name: str,
+    args: Dict[str, Any],
+    accounts: Dict[str, str],
+) -> Tuple[Dict[str, str], Dict[str, PDAKey], List[str]]:
+    """
+    Walks an instruction's accounts and returns (fixed addresses, PDA
+    derivations whose seeds are all known, still-unresolved names). An
+    account whose seeds are missing or don't encode is unresolved. Seeds
+    that reference other PDAs are only encodable once those are derived, so
+    callers loop until no further progress is made.
+    """
+    ix = next(
+        (i for i in idl.get("instructions", []) if i.get("name") == instruction_name),
+        None,
+    )
+    if ix is None:
+        raise ValueError(f"Instruction not found in IDL: {instruction_name}")
+
+    packer = SolanaBytePacker()
+    fixed: Dict[str, str] = {}
+    derivable: Dict[str, PDAKey] = {}
+    unresolved: List[str] = []
+
+    for acc in _flatten_accounts(ix.get("accounts", [])):
+        name = acc.get("name")
+        if name in accounts:
+            continue
+        if acc.get("address"):
+            fixed[name] = acc["address"]
+            continue
+        pda = acc.get("pda")
+        if not pda:
+            unresolved.append(name)
+            continue
+
+        try:
+            seeds = []
+            for seed in pda.get("seeds", []):
+                kind = seed.get("kind")
+                if kind == "const":
+                    seeds.append(_encode_const_seed(packer, seed))
+                elif kind == "arg":
+                    value = _lookup_path(args, seed["path"])
+                    seed_type = seed.get("type") or _arg_type(ix, idl, seed["path"])
+                    seeds.append(encode_idl_seed(packer, seed_type, value))
+                elif kind == "account":
+                    # Dotted paths point into account data, which needs a fetch
+                    if "." in seed["path"] or seed["path"] not in accounts:
+                        raise KeyError(seed["path"])
+                    seeds.append(packer.pack_seed("pubkey", accounts[seed["path"]]))
+                else:
+                    raise ValueError(f"Unsupported seed kind: {kind}")
+            owner = _program_for_pda(pda, program_id, accounts)
+            if owner is None:
+                raise KeyError("program")
+            check_pda_key(owner, tuple(seeds))
+            derivable[name] = (owner, tuple(seeds))
+        except KeyError:
+            unresolved.append(name)
+        except (ValueError, TypeError, AttributeError) as e:
+            # A seed value that doesn't encode (bad pubkey, out-of-range int,
+            # wrong type) makes this account underivable, not the instruction
+            logger.debug("Cannot derive %s: %s", name, e)
+            unresolved.append(name)
+
+    return fixed, derivable, unresolved
+
+
+async def resolve_instruction_accounts(
+    idl: Dict[str, Any],
+    program_id: str,
+    instruction_name: str,
+    args: Dict[str, Any],
+    accounts: Dict[str, str],
+) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Fills in an instruction's accounts from IDL-declared addresses and PDA
+    seeds. Returns the resolved name -> pubkey map and the names that could
+    not be resolved from the given args and accounts.
+    """
+    known = dict(accounts)
+    while True:
+        fixed, derivable, unresolved = collect_instruction_pdas(
+            idl, program_id, instruction_name, args, known
+        )
+        if not fixed and not derivable:
+            return known, unresolved
+        known.update(fixed)
+        names = list(derivable.keys())
+        derived = await derive_pdas([derivable[name] for name in names])
+        for name, (address, _) in zip(names, derived):
+            known[name] = address
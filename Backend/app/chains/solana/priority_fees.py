@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+from ...utils import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# getRecentPrioritizationFees accepts at most this many accounts
+MAX_FEE_ACCOUNTS = 128
+
+FeeKey = Tuple[str, Tuple[str, ...]]
+
+
+def percentile(sorted_fees: List[int], p: float) -> int:
+    """Nearest-rank percentile of ascending fees (0 for no samples)."""
+    if not sorted_fees:
+        return 0
+    rank = max(1, math.ceil(p / 100 * len(sorted_fees)))
+    return sorted_fees[min(rank, len(sorted_fees)) - 1]
+
+
+def configured_percentiles() -> List[float]:
+    return [float(p) for p in settings.PRIORITY_FEE_PERCENTILES.split(",") if p.strip()]
+
+
+class FeeEntry:
+    __slots__ = ("fees", "slot", "fetched_at", "reads")
+
+    def __init__(self, fees: List[int], slot: Optional[int]):
+        self.fees = fees
+        self.slot = slot
+        self.fetched_at = time.monotonic()
+        self.reads = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def estimate(self, p: float) -> int:
+        """The ``p``th percentile fee, clamped to the configured floor and cap."""
+        fee = max(percentile(self.fees, p), settings.PRIORITY_FEE_MIN_MICROLAMPORTS)
+        return min(fee, settings.PRIORITY_FEE_MAX_MICROLAMPORTS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "percentiles": {f"p{p:g}": self.estimate(p) for p in configured_percentiles()},
+            "samples": len(self.fees),
+            "slot": self.slot,
+            "age_seconds": round(self.age, 3),
+        }
+
+
+class PriorityFeeOracle:
+    """
+    Compute unit price estimates from getRecentPrioritizationFees, cached per
+    RPC endpoint and set of writable accounts for ``ttl`` seconds. A set read
+    ``hot_reads`` times since its last fetch is refreshed in the background
+    once its estimate is ``refresh_ahead`` of the way to expiry, so busy
+    sets are always served from memory. Concurrent misses share one call,
+    made with the oracle's own client for the endpoint so that no caller's
+    request owns it. Callers that can't wait for a fetch use ``fallback``.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        refresh_ahead: float,
+        hot_reads: int,
+        max_sets: int,
+        client_factory: Callable[[str], SolanaRPCClient] = SolanaRPCClient,
+    ):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.hot_reads = hot_reads
+        self.max_sets = max_sets
+        self._entries: "OrderedDict[FeeKey, FeeEntry]" = OrderedDict()
+        self._inflight: Dict[FeeKey, asyncio.Task] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+        self.client_factory = client_factory
+        self._clients: Dict[str, SolanaRPCClient] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def key(rpc_url: str, accounts: Iterable[str]) -> FeeKey:
+        return rpc_url, tuple(sorted(set(accounts)))[:MAX_FEE_ACCOUNTS]
+
+    def cached(self, rpc_url: str, accounts: Iterable[str]) -> Optional[FeeEntry]:
+        """The fresh estimate for this set, if any; schedules a refresh-ahead for hot sets."""
+        key = self.key(rpc_url, accounts)
+        entry = self._entries.get(key)
+        if entry is None or entry.age > self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.reads += 1
+        self._entries.move_to_end(key)
+        if entry.reads >= self.hot_reads and entry.age >= self.ttl * self.refresh_ahead:
+            self._schedule_refresh(key)
+        return entry
+
+    def fallback(
+        self, rpc_url: str, accounts: Iterable[str], p: float, refresh: bool = True
+    ) -> Tuple[int, str]:
+        """
+        A price without waiting on the network: the last estimate for this
+        set however old (``stale``), else the configured floor (``floor``).
+        With ``refresh`` the set is fetched in the background for next time.
+        """
+        key = self.key(rpc_url, accounts)
+        if refresh:
+            self._schedule_refresh(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.estimate(p), "stale"
+        return FeeEntry([], None).estimate(p), "floor"
+
+    def _schedule_refresh(self, key: FeeKey) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._refresh(key))
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def estimate(self, rpc_url: str, accounts: Iterable[str]) -> FeeEntry:
+        """The cached estimate, or a fresh one."""
+        accounts = list(accounts)
+        entry = self.cached(rpc_url, accounts)
+        if entry is not None:
+            return entry
+        key = self.key(rpc_url, accounts)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _client(self, rpc_url: str) -> SolanaRPCClient:
+        client = self._clients.get(rpc_url)
+        if client is None:
+            client = self._clients[rpc_url] = self.client_factory(rpc_url)
+        return client
+
+    async def _fetch(self, key: FeeKey) -> FeeEntry:
+        samples = await self._client(key[0]).get_recent_prioritization_fees(list(key[1]))
+        entry = FeeEntry(
+            sorted(s["prioritizationFee"] for s in samples),
+            max((s["slot"] for s in samples), default=None),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_sets:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def _refresh(self, key: FeeKey) -> None:
+        try:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            await task
+            self.refreshes += 1
+        except Exception as e:
+            logger.debug("Priority fee refresh for %s failed: %s", key[0], e)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sets": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
+
+    async def shutdown(self) -> None:
+        tasks = list(self._refreshing) + list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+
+
+priority_fee_oracle = PriorityFeeOracle(
+    settings.PRIORITY_FEE_TTL_SECONDS,
+    settings.PRIORITY_FEE_REFRESH_AHEAD,
+    settings.PRIORITY_FEE_HOT_READS,
+    settings.PRIORITY_FEE_MAX_SETS,
+)
+cache_stats.register("priority_fees", priority_fee_oracle.stats)
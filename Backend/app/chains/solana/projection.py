@@ -0,0 +1,204 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .account_data import account_bytes, base64_len, get_multiple_accounts
+from .idl_codec import ANCHOR_DISCRIMINATOR_SIZE, Decoder, IdlCodec
+from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+
+# getMultipleAccounts accepts at most this many pubkeys per call
+MULTIPLE_ACCOUNTS_LIMIT = 100
+
+
+class Projection:
+    """
+    Selected fields of an IDL account type, located by the type's compiled
+    layout so that only the bytes covering them need to be read. Fields must
+    lie in the fixed-size prefix of the account; a path naming a struct
+    selects every leaf under it and decodes to a nested dict.
+    """
+
+    def __init__(
+        self,
+        codec: IdlCodec,
+        account_type: str,
+        paths: Sequence[str],
+        layout: Dict[str, Any],
+    ):
+        if not paths:
+            raise ValueError("At least one field path is required")
+        self.account_type = account_type
+        self.discriminator = codec.account_discriminator(account_type)
+        # (requested path, [(path below it, absolute offset, size, decoder)])
+        self.fields: List[Tuple[str, List[Tuple[str, int, int, Decoder]]]] = []
+        for path in paths:
+            leaves = [
+                (
+                    field["path"][len(path) + 1 :],
+                    field["offset"] + ANCHOR_DISCRIMINATOR_SIZE,
+                    field["size"],
+                    codec.compile(field["type"]),
+                )
+                for field in layout["fields"]
+                if field["path"] == path or field["path"].startswith(path + ".")
+            ]
+            if not leaves:
+                raise ValueError(
+                    f"{path} is not a field in the fixed-size prefix of {account_type}"
+                )
+            self.fields.append((path, leaves))
+        self.start = min(offset for _, leaves in self.fields for _, offset, _, _ in leaves)
+        self.end = max(offset + size for _, leaves in self.fields for _, offset, size, _ in leaves)
+
+    @classmethod
+    async def create(
+        cls, codec: IdlCodec, account_type: str, paths: Sequence[str]
+    ) -> "Projection":
+        return cls(codec, account_type, paths, await codec.layout(account_type))
+
+    def decode(self, data: bytes, base: int) -> Dict[str, Any]:
+        """Field values from ``data``, the account bytes starting at offset ``base``."""
+        if len(data) < self.end - base:
+            raise ValueError(
+                f"Account data is {base + len(data)} bytes, shorter than a {self.account_type}"
+            )
+        out: Dict[str, Any] = {}
+        for path, leaves in self.fields:
+            if len(leaves) == 1 and not leaves[0][0]:
+                _, offset, _, decode = leaves[0]
+                out[path] = decode(data, offset - base)[0]
+                continue
+            nested: Dict[str, Any] = {}
+            for sub_path, offset, _, decode in leaves:
+                *parents, name = sub_path.split(".")
+                node = nested
+                for parent in parents:
+                    node = node.setdefault(parent, {})
+                node[name] = decode(data, offset - base)[0]
+            out[path] = nested
+        return out
+
+
+def merge_spans(
+    spans: Sequence[Tuple[int, int]], gap: int
+) -> List[Tuple[Tuple[int, int], List[int]]]:
+    """
+    Groups byte ranges that lie within ``gap`` bytes of each other into one
+    covering range each, returning ``(range, indexes of the spans in it)``.
+    Each group becomes one dataSlice.
+    """
+    groups: List[Tuple[Tuple[int, int], List[int]]] = []
+    for i in sorted(range(len(spans)), key=lambda i: spans[i]):
+        start, end = spans[i]
+        if groups and start <= groups[-1][0][1] + gap:
+            (group_start, group_end), members = groups[-1]
+            groups[-1] = ((group_start, max(group_end, end)), members + [i])
+        else:
+            groups.append(((start, end), [i]))
+    return groups
+
+
+class ProjectionReader:
+    """
+    Reads projections over many accounts with as few getMultipleAccounts
+    calls as possible: projections whose byte ranges are close share one
+    dataSlice, each slice's accounts are fetched in chunks of 100, and the
+    chunks run with up to ``concurrency`` calls in flight. With
+    ``verify_discriminator`` the first 8 bytes are read as one more range,
+    which only joins a field slice when it lies near the start.
+    """
+
+    def __init__(
+        self,
+        rpc_client: SolanaRPCClient,
+        concurrency: int = 8,
+        verify_discriminator: bool = False,
+    ):
+        self.rpc_client = rpc_client
+        self.concurrency = concurrency
+        self.verify_discriminator = verify_discriminator
+        self.calls = 0
+        self.bytes_fetched = 0
+        self.slot: Optional[int] = None
+
+    async def read(
+        self, requests: Sequence[Tuple[Projection, Sequence[str]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """For each (projection, pubkeys), one result per pubkey in input order."""
+        # Span i is projection i's fields; span len(requests) + i its discriminator
+        spans = [(projection.start, projection.end) for projection, _ in requests]
+        if self.verify_discriminator:
+            spans += [(0, ANCHOR_DISCRIMINATOR_SIZE)] * len(requests)
+        groups = merge_spans(spans, settings.PROJECTION_MERGE_GAP_BYTES)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        group_of: Dict[int, int] = {}
+        fetches = []
+        for g, (data_slice, members) in enumerate(groups):
+            group_of.update((i, g) for i in members)
+            pubkeys = list(
+                dict.fromkeys(pk for i in members for pk in requests[i % len(requests)][1])
+            )
+            for start in range(0, len(pubkeys), MULTIPLE_ACCOUNTS_LIMIT):
+                chunk = pubkeys[start : start + MULTIPLE_ACCOUNTS_LIMIT]
+                fetches.append(self._fetch(semaphore, g, chunk, data_slice))
+        values: Dict[Tuple[int, str], Optional[Dict[str, Any]]] = {}
+        for chunk_values in await asyncio.gather(*fetches):
+            values.update(chunk_values)
+
+        results = []
+        for i, (projection, pubkeys) in enumerate(requests):
+            g = group_of[i]
+            base = groups[g][0][0]
+            d = group_of.get(len(requests) + i)
+            rows = []
+            for pubkey in pubkeys:
+                discriminator = values[(d, pubkey)] if d is not None else None
+                rows.append(
+                    await self._decode(projection, pubkey, base, values[(g, pubkey)], discriminator)
+                )
+            results.append(rows)
+        return results
+
+    async def _fetch(
+        self,
+        semaphore: asyncio.Semaphore,
+        group: int,
+        pubkeys: List[str],
+        data_slice: Tuple[int, int],
+    ) -> Dict[Tuple[int, str], Optional[Dict[str, Any]]]:
+        start, end = data_slice
+        async with semaphore:
+            result = await get_multiple_accounts(
+                self.rpc_client, pubkeys, "base64", (start, end - start)
+            )
+        self.calls += 1
+        self.bytes_fetched += sum(base64_len(v["data"][0]) for v in result["value"] if v)
+        slot = result.get("context", {}).get("slot")
+        if slot is not None:
+            # Every value is at least as recent as the oldest call's slot
+            self.slot = slot if self.slot is None else min(self.slot, slot)
+        return {(group, pubkey): value for pubkey, value in zip(pubkeys, result["value"])}
+
+    async def _decode(
+        self,
+        projection: Projection,
+        pubkey: str,
+        base: int,
+        value: Optional[Dict[str, Any]],
+        discriminator: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        row: Dict[str, Any] = {"pubkey": pubkey, "account_type": projection.account_type}
+        if value is None:
+            row.update(fields=None, error="Account not found")
+            return row
+        try:
+            if discriminator is not None and projection.discriminator is not None:
+                # The discriminator's slice always starts at offset 0
+                head = (await account_bytes(discriminator))[:ANCHOR_DISCRIMINATOR_SIZE]
+                if head != projection.discriminator:
+                    raise ValueError(f"Not a {projection.account_type} account")
+            data = await account_bytes(value)
+            row["fields"] = projection.decode(data, base)
+        except Exception as e:
+            row.update(fields=None, error=str(e))
+        return row
@@ -1,5 +1,16 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from ..base.rpc_client import BaseRPCClient
+from .slot_tracker import slot_tracker
+
+
+class SolanaRPCError(Exception):
+    """JSON-RPC error response, keeping the node's code and structured data."""
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(f"RPC Error: {error}")
+        self.code = error.get("code")
+        self.message = error.get("message", "")
+        self.data = error.get("data")
 
 
 class SolanaRPCClient(BaseRPCClient):
@@ -17,7 +28,7 @@ class SolanaRPCClient(BaseRPCClient):
         response.raise_for_status()
         result = response.json()
         if "error" in result:
-            raise Exception(f"RPC Error: {result['error']}")
+            raise SolanaRPCError(result["error"])
         return result.get("result")
 
     async def get_account_info(
@@ -28,39 +39,168 @@ class SolanaRPCClient(BaseRPCClient):
         )
         return result.get("value") if result else None
 
-    async def get_latest_blockhash(self) -> Dict[str, Any]:
+    async def get_account_info_with_context(
+        self, address: str, encoding: str = "base64"
+    ) -> Dict[str, Any]:
+        result = await self._request(
+            "getAccountInfo", [address, {"encoding": encoding}]
+        )
+        slot_tracker.observe(self.rpc_url, result.get("context", {}).get("slot"))
+        return result
+
+    async def get_multiple_accounts(
+        self,
+        addresses: List[str],
+        encoding: str = "base64",
+        data_slice: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, Any]:
+        config: Dict[str, Any] = {"encoding": encoding}
+        if data_slice is not None:
+            config["dataSlice"] = {"offset": data_slice[0], "length": data_slice[1]}
+        result = await self._request("getMultipleAccounts", [addresses, config])
+        slot_tracker.observe(self.rpc_url, result.get("context", {}).get("slot"))
+        return result
+
+    async def get_program_accounts(
+        self,
+        program_id: str,
+        encoding: str = "base64",
+        filters: Optional[List[Dict[str, Any]]] = None,
+        data_slice: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        config: Dict[str, Any] = {"encoding": encoding}
+        if filters:
+            config["filters"] = filters
+        if data_slice is not None:
+            config["dataSlice"] = {"offset": data_slice[0], "length": data_slice[1]}
+        result = await self._request("getProgramAccounts", [program_id, config])
+        return result
+
+    async def get_latest_blockhash(self, commitment: str = "finalized") -> Dict[str, Any]:
         result = await self._request(
-            "getLatestBlockhash", [{"commitment": "finalized"}]
+            "getLatestBlockhash", [{"commitment": commitment}]
         )
         return result["value"]
 
     async def simulate_transaction(
         self, transaction: str, encoding: str = "base64", **kwargs
     ) -> Dict[str, Any]:
+        result = await self.simulate_transaction_with_context(transaction, encoding)
+        return result["value"]
+
+    async def simulate_transaction_with_context(
+        self,
+        transaction: str,
+        encoding: str = "base64",
+        sig_verify: bool = False,
+        commitment: str = "processed",
+    ) -> Dict[str, Any]:
+        # The node rejects sigVerify together with replaceRecentBlockhash, so
+        # a verifying simulation also checks the transaction's own blockhash.
         params = [
             transaction,
             {
                 "encoding": encoding,
-                "commitment": "processed",
-                "replaceRecentBlockhash": True,
-                "sigVerify": False,
+                "commitment": commitment,
+                "replaceRecentBlockhash": not sig_verify,
+                "sigVerify": sig_verify,
             },
         ]
         result = await self._request("simulateTransaction", params)
-        return result["value"]
+        slot_tracker.observe(self.rpc_url, result.get("context", {}).get("slot"))
+        return result
 
     async def send_transaction(
-        self, transaction: str, encoding: str = "base64", **kwargs
+        self,
+        transaction: str,
+        encoding: str = "base64",
+        skip_preflight: bool = False,
+        max_retries: Optional[int] = None,
+        preflight_commitment: str = "confirmed",
+        **kwargs,
     ) -> Dict[str, Any]:
-        params = [
-            transaction,
-            {
-                "encoding": encoding,
-                "preflightCommitment": "confirmed",
-                "skipPreflight": False,
-            },
-        ]
-        result = await self._request("sendTransaction", params)
+        config: Dict[str, Any] = {
+            "encoding": encoding,
+            "preflightCommitment": preflight_commitment,
+            "skipPreflight": skip_preflight,
+        }
+        if max_retries is not None:
+            config["maxRetries"] = max_retries
+        result = await self._request("sendTransaction", [transaction, config])
+        return result
+
+    async def get_signature_statuses(
+        self, signatures: List[str], search_history: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        result = await self._request(
+            "getSignatureStatuses",
+            [signatures, {"searchTransactionHistory": search_history}],
+        )
+        slot_tracker.observe(self.rpc_url, result.get("context", {}).get("slot"))
+        return result["value"]
+
+    async def get_blocks(
+        self, start_slot: int, end_slot: int, commitment: str = "finalized"
+    ) -> List[int]:
+        result = await self._request(
+            "getBlocks", [start_slot, end_slot, {"commitment": commitment}]
+        )
+        return result
+
+    async def get_block(
+        self, slot: int, commitment: str = "finalized"
+    ) -> Optional[Dict[str, Any]]:
+        result = await self._request(
+            "getBlock",
+            [
+                slot,
+                {
+                    "encoding": "base64",
+                    "maxSupportedTransactionVersion": 0,
+                    "transactionDetails": "full",
+                    "rewards": False,
+                    "commitment": commitment,
+                },
+            ],
+        )
+        return result
+
+    async def get_signatures_for_address(
+        self,
+        address: str,
+        before: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 1000,
+        commitment: str = "confirmed",
+    ) -> List[Dict[str, Any]]:
+        config: Dict[str, Any] = {"limit": limit, "commitment": commitment}
+        if before:
+            config["before"] = before
+        if until:
+            config["until"] = until
+        result = await self._request("getSignaturesForAddress", [address, config])
+        return result
+
+    async def get_transaction(
+        self, signature: str, commitment: str = "confirmed"
+    ) -> Optional[Dict[str, Any]]:
+        result = await self._request(
+            "getTransaction",
+            [
+                signature,
+                {
+                    "encoding": "base64",
+                    "maxSupportedTransactionVersion": 0,
+                    "commitment": commitment,
+                },
+            ],
+        )
+        return result
+
+    async def get_recent_prioritization_fees(
+        self, accounts: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        result = await self._request("getRecentPrioritizationFees", [accounts or []])
         return result
 
     async def get_minimum_balance_for_rent_exemption(self, data_len: int) -> int:
@@ -71,6 +211,7 @@ class SolanaRPCClient(BaseRPCClient):
         result = await self._request("getSlot", [])
         return result
 
-    async def get_block_height(self) -> int:
-        result = await self._request("getBlockHeight", [])
+    async def get_block_height(self, commitment: Optional[str] = None) -> int:
+        params = [{"commitment": commitment}] if commitment else []
+        result = await self._request("getBlockHeight", params)
         return result
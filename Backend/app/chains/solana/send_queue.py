@@ -0,0 +1,314 @@
+import asyncio
+import base64
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Coroutine, Dict, List, Optional, Set
+
+import base58
+
+from .rpc_client import SolanaRPCClient
+from .wire import SIGNATURE_SIZE, decode_compact_u16, recent_blockhash, uses_durable_nonce
+from ...core.configs import settings
+from ...utils.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATES = ("queued", "sent")
+# getSignatureStatuses accepts at most 256 signatures per call
+STATUS_BATCH_SIZE = 256
+# A blockhash stays usable for this many blocks after the one it names
+MAX_PROCESSING_AGE = 150
+# Expiry heights remembered per cluster, by blockhash
+BLOCKHASH_CACHE_SIZE = 512
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass
+class SendJob:
+    signature: str
+    transaction: str
+    rpc_url: str
+    last_valid_block_height: Optional[int]  # None for durable-nonce transactions
+    status: str = "queued"
+    attempts: int = 0
+    error: Optional[str] = None
+    slot: Optional[int] = None
+    submitted_at: float = field(default_factory=time.time)
+    landed_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "signature": self.signature,
+            "rpc_url": self.rpc_url,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "slot": self.slot,
+            "last_valid_block_height": self.last_valid_block_height,
+            "submitted_at": self.submitted_at,
+            "landed_at": self.landed_at,
+        }
+
+
+def first_signature(tx_bytes: bytes) -> str:
+    count, offset = decode_compact_u16(tx_bytes, 0)
+    signature = tx_bytes[offset : offset + SIGNATURE_SIZE]
+    if count == 0 or signature == bytes(SIGNATURE_SIZE):
+        raise ValueError("Transaction is not signed")
+    return base58.b58encode(signature).decode("utf-8")
+
+
+class _Cluster:
+    def __init__(self, client: SolanaRPCClient, concurrency: int):
+        self.client = client
+        self.jobs: Dict[str, SendJob] = {}
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.worker: Optional[asyncio.Task] = None
+        self.expiry_heights: "OrderedDict[str, int]" = OrderedDict()
+        self.sends = 0
+        self.send_errors = 0
+
+    def remember_expiry(self, blockhash: str, height: int) -> None:
+        self.expiry_heights[blockhash] = height
+        self.expiry_heights.move_to_end(blockhash)
+        while len(self.expiry_heights) > BLOCKHASH_CACHE_SIZE:
+            self.expiry_heights.popitem(last=False)
+
+    def pending(self) -> List[SendJob]:
+        return [job for job in self.jobs.values() if job.status in PENDING_STATES]
+
+
+class SendQueue:
+    """
+    Accepts signed transactions, sends them right away and keeps
+    rebroadcasting (skipPreflight, maxRetries=0) every ``rebroadcast_interval``
+    until the signature reaches ``commitment`` or the block height passes the
+    transaction's lastValidBlockHeight (durable-nonce transactions don't
+    expire unless one is given). One worker task and send semaphore per
+    cluster; a cluster with ``max_pending`` in-flight transactions rejects
+    new ones.
+    """
+
+    def __init__(
+        self,
+        max_pending: int,
+        concurrency: int,
+        rebroadcast_interval: float,
+        status_ttl: float,
+        commitment: str = "confirmed",
+        client_factory: Callable[[str], SolanaRPCClient] = SolanaRPCClient,
+    ):
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self.rebroadcast_interval = rebroadcast_interval
+        self.status_ttl = status_ttl
+        self.commitment = commitment
+        self.client_factory = client_factory
+        self._clusters: Dict[str, _Cluster] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        rpc_url: Optional[str],
+        transaction: str,
+        last_valid_block_height: Optional[int] = None,
+    ) -> SendJob:
+        raw = base64.b64decode(transaction)
+        signature = first_signature(raw)
+        cluster = self._cluster(rpc_url)
+        existing = cluster.jobs.get(signature)
+        if existing is not None:
+            return existing
+        if len(cluster.pending()) >= self.max_pending:
+            raise QueueFullError(
+                f"Send queue for {cluster.client.rpc_url} is full ({self.max_pending} pending)"
+            )
+
+        if last_valid_block_height is None and not uses_durable_nonce(raw):
+            last_valid_block_height = await self._expiry_height(cluster, recent_blockhash(raw))
+        job = SendJob(
+            signature=signature,
+            transaction=transaction,
+            rpc_url=cluster.client.rpc_url,
+            last_valid_block_height=last_valid_block_height,
+        )
+        cluster.jobs[signature] = job
+        await self._publish(job)
+
+        self._spawn(self._send(cluster, job))
+        if cluster.worker is None or cluster.worker.done():
+            cluster.worker = asyncio.create_task(self._run(cluster))
+        return job
+
+    async def status(self, signature: str) -> Optional[Dict[str, object]]:
+        for cluster in self._clusters.values():
+            job = cluster.jobs.get(signature)
+            if job is not None:
+                return job.to_dict()
+        # Another worker on this host may own the job
+        cache = get_shared_cache()
+        if cache:
+            return await cache.aget_json("send_status", signature)
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        result = {}
+        for rpc_url, cluster in self._clusters.items():
+            counts: Dict[str, int] = {}
+            for job in cluster.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            result[rpc_url] = {
+                **counts,
+                "sends": cluster.sends,
+                "send_errors": cluster.send_errors,
+            }
+        return result
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for cluster in self._clusters.values():
+            if cluster.worker is not None:
+                cluster.worker.cancel()
+            await cluster.client.close()
+        self._clusters.clear()
+
+    def _spawn(self, coro: Coroutine) -> None:
+        # The loop only keeps weak references to tasks
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Send queue task failed: %s", task.exception())
+
+    def _cluster(self, rpc_url: Optional[str]) -> _Cluster:
+        rpc_url = rpc_url or SolanaRPCClient.get_default_rpc_url()
+        cluster = self._clusters.get(rpc_url)
+        if cluster is None:
+            cluster = _Cluster(self.client_factory(rpc_url), self.concurrency)
+            self._clusters[rpc_url] = cluster
+        return cluster
+
+    async def _expiry_height(self, cluster: _Cluster, blockhash: str) -> int:
+        """
+        lastValidBlockHeight of ``blockhash``. Exact when it is the node's
+        latest at processed (the freshest a client can have built on);
+        otherwise MAX_PROCESSING_AGE past the processed height, which no
+        blockhash the client could have seen outlives.
+        """
+        height = cluster.expiry_heights.get(blockhash)
+        if height is not None:
+            return height
+        latest = await cluster.client.get_latest_blockhash("processed")
+        cluster.remember_expiry(latest["blockhash"], latest["lastValidBlockHeight"])
+        if latest["blockhash"] == blockhash:
+            return latest["lastValidBlockHeight"]
+        height = await cluster.client.get_block_height("processed") + MAX_PROCESSING_AGE
+        cluster.remember_expiry(blockhash, height)
+        return height
+
+    async def _send(self, cluster: _Cluster, job: SendJob) -> None:
+        async with cluster.semaphore:
+            if job.status not in PENDING_STATES:
+                return
+            job.attempts += 1
+            cluster.sends += 1
+            try:
+                await cluster.client.send_transaction(
+                    job.transaction, skip_preflight=True, max_retries=0
+                )
+                if job.status == "queued":
+                    job.status = "sent"
+            except Exception as e:
+                cluster.send_errors += 1
+                job.error = str(e)
+                logger.debug("Send of %s failed: %s", job.signature, e)
+
+    async def _run(self, cluster: _Cluster) -> None:
+        while True:
+            await asyncio.sleep(self.rebroadcast_interval)
+            try:
+                await self._tick(cluster)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Send queue tick failed for %s: %s", cluster.client.rpc_url, e)
+            self._prune(cluster)
+            if not cluster.jobs:
+                cluster.worker = None
+                return
+
+    async def _tick(self, cluster: _Cluster) -> None:
+        pending = cluster.pending()
+        if not pending:
+            return
+
+        for i in range(0, len(pending), STATUS_BATCH_SIZE):
+            batch = pending[i : i + STATUS_BATCH_SIZE]
+            statuses = await cluster.client.get_signature_statuses([j.signature for j in batch])
+            for job, status in zip(batch, statuses):
+                if status is None:
+                    continue
+                job.slot = status.get("slot")
+                if status.get("err") is not None:
+                    await self._finish(job, "failed", str(status["err"]))
+                elif self._reached_commitment(status):
+                    await self._finish(job, "confirmed")
+
+        pending = cluster.pending()
+        if not pending:
+            return
+        expiring = [job for job in pending if job.last_valid_block_height is not None]
+        if expiring:
+            block_height = await cluster.client.get_block_height(self.commitment)
+            for job in expiring:
+                if block_height > job.last_valid_block_height:
+                    await self._finish(job, "expired", "Blockhash expired before confirmation")
+
+        await asyncio.gather(*(self._send(cluster, job) for job in cluster.pending()))
+
+    def _reached_commitment(self, status: Dict[str, object]) -> bool:
+        reached = status.get("confirmationStatus")
+        if self.commitment == "finalized":
+            return reached == "finalized"
+        if self.commitment == "confirmed":
+            return reached in ("confirmed", "finalized")
+        return reached is not None
+
+    async def _finish(self, job: SendJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        if status == "confirmed":
+            job.landed_at = job.finished_at
+        await self._publish(job)
+
+    async def _publish(self, job: SendJob) -> None:
+        cache = get_shared_cache()
+        if cache:
+            await cache.aset_json("send_status", job.signature, job.to_dict(), self.status_ttl)
+
+    def _prune(self, cluster: _Cluster) -> None:
+        cutoff = time.time() - self.status_ttl
+        for signature in [
+            s for s, j in cluster.jobs.items() if j.finished_at and j.finished_at < cutoff
+        ]:
+            del cluster.jobs[signature]
+
+
+send_queue = SendQueue(
+    max_pending=settings.SEND_QUEUE_MAX_PENDING,
+    concurrency=settings.SEND_QUEUE_CONCURRENCY,
+    rebroadcast_interval=settings.SEND_QUEUE_REBROADCAST_SECONDS,
+    status_ttl=settings.SEND_QUEUE_STATUS_TTL_SECONDS,
+)
@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import base58
+
+from .lookup_tables import lookup_table_cache
+from .rpc_client import SolanaRPCClient
+from .slot_tracker import slot_tracker
+from .wire import BLOCKHASH_SIZE, address_table_lookups, parse_message_layout
+from ...core.configs import settings
+from ...utils import cache_stats
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationEntry(NamedTuple):
+    value: Dict[str, Any]
+    slot: Optional[int]
+    cached_at: float
+    # Writable accounts, plus the lookup tables any of them were loaded through
+    writable: List[str]
+
+
+def decode_transaction(transaction: str, encoding: str = "base64") -> bytes:
+    if encoding == "base58":
+        return base58.b58decode(transaction)
+    return base64.b64decode(transaction)
+
+
+def simulation_key(rpc_url: str, tx_bytes: bytes) -> Tuple[str, List[str]]:
+    """
+    Hashes the message with its blockhash zeroed (simulation replaces it
+    anyway) and signatures dropped (simulation skips sigVerify). Returns the
+    key and the message's statically listed writable accounts.
+    """
+    layout = parse_message_layout(tx_bytes)
+    message = bytearray(tx_bytes[layout.message_offset :])
+    start = layout.blockhash_offset - layout.message_offset
+    message[start : start + BLOCKHASH_SIZE] = bytes(BLOCKHASH_SIZE)
+    digest = hashlib.sha256(rpc_url.encode() + b"|" + bytes(message)).hexdigest()
+    return digest, layout.writable_keys()
+
+
+async def _loaded_writable(rpc_client: SolanaRPCClient, tx_bytes: bytes) -> List[str]:
+    loaded: List[str] = []
+    for lookup in address_table_lookups(tx_bytes):
+        if lookup.writable_indexes:
+            loaded.append(lookup.account_key)
+            loaded += await lookup_table_cache.resolve(
+                rpc_client, lookup.account_key, lookup.writable_indexes
+            )
+    return loaded
+
+
+def writable_accounts(rpc_url: str, tx_bytes: bytes) -> List[str]:
+    """
+    Accounts a sent transaction may change. Lookup-table addresses come from
+    tables already cached; a table that isn't stands in for its addresses,
+    which invalidates every cached simulation that loaded writable accounts
+    through it.
+    """
+    writable = parse_message_layout(tx_bytes).writable_keys()
+    for lookup in address_table_lookups(tx_bytes):
+        if not lookup.writable_indexes:
+            continue
+        loaded = lookup_table_cache.cached(rpc_url, lookup.account_key, lookup.writable_indexes)
+        writable += [lookup.account_key] if loaded is None else loaded
+    return writable
+
+
+class SimulationCache:
+    """
+    Opt-in cache of simulateTransaction results.
+
+    Entries are served while they are younger than ``ttl_seconds`` and within
+    ``max_slot_age`` slots of the latest slot observed on that endpoint.
+    Entries touching an account are dropped when that account is reported as
+    changed through ``invalidate_account``.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_slot_age: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_slot_age = max_slot_age
+        self._entries: "OrderedDict[str, SimulationEntry]" = OrderedDict()
+        self._by_account: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def simulate(
+        self,
+        rpc_client: SolanaRPCClient,
+        transaction: str,
+        encoding: str = "base64",
+        max_slot_age: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], Optional[int], bool]:
+        """Returns (simulation value, context slot, served from cache)."""
+        tx_bytes = decode_transaction(transaction, encoding)
+        key, writable = simulation_key(rpc_client.rpc_url, tx_bytes)
+        entry = self._get_fresh(key, rpc_client.rpc_url, max_slot_age)
+        if entry is not None:
+            self.hits += 1
+            return entry.value, entry.slot, True
+
+        self.misses += 1
+        result = await rpc_client.simulate_transaction_with_context(transaction, encoding)
+        slot = result.get("context", {}).get("slot")
+        try:
+            writable = writable + await _loaded_writable(rpc_client, tx_bytes)
+        except Exception as e:
+            # Without the loaded addresses the entry couldn't be invalidated
+            logger.debug("Not caching simulation, lookup tables unresolved: %s", e)
+            return result["value"], slot, False
+        self._put(key, SimulationEntry(result["value"], slot, time.monotonic(), writable))
+        return result["value"], slot, False
+
+    def invalidate_account(self, pubkey: str) -> None:
+        for key in self._by_account.pop(pubkey, ()):
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_accounts(self, pubkeys: List[str]) -> None:
+        for pubkey in pubkeys:
+            self.invalidate_account(pubkey)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    def _get_fresh(
+        self, key: str, rpc_url: str, max_slot_age: Optional[int]
+    ) -> Optional[SimulationEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.cached_at > self.ttl_seconds:
+            self._remove(key)
+            return None
+        max_age = self.max_slot_age if max_slot_age is None else max_slot_age
+        current = slot_tracker.estimate(rpc_url)
+        if entry.slot is not None and current is not None and current - entry.slot > max_age:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: str, entry: SimulationEntry) -> None:
+        self._remove(key)
+        self._entries[key] = entry
+        for pubkey in entry.writable:
+            self._by_account.setdefault(pubkey, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for pubkey in entry.writable:
+            keys = self._by_account.get(pubkey)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_account[pubkey]
+
+
+simulation_cache = SimulationCache(
+    settings.SIM_CACHE_MAX_ENTRIES,
+    settings.SIM_CACHE_TTL_SECONDS,
+    settings.SIM_CACHE_MAX_SLOT_AGE,
+)
+cache_stats.register("simulations", simulation_cache.stats)
@@ -0,0 +1,37 @@
+import time
+from typing import Dict, Optional, Tuple
+
+# Target slot time on mainnet; used to extrapolate between observations
+SLOT_DURATION_SECONDS = 0.4
+
+
+class SlotTracker:
+    """
+    Highest slot seen per RPC endpoint, taken from response contexts.
+    Lets caches judge staleness in slots without an extra getSlot call.
+    """
+
+    def __init__(self):
+        self._observed: Dict[str, Tuple[int, float]] = {}
+
+    def observe(self, rpc_url: str, slot: Optional[int]) -> None:
+        if slot is None:
+            return
+        current = self._observed.get(rpc_url)
+        if current is None or slot >= current[0]:
+            self._observed[rpc_url] = (slot, time.monotonic())
+
+    def last_seen(self, rpc_url: str) -> Optional[int]:
+        current = self._observed.get(rpc_url)
+        return current[0] if current else None
+
+    def estimate(self, rpc_url: str) -> Optional[int]:
+        """Last seen slot advanced by the wall time elapsed since it was seen."""
+        current = self._observed.get(rpc_url)
+        if current is None:
+            return None
+        slot, seen_at = current
+        return slot + int((time.monotonic() - seen_at) / SLOT_DURATION_SECONDS)
+
+
+slot_tracker = SlotTracker()
@@ -6,6 +6,8 @@ from solders.hash import Hash
 from solders.message import Message
 from solders.transaction import Transaction
 from solders.instruction import Instruction, AccountMeta as SoldersAccountMeta
+from solders.system_program import advance_nonce_account, AdvanceNonceAccountParams
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 from ..base.tx_builder import BaseTxBuilder
 
 
@@ -48,12 +50,59 @@ class SolanaTxBuilder(BaseTxBuilder):
 
         return Instruction(program_id=program_pubkey, accounts=account_metas, data=data)
 
+    def build_advance_nonce_instruction(
+        self, nonce_account: str, nonce_authority: str
+    ) -> Instruction:
+        return advance_nonce_account(
+            AdvanceNonceAccountParams(
+                nonce_pubkey=Pubkey.from_string(nonce_account),
+                authorized_pubkey=Pubkey.from_string(nonce_authority),
+            )
+        )
+
+    def compute_budget_instructions(
+        self, compute_unit_price: Optional[int] = None, compute_unit_limit: Optional[int] = None
+    ) -> List[Instruction]:
+        """SetComputeUnitLimit and SetComputeUnitPrice, in that order, for the values given."""
+        budget = []
+        if compute_unit_limit is not None:
+            budget.append(set_compute_unit_limit(compute_unit_limit))
+        if compute_unit_price is not None:
+            budget.append(set_compute_unit_price(compute_unit_price))
+        return budget
+
     async def build_transaction(
-        self, instructions: List[Instruction], fee_payer: str, recent_block: str
+        self,
+        instructions: List[Instruction],
+        fee_payer: str,
+        recent_block: str,
+        nonce_account: Optional[str] = None,
+        nonce_authority: Optional[str] = None,
+        compute_unit_price: Optional[int] = None,
+        compute_unit_limit: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """
+        Builds an unsigned transaction. With ``nonce_account`` set,
+        ``recent_block`` must be the account's current durable nonce and an
+        AdvanceNonceAccount instruction is prepended, so the transaction does
+        not expire with the blockhash. ``compute_unit_price`` (micro-lamports)
+        and ``compute_unit_limit`` prepend the matching ComputeBudget
+        instructions.
+        """
         fee_payer_pubkey = Pubkey.from_string(fee_payer)
         blockhash = Hash.from_string(recent_block)
 
+        instructions = self.compute_budget_instructions(
+            compute_unit_price, compute_unit_limit
+        ) + list(instructions)
+
+        # AdvanceNonceAccount must stay the first instruction
+        if nonce_account:
+            advance = self.build_advance_nonce_instruction(
+                nonce_account, nonce_authority or fee_payer
+            )
+            instructions = [advance] + list(instructions)
+
         message = Message.new_with_blockhash(instructions, fee_payer_pubkey, blockhash)
 
         tx = Transaction.new_unsigned(message)
@@ -64,6 +113,8 @@ class SolanaTxBuilder(BaseTxBuilder):
             "transaction_base64": base64.b64encode(bytes(tx)).decode("utf-8"),
             "message_base64": base64.b64encode(bytes(message)).decode("utf-8"),
             "blockhash": recent_block,
+            "nonce_account": nonce_account,
+            "compute_unit_price": compute_unit_price,
         }
 
     def serialize_transaction(self, transaction: Transaction) -> str:
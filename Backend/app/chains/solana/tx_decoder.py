@@ -0,0 +1,456 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import base58
+from solders.message import MessageV0
+from solders.transaction import VersionedTransaction
+
+from .idl_codec import ANCHOR_DISCRIMINATOR_SIZE, IdlCodec, get_codec
+from .idl_loader import SolanaIDLLoader
+from .lookup_tables import lookup_table_cache
+from .rpc_client import SolanaRPCClient
+from ...core.configs import settings
+from ...utils import cache_stats
+from ...utils.shared_cache import get_shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Programs found without an IDL are not looked up again for this long
+MISSING_IDL_TTL_SECONDS = 300.0
+
+_INVOKE = re.compile(r"^Program (\w+) invoke \[\d+\]$")
+_EXIT = re.compile(r"^Program (\w+) (success|failed)")
+_PROGRAM_DATA = "Program data: "
+# Prefix of Anchor's self-CPI instruction carrying an emit_cpi! event
+EVENT_IX_TAG = hashlib.sha256(b"anchor:event").digest()[:8]
+
+NATIVE_PROGRAMS = {
+    "11111111111111111111111111111111": "System Program",
+    "ComputeBudget111111111111111111111111111111": "Compute Budget Program",
+    "AddressLookupTab1e1111111111111111111111111": "Address Lookup Table Program",
+    "Vote111111111111111111111111111111111111111": "Vote Program",
+    "Stake11111111111111111111111111111111111111": "Stake Program",
+    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA": "Token Program",
+    "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb": "Token-2022 Program",
+    "ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL": "Associated Token Account Program",
+    "MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr": "Memo Program",
+}
+
+
+def _flatten_accounts(accounts: List[Dict[str, Any]]) -> List[str]:
+    """Account names of an IDL instruction with legacy nested groups expanded in order."""
+    names = []
+    for acc in accounts:
+        if "accounts" in acc:
+            names += _flatten_accounts(acc["accounts"])
+        else:
+            names.append(acc.get("name", "unknown"))
+    return names
+
+
+def logged_events(logs: List[str]) -> List[Tuple[str, bytes]]:
+    """``Program data:`` payloads in a transaction's logs with the program that emitted each."""
+    stack: List[str] = []
+    payloads = []
+    for line in logs:
+        invoke = _INVOKE.match(line)
+        if invoke:
+            stack.append(invoke.group(1))
+        elif _EXIT.match(line):
+            if stack:
+                stack.pop()
+        elif line.startswith(_PROGRAM_DATA) and stack:
+            try:
+                payloads.append((stack[-1], base64.b64decode(line[len(_PROGRAM_DATA) :])))
+            except ValueError:
+                continue
+    return payloads
+
+
+ProgramKey = Tuple[str, str]  # (rpc_url, program_id)
+
+
+def _cached_idls(cache: Any) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """``(rpc_url, program_id, {"fingerprint", "idl"})`` for every IDL in the shared cache."""
+    out = []
+    for key, raw in cache.iter_namespace("idl"):
+        # Keys are "rpc_url|program_id" (SolanaIDLLoader.fetch_idl_entry)
+        rpc_url, _, program_id = key.rpartition("|")
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            continue
+        if "fingerprint" in entry:
+            out.append((rpc_url, program_id, entry))
+    return out
+
+
+class DiscriminatorIndex:
+    """
+    Instruction codecs for every IDL we have cached, by RPC endpoint and
+    program id, plus a reverse index of 8-byte instruction discriminators.
+    The reverse index only names candidates for programs without an IDL:
+    common instruction names (``initialize``) share a sighash across every
+    Anchor program, so a discriminator alone doesn't identify the IDL.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._codecs: Dict[ProgramKey, IdlCodec] = {}
+        self._by_discriminator: Dict[bytes, List[ProgramKey]] = {}
+        self._missing: Dict[ProgramKey, float] = {}
+        self._refreshed_at = 0.0
+
+    def add(
+        self,
+        rpc_url: str,
+        program_id: str,
+        idl: Dict[str, Any],
+        fingerprint: Optional[str] = None,
+    ) -> IdlCodec:
+        key = (rpc_url, program_id)
+        current = self._codecs.get(key)
+        if current is not None and current.fingerprint == fingerprint:
+            return current
+        codec = get_codec(program_id, idl, fingerprint)
+        if current is not None and current.fingerprint == codec.fingerprint:
+            return current
+        if current is not None:
+            for disc in current.instructions:
+                programs = self._by_discriminator.get(disc, [])
+                if key in programs:
+                    programs.remove(key)
+        self._codecs[key] = codec
+        for disc in codec.instructions:
+            self._by_discriminator.setdefault(disc, []).append(key)
+        return codec
+
+    async def refresh(self, force: bool = False) -> None:
+        """Picks up IDLs other requests and workers stored in the shared cache."""
+        cache = get_shared_cache()
+        if cache is None:
+            return
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        self._refreshed_at = time.monotonic()
+        entries = await asyncio.to_thread(_cached_idls, cache)
+        for rpc_url, program_id, entry in entries:
+            try:
+                self.add(rpc_url, program_id, entry["idl"], entry["fingerprint"])
+            except Exception as e:
+                logger.debug("Skipping cached IDL for %s: %s", program_id, e)
+
+    def mark_missing(self, rpc_url: str, program_id: str) -> None:
+        self._missing[(rpc_url, program_id)] = time.monotonic() + MISSING_IDL_TTL_SECONDS
+
+    def known_missing(self, rpc_url: str, program_id: str) -> bool:
+        return self._missing.get((rpc_url, program_id), 0.0) > time.monotonic()
+
+    def codec_for(self, rpc_url: str, program_id: str) -> Optional[IdlCodec]:
+        return self._codecs.get((rpc_url, program_id))
+
+    def candidates(self, rpc_url: str, data: bytes) -> List[Dict[str, Optional[str]]]:
+        """Cached IDLs on this endpoint that define the instruction discriminator."""
+        disc = bytes(data[:ANCHOR_DISCRIMINATOR_SIZE])
+        out = []
+        for url, program_id in self._by_discriminator.get(disc, []):
+            if url != rpc_url:
+                continue
+            codec = self._codecs[(url, program_id)]
+            out.append(
+                {
+                    "program_id": program_id,
+                    "program": _program_name(codec),
+                    "name": codec.instructions[disc]["name"],
+                }
+            )
+        return out
+
+    def stats(self) -> Dict[str, int]:
+        return {"programs": len(self._codecs), "discriminators": len(self._by_discriminator)}
+
+
+discriminator_index = DiscriminatorIndex(settings.DISCRIMINATOR_INDEX_REFRESH_SECONDS)
+cache_stats.register("discriminator_index", discriminator_index.stats)
+
+
+def _program_name(codec: IdlCodec) -> Optional[str]:
+    return codec.idl.get("name") or codec.idl.get("metadata", {}).get("name")
+
+
+async def _load_missing_idls(rpc_client: SolanaRPCClient, program_ids: Set[str]) -> None:
+    rpc_url = rpc_client.rpc_url
+    missing = [
+        p for p in program_ids
+        if p not in NATIVE_PROGRAMS
+        and discriminator_index.codec_for(rpc_url, p) is None
+        and not discriminator_index.known_missing(rpc_url, p)
+    ]
+    if not missing:
+        return
+    idl_loader = SolanaIDLLoader(rpc_client)
+
+    async def load(program_id: str) -> None:
+        try:
+            entry = await idl_loader.fetch_idl_entry(program_id)
+        except Exception as e:
+            logger.debug("No IDL for %s: %s", program_id, e)
+            return
+        if entry:
+            discriminator_index.add(rpc_url, program_id, *entry)
+        else:
+            discriminator_index.mark_missing(rpc_url, program_id)
+
+    await asyncio.gather(*(load(p) for p in missing))
+
+
+def account_metas(
+    message: Any, loaded_writable: List[str], loaded_readonly: List[str]
+) -> List[Dict[str, Any]]:
+    """Every account a message references, static keys first, then loaded addresses."""
+    header = message.header
+    static_keys = [str(k) for k in message.account_keys]
+    signed = header.num_required_signatures
+    static_writable = set(range(signed - header.num_readonly_signed_accounts))
+    static_writable |= set(range(signed, len(static_keys) - header.num_readonly_unsigned_accounts))
+    account_keys = [
+        {
+            "pubkey": key,
+            "is_signer": i < signed,
+            "is_writable": i in static_writable,
+            "source": "static",
+        }
+        for i, key in enumerate(static_keys)
+    ]
+    account_keys += [
+        {"pubkey": key, "is_signer": False, "is_writable": True, "source": "lookup"}
+        for key in loaded_writable
+    ]
+    account_keys += [
+        {"pubkey": key, "is_signer": False, "is_writable": False, "source": "lookup"}
+        for key in loaded_readonly
+    ]
+    return account_keys
+
+
+def decode_instruction(
+    rpc_url: str,
+    index: int,
+    program_id: str,
+    data: bytes,
+    accounts: List[Dict[str, Any]],
+    overrides: Dict[str, IdlCodec],
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "index": index,
+        "program_id": program_id,
+        "program": NATIVE_PROGRAMS.get(program_id),
+        "name": None,
+        "args": None,
+        "accounts": accounts,
+        "data_hex": data.hex(),
+        "matched_by": None,
+        "candidates": None,
+        "error": None,
+    }
+    codec = overrides.get(program_id) or discriminator_index.codec_for(rpc_url, program_id)
+    if codec is None:
+        if program_id not in NATIVE_PROGRAMS:
+            # Not decoded: the same discriminator means different things in different programs
+            candidates = discriminator_index.candidates(rpc_url, data)
+            if candidates:
+                result.update(matched_by="ambiguous", candidates=candidates)
+        return result
+
+    result["program"] = _program_name(codec)
+    try:
+        decoded = codec.decode_instruction(data)
+    except Exception as e:
+        result["error"] = f"Could not decode instruction args: {e}"
+        return result
+    if decoded is None:
+        result["error"] = "Unknown instruction discriminator"
+        return result
+
+    name, args = decoded
+    result.update(name=name, args=args, matched_by="program")
+    ix = codec.instructions[bytes(data[:ANCHOR_DISCRIMINATOR_SIZE])]
+    for account, account_name in zip(accounts, _flatten_accounts(ix.get("accounts", []))):
+        account["name"] = account_name
+    return result
+
+
+def decode_event(
+    codec: Optional[IdlCodec], program_id: str, data: bytes, source: str
+) -> Dict[str, Any]:
+    """An Anchor event from a ``Program data:`` log (``log``) or an emit_cpi! self-invocation (``cpi``)."""
+    result: Dict[str, Any] = {
+        "program_id": program_id,
+        "source": source,
+        "name": None,
+        "data": None,
+        "error": None,
+    }
+    if codec is None:
+        result["data_hex"] = data.hex()
+        return result
+    try:
+        decoded = codec.decode_event(data)
+    except Exception as e:
+        result["error"] = f"Could not decode event: {e}"
+        return result
+    if decoded is None:
+        result["error"] = "Unknown event discriminator"
+        result["data_hex"] = data.hex()
+    else:
+        result["name"], result["data"] = decoded
+    return result
+
+
+async def decode_transaction(
+    rpc_client: SolanaRPCClient,
+    raw: bytes,
+    fetch_missing_idls: bool = True,
+    idls: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Parses a legacy or v0 transaction and names each instruction from cached
+    IDLs. ``idls`` supplies IDLs for this call only, taking precedence over
+    the index.
+    """
+    tx = VersionedTransaction.from_bytes(raw)
+    message = tx.message
+    static_keys = [str(k) for k in message.account_keys]
+
+    loaded_writable: List[str] = []
+    loaded_readonly: List[str] = []
+    if isinstance(message, MessageV0):
+        for lookup in message.address_table_lookups:
+            writable = list(lookup.writable_indexes)
+            readonly = list(lookup.readonly_indexes)
+            addresses = await lookup_table_cache.resolve(
+                rpc_client, str(lookup.account_key), writable + readonly
+            )
+            loaded_writable += addresses[: len(writable)]
+            loaded_readonly += addresses[len(writable) :]
+
+    account_keys = account_metas(message, loaded_writable, loaded_readonly)
+
+    compiled = list(message.instructions)
+    overrides = {p: get_codec(p, idl) for p, idl in (idls or {}).items()}
+    program_ids = {account_keys[ix.program_id_index]["pubkey"] for ix in compiled}
+    await discriminator_index.refresh()
+    if fetch_missing_idls:
+        await _load_missing_idls(rpc_client, program_ids - set(overrides))
+
+    instructions = []
+    for i, ix in enumerate(compiled):
+        accounts = [dict(account_keys[a]) for a in bytes(ix.accounts)]
+        instructions.append(
+            decode_instruction(
+                rpc_client.rpc_url,
+                i,
+                account_keys[ix.program_id_index]["pubkey"],
+                bytes(ix.data),
+                accounts,
+                overrides,
+            )
+        )
+
+    return {
+        "signatures": [str(s) for s in tx.signatures],
+        "version": "legacy" if not isinstance(message, MessageV0) else "0",
+        "fee_payer": static_keys[0] if static_keys else None,
+        "recent_blockhash": str(message.recent_blockhash),
+        "account_keys": account_keys,
+        "instructions": instructions,
+    }
+
+
+async def decode_confirmed_transaction(
+    rpc_client: SolanaRPCClient,
+    entry: Dict[str, Any],
+    fetch_missing_idls: bool = True,
+    idls: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Decodes a getTransaction result (base64 transaction plus meta). Loaded
+    addresses come from the meta, so no lookup tables are fetched; inner
+    instructions are nested under the instruction that invoked them and
+    events are decoded with the emitting program's IDL.
+    """
+    meta = entry.get("meta") or {}
+    tx = VersionedTransaction.from_bytes(base64.b64decode(entry["transaction"][0]))
+    message = tx.message
+    loaded = meta.get("loadedAddresses") or {}
+    account_keys = account_metas(
+        message, loaded.get("writable", []), loaded.get("readonly", [])
+    )
+    compiled = list(message.instructions)
+    inner_groups = meta.get("innerInstructions") or []
+
+    overrides = {p: get_codec(p, idl) for p, idl in (idls or {}).items()}
+    program_ids = {account_keys[ix.program_id_index]["pubkey"] for ix in compiled}
+    program_ids |= {
+        account_keys[ix["programIdIndex"]]["pubkey"]
+        for group in inner_groups
+        for ix in group.get("instructions", [])
+    }
+    await discriminator_index.refresh()
+    if fetch_missing_idls:
+        await _load_missing_idls(rpc_client, program_ids - set(overrides))
+
+    def codec_for(program_id: str) -> Optional[IdlCodec]:
+        return overrides.get(program_id) or discriminator_index.codec_for(
+            rpc_client.rpc_url, program_id
+        )
+
+    instructions = []
+    for i, ix in enumerate(compiled):
+        accounts = [dict(account_keys[a]) for a in bytes(ix.accounts)]
+        decoded = decode_instruction(
+            rpc_client.rpc_url, i, account_keys[ix.program_id_index]["pubkey"], bytes(ix.data), accounts, overrides
+        )
+        decoded["inner"] = []
+        instructions.append(decoded)
+
+    events = []
+    for group in inner_groups:
+        for j, ix in enumerate(group.get("instructions", [])):
+            program_id = account_keys[ix["programIdIndex"]]["pubkey"]
+            data = base58.b58decode(ix["data"])
+            if data[:ANCHOR_DISCRIMINATOR_SIZE] == EVENT_IX_TAG:
+                events.append(
+                    decode_event(
+                        codec_for(program_id), program_id, data[ANCHOR_DISCRIMINATOR_SIZE:], "cpi"
+                    )
+                )
+                continue
+            accounts = [dict(account_keys[a]) for a in ix["accounts"]]
+            instructions[group["index"]]["inner"].append(
+                decode_instruction(rpc_client.rpc_url, j, program_id, data, accounts, overrides)
+            )
+    for program_id, payload in logged_events(meta.get("logMessages") or []):
+        codec = codec_for(program_id)
+        if codec is not None:
+            events.append(decode_event(codec, program_id, payload, "log"))
+
+    return {
+        "signature": str(tx.signatures[0]),
+        "slot": entry.get("slot"),
+        "block_time": entry.get("blockTime"),
+        "version": "legacy" if not isinstance(message, MessageV0) else "0",
+        "failed": meta.get("err") is not None,
+        "err": meta.get("err"),
+        "fee": meta.get("fee"),
+        "fee_payer": account_keys[0]["pubkey"] if account_keys else None,
+        "account_keys": account_keys,
+        "instructions": instructions,
+        "events": events,
+    }
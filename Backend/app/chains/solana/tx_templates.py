@@ -0,0 +1,335 @@
+import hashlib
+import json
+import struct
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solders.hash import Hash
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+
+from .idl_codec import get_codec
+from .idl_loader import SolanaIDLLoader
+from .rpc_client import SolanaRPCClient
+from .tx_builder import SolanaTxBuilder
+from .wire import SIGNATURE_SIZE, encode_compact_u16
+from ...core.configs import settings
+from ...utils import cache_stats
+from ...utils.shared_cache import get_shared_cache
+
+COMPUTE_BUDGET_PROGRAM = "ComputeBudget111111111111111111111111111111"
+# ComputeBudget instruction tags
+_SET_COMPUTE_UNIT_LIMIT = 2
+_SET_COMPUTE_UNIT_PRICE = 3
+
+FEE_PAYER = "fee_payer"
+
+# A key before placeholders are resolved: ("key", base58) or ("slot", name)
+Symbol = Tuple[str, str]
+
+
+def template_handle(definition: Dict[str, Any], rpc_url: str) -> str:
+    """
+    Handles are derived from the definition and the cluster its IDL was
+    loaded from, so re-registering a shape is a no-op while the same shape on
+    another cluster gets its own handle.
+    """
+    raw = json.dumps([rpc_url, definition], sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+class TransactionTemplate:
+    """
+    A legacy transaction shape compiled once: the account ordering, message
+    header and the bytes of every instruction except its data. Accounts are
+    fixed pubkeys or named placeholders; building resolves the placeholders
+    and splices them, the blockhash, the compute unit price and the
+    instruction data into the precompiled bytes without going through
+    solders' Message compiler. A build whose placeholders resolve to keys
+    already in the message is compiled the regular way, since merging
+    duplicates changes the ordering.
+    """
+
+    def __init__(
+        self,
+        handle: str,
+        program_id: str,
+        accounts: List[Dict[str, Any]],
+        fee_payer: Optional[str] = None,
+        encode_args: Optional[Callable[[Dict[str, Any]], bytes]] = None,
+        instruction: Optional[str] = None,
+        compute_unit_limit: Optional[int] = None,
+        priority_fee: bool = False,
+    ):
+        self.handle = handle
+        self.program_id = str(_pubkey(program_id))
+        self.instruction = instruction
+        self.encode_args = encode_args
+        self.compute_unit_limit = compute_unit_limit
+        self.priority_fee = priority_fee
+        self.builds = 0
+        self.fallbacks = 0
+
+        self.accounts: List[Tuple[Symbol, bool, bool]] = []
+        for acc in accounts:
+            if bool(acc.get("pubkey")) == bool(acc.get("name")):
+                raise ValueError("Each template account needs exactly one of pubkey or name")
+            if acc.get("name"):
+                symbol = ("slot", acc["name"])
+            else:
+                symbol = ("key", str(_pubkey(acc["pubkey"])))
+            self.accounts.append(
+                (symbol, bool(acc.get("is_signer")), bool(acc.get("is_writable")))
+            )
+        slot_names = {symbol[1] for symbol, _, _ in self.accounts if symbol[0] == "slot"}
+        if fee_payer is None or fee_payer in slot_names:
+            self.fee_payer: Symbol = ("slot", fee_payer or FEE_PAYER)
+        else:
+            self.fee_payer = ("key", str(_pubkey(fee_payer)))
+
+        # Same grouping as the runtime expects: fee payer, writable signers,
+        # readonly signers, writable non-signers, readonly non-signers (programs last)
+        flags: "OrderedDict[Symbol, List[bool]]" = OrderedDict()
+        flags[self.fee_payer] = [True, True]
+        budget = compute_unit_limit is not None or priority_fee
+        programs = ([("key", COMPUTE_BUDGET_PROGRAM)] if budget else []) + [
+            ("key", self.program_id)
+        ]
+        for symbol, is_signer, is_writable in self.accounts:
+            meta = flags.setdefault(symbol, [False, False])
+            meta[0] |= is_signer
+            meta[1] |= is_writable
+        for symbol in programs:
+            flags.setdefault(symbol, [False, False])
+        order = sorted(flags, key=lambda s: (not flags[s][0], not flags[s][1]))
+        if len(order) > 256:
+            raise ValueError("A transaction references at most 256 accounts")
+        self.symbols: List[Symbol] = order
+        index = {symbol: i for i, symbol in enumerate(order)}
+
+        num_signers = sum(1 for s in order if flags[s][0])
+        readonly_signed = sum(1 for s in order if flags[s][0] and not flags[s][1])
+        readonly_unsigned = sum(1 for s in order if not flags[s][0] and not flags[s][1])
+        self.num_required_signatures = num_signers
+        self.placeholders = list(dict.fromkeys(s[1] for s in order if s[0] == "slot"))
+
+        self._keys: List[Optional[bytes]] = [
+            bytes(Pubkey.from_string(s[1])) if s[0] == "key" else None for s in order
+        ]
+        self._slots = [(i, s[1]) for i, s in enumerate(order) if s[0] == "slot"]
+        self._signatures = encode_compact_u16(num_signers) + bytes(SIGNATURE_SIZE * num_signers)
+        self._header = bytes([num_signers, readonly_signed, readonly_unsigned]) + encode_compact_u16(
+            len(order)
+        )
+
+        # Instructions: [SetComputeUnitLimit], [SetComputeUnitPrice], program
+        # (program index, no accounts, data length, tag); indexes are single bytes
+        budget_index = index[programs[0]]
+        self._limit_ix = b""
+        if compute_unit_limit is not None:
+            self._limit_ix = bytes([budget_index, 0, 5, _SET_COMPUTE_UNIT_LIMIT]) + struct.pack(
+                "<I", compute_unit_limit
+            )
+        self._price_prefix = bytes([budget_index, 0, 9, _SET_COMPUTE_UNIT_PRICE])
+        self._ix_count = encode_compact_u16(
+            (compute_unit_limit is not None) + bool(priority_fee) + 1
+        )
+        self._program_ix = (
+            bytes([index[("key", self.program_id)]])
+            + encode_compact_u16(len(self.accounts))
+            + bytes(index[symbol] for symbol, _, _ in self.accounts)
+        )
+        self._writable = [s for s in order if flags[s][1] and s != self.fee_payer]
+
+    def resolve(self, values: Dict[str, str]) -> List[bytes]:
+        """Account keys in message order with the placeholders filled in."""
+        keys = list(self._keys)
+        for i, name in self._slots:
+            value = values.get(name)
+            if not value:
+                raise ValueError(f"Missing account for placeholder '{name}'")
+            keys[i] = bytes(_pubkey(value))
+        return keys
+
+    def writable_accounts(self, values: Dict[str, str]) -> List[str]:
+        """Writable accounts other than the fee payer, for priority fee estimates."""
+        missing = [s[1] for s in self._writable if s[0] == "slot" and not values.get(s[1])]
+        if missing:
+            raise ValueError(f"Missing account for placeholder '{missing[0]}'")
+        return [s[1] if s[0] == "key" else values[s[1]] for s in self._writable]
+
+    def instruction_data(
+        self, args: Optional[Dict[str, Any]], instruction_data: Optional[str]
+    ) -> bytes:
+        if instruction_data is not None:
+            return SolanaTxBuilder().decode_instruction_data(instruction_data)
+        if self.encode_args is None:
+            raise ValueError("This template has no IDL instruction; pass instruction_data")
+        try:
+            return self.encode_args(args or {})
+        except (TypeError, KeyError, AttributeError) as e:
+            raise ValueError(f"Invalid args for {self.instruction}: {e!r}")
+
+    def build(
+        self,
+        values: Dict[str, str],
+        data: bytes,
+        blockhash: str,
+        compute_unit_price: Optional[int] = None,
+    ) -> Tuple[bytes, bytes]:
+        """
+        The unsigned ``(transaction, message)`` bytes for one set of inputs.
+        A template that reserves a compute unit price built without one is
+        compiled without the SetComputeUnitPrice instruction.
+        """
+        keys = self.resolve(values)
+        recent = bytes(Hash.from_string(blockhash))
+        if self.priority_fee and compute_unit_price is None:
+            return self._compile(keys, data, recent, None)
+        if len(set(keys)) != len(keys):
+            self.fallbacks += 1
+            return self._compile(keys, data, recent, compute_unit_price)
+
+        parts = [self._header, *keys, recent, self._ix_count, self._limit_ix]
+        if self.priority_fee:
+            parts += [self._price_prefix, struct.pack("<Q", compute_unit_price)]
+        parts += [self._program_ix, encode_compact_u16(len(data)), data]
+        message = b"".join(parts)
+        self.builds += 1
+        return self._signatures + message, message
+
+    def _compile(
+        self,
+        keys: List[bytes],
+        data: bytes,
+        recent: bytes,
+        compute_unit_price: Optional[int],
+    ) -> Tuple[bytes, bytes]:
+        key_of = {symbol: str(Pubkey.from_bytes(key)) for symbol, key in zip(self.symbols, keys)}
+        tx_builder = SolanaTxBuilder()
+        instruction = tx_builder.build_instruction(
+            self.program_id,
+            [
+                {"pubkey": key_of[symbol], "is_signer": is_signer, "is_writable": is_writable}
+                for symbol, is_signer, is_writable in self.accounts
+            ],
+            data,
+        )
+        instructions = tx_builder.compute_budget_instructions(
+            compute_unit_price if self.priority_fee else None, self.compute_unit_limit
+        ) + [instruction]
+        message = Message.new_with_blockhash(
+            instructions, Pubkey.from_string(key_of[self.fee_payer]), Hash.from_bytes(recent)
+        )
+        return bytes(Transaction.new_unsigned(message)), bytes(message)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "handle": self.handle,
+            "program_id": self.program_id,
+            "instruction": self.instruction,
+            "placeholders": self.placeholders,
+            "account_keys": [s[1] if s[0] == "key" else f"{{{s[1]}}}" for s in self.symbols],
+            "num_required_signatures": self.num_required_signatures,
+            "compute_unit_limit": self.compute_unit_limit,
+            "priority_fee": self.priority_fee,
+            "builds": self.builds,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def _pubkey(value: str) -> Pubkey:
+    try:
+        return Pubkey.from_string(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid public key '{value}': {str(e)}")
+
+
+class TemplateRegistry:
+    """
+    Compiled templates by handle, least recently used evicted past
+    ``max_templates``. Definitions are also written to the shared cache so
+    any worker can compile a handle another worker issued.
+    """
+
+    def __init__(self, max_templates: int):
+        self.max_templates = max_templates
+        self._templates: "OrderedDict[str, TransactionTemplate]" = OrderedDict()
+
+    async def register(
+        self, rpc_client: SolanaRPCClient, definition: Dict[str, Any]
+    ) -> TransactionTemplate:
+        handle = template_handle(definition, rpc_client.rpc_url)
+        template = self._templates.get(handle)
+        if template is not None:
+            self._templates.move_to_end(handle)
+            return template
+
+        encode_args = None
+        if definition.get("instruction"):
+            entry = await SolanaIDLLoader(rpc_client).get_idl_entry_with_fallback(
+                definition["program_id"], definition.get("idl")
+            )
+            if not entry:
+                raise ValueError(f"No Anchor IDL found for program {definition['program_id']}")
+            codec = get_codec(definition["program_id"], *entry)
+            encode_args = codec.args_encoder(definition["instruction"])
+
+        template = TransactionTemplate(
+            handle,
+            definition["program_id"],
+            definition.get("accounts", []),
+            fee_payer=definition.get("fee_payer"),
+            encode_args=encode_args,
+            instruction=definition.get("instruction"),
+            compute_unit_limit=definition.get("compute_unit_limit"),
+            priority_fee=bool(definition.get("priority_fee")),
+        )
+        self._templates[handle] = template
+        while len(self._templates) > self.max_templates:
+            self._templates.popitem(last=False)
+        cache = get_shared_cache()
+        if cache:
+            await cache.aset_json(
+                "tx_template",
+                handle,
+                {"rpc_url": rpc_client.rpc_url, "definition": definition},
+            )
+        return template
+
+    async def get(self, rpc_client: SolanaRPCClient, handle: str) -> Optional[TransactionTemplate]:
+        template = self._templates.get(handle)
+        if template is not None:
+            self._templates.move_to_end(handle)
+            return template
+        cache = get_shared_cache()
+        stored = await cache.aget_json("tx_template", handle) if cache else None
+        if stored is None:
+            return None
+        if stored["rpc_url"] == rpc_client.rpc_url:
+            return await self.register(rpc_client, stored["definition"])
+        # Compile against the cluster the handle was issued for
+        origin = SolanaRPCClient(stored["rpc_url"])
+        try:
+            return await self.register(origin, stored["definition"])
+        finally:
+            await origin.close()
+
+    async def remove(self, handle: str) -> bool:
+        cache = get_shared_cache()
+        if cache:
+            await cache.adelete("tx_template", handle)
+        return self._templates.pop(handle, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._templates),
+            "max_entries": self.max_templates,
+            "builds": sum(t.builds for t in self._templates.values()),
+            "fallbacks": sum(t.fallbacks for t in self._templates.values()),
+        }
+
+
+template_registry = TemplateRegistry(settings.TX_TEMPLATE_MAX)
+cache_stats.register("tx_templates", template_registry.stats)
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .idl_fragments import get_idl_fragments
+from .idl_loader import SolanaIDLLoader, get_idl_address
+from .pda import PDAKey, collect_instruction_pdas, derive_pdas
+from .rpc_client import SolanaRPCClient
+from .tx_decoder import discriminator_index
+from ...core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_URLS = {
+    "mainnet": "https://api.mainnet-beta.solana.com",
+    "mainnet-beta": "https://api.mainnet-beta.solana.com",
+    "devnet": "https://api.devnet.solana.com",
+    "testnet": "https://api.testnet.solana.com",
+}
+# Targets that failed or had no IDL are retried this often
+RETRY_SECONDS = 60.0
+
+
+def parse_targets(value: str) -> List[Tuple[str, str]]:
+    """
+    ``(rpc_url, program_id)`` pairs from comma-separated ``[cluster|]program_id``
+    entries, where the cluster is mainnet, devnet, testnet or an RPC URL.
+    """
+    targets = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        cluster, _, program_id = entry.rpartition("|")
+        rpc_url = CLUSTER_URLS.get(cluster, cluster) or SolanaRPCClient.DEFAULT_RPC_URL
+        targets.append((rpc_url, program_id.strip()))
+    return list(dict.fromkeys(targets))
+
+
+def key_pdas(idl: Dict[str, Any], program_id: str) -> List[PDAKey]:
+    """PDAs the IDL derives from constant seeds alone: config, state and authority accounts."""
+    keys: Dict[PDAKey, None] = {}
+    for ix in idl.get("instructions", []):
+        try:
+            _, derivable, _ = collect_instruction_pdas(idl, program_id, ix["name"], {}, {})
+        except ValueError:
+            continue
+        keys.update(dict.fromkeys(derivable.values()))
+    return list(keys)
+
+
+class WarmTarget:
+    __slots__ = (
+        "rpc_url",
+        "program_id",
+        "state",
+        "attempted_at",
+        "warmed_at",
+        "duration_ms",
+        "details",
+        "error",
+    )
+
+    def __init__(self, rpc_url: str, program_id: str):
+        self.rpc_url = rpc_url
+        self.program_id = program_id
+        self.state = "pending"  # pending, warm, no_idl or failed
+        self.attempted_at = 0.0
+        self.warmed_at: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.details: Dict[str, int] = {}
+        self.error: Optional[str] = None
+
+    def next_due(self, interval: float) -> float:
+        if self.state == "warm":
+            return self.warmed_at + interval
+        return self.attempted_at + min(interval, RETRY_SECONDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rpc_url": self.rpc_url,
+            "program_id": self.program_id,
+            "state": self.state,
+            "age_seconds": (
+                round(time.monotonic() - self.warmed_at, 1) if self.warmed_at else None
+            ),
+            "duration_ms": self.duration_ms,
+            **self.details,
+            "error": self.error,
+        }
+
+
+class Warmer:
+    """
+    Prefetches the IDLs of configured programs at startup, along with
+    everything built from them: /idl response fragments, the compiled codec
+    and its discriminator index entries, and PDAs derived from constant
+    seeds. Each program is then refetched in the background once
+    ``refresh_ahead`` of IDL_CACHE_TTL_SECONDS has passed, before the
+    cached copies expire. ``ready`` turns true once the first round
+    finishes or ``timeout`` seconds after it started.
+    """
+
+    def __init__(
+        self,
+        targets: List[Tuple[str, str]],
+        timeout: float,
+        refresh_ahead: float,
+        concurrency: int,
+    ):
+        self.targets = [WarmTarget(rpc_url, program_id) for rpc_url, program_id in targets]
+        self.timeout = timeout
+        self.refresh_ahead = refresh_ahead
+        self.concurrency = concurrency
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        if self._finished_at is not None or not self.targets:
+            return True
+        return (
+            self._started_at is not None
+            and time.monotonic() - self._started_at >= self.timeout
+        )
+
+    def start(self) -> None:
+        if self.targets and self._task is None:
+            self._started_at = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(target: WarmTarget, force: bool) -> None:
+            async with semaphore:
+                await self.warm(target, force)
+
+        # The first round takes IDLs other workers already put in the shared cache
+        await asyncio.gather(*(warm(t, False) for t in self.targets))
+        self._finished_at = time.monotonic()
+        logger.info(
+            "Warmed %d programs in %.1fs",
+            sum(t.state == "warm" for t in self.targets),
+            self._finished_at - self._started_at,
+        )
+        interval = settings.IDL_CACHE_TTL_SECONDS * self.refresh_ahead
+        while True:
+            next_due = min(t.next_due(interval) for t in self.targets)
+            await asyncio.sleep(max(1.0, next_due - time.monotonic()))
+            now = time.monotonic()
+            due = [t for t in self.targets if t.next_due(interval) <= now]
+            await asyncio.gather(*(warm(t, True) for t in due))
+
+    async def warm(self, target: WarmTarget, force: bool = False) -> None:
+        """Fetches (refetches with ``force``) one program's IDL and rebuilds what derives from it."""
+        started = target.attempted_at = time.monotonic()
+        rpc_client = SolanaRPCClient(target.rpc_url)
+        try:
+            idl_loader = SolanaIDLLoader(rpc_client)
+            get_idl_address(target.program_id)
+            entry = await idl_loader.fetch_idl_entry(target.program_id, force=force)
+            if not entry:
+                target.state, target.error = "no_idl", None
+                return
+            idl, fingerprint = entry
+            await get_idl_fragments(idl_loader, target.program_id, force=force)
+            codec = discriminator_index.add(
+                rpc_client.rpc_url, target.program_id, idl, fingerprint
+            )
+            decoders = codec.precompile()
+            pdas = key_pdas(idl, target.program_id)
+            await derive_pdas(pdas)
+            target.state, target.error = "warm", None
+            target.warmed_at = time.monotonic()
+            target.details = {
+                "instructions": len(codec.instructions),
+                "decoders": decoders,
+                "pdas": len(pdas),
+            }
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Warming %s on %s failed: %s", target.program_id, target.rpc_url, e)
+            target.state, target.error = "failed", str(e)
+        finally:
+            target.duration_ms = round((time.monotonic() - started) * 1000, 1)
+            await rpc_client.close()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warming_complete": self._finished_at is not None,
+            "targets": [t.to_dict() for t in self.targets],
+        }
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+warmer = Warmer(
+    parse_targets(settings.WARM_TARGETS),
+    settings.WARM_TIMEOUT_SECONDS,
+    settings.WARM_REFRESH_AHEAD,
+    settings.WARM_CONCURRENCY,
+)
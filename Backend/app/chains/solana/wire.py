@@ -0,0 +1,148 @@
+from typing import List, NamedTuple, Tuple
+
+import base58
+from solders.pubkey import Pubkey
+
+SIGNATURE_SIZE = 64
+PUBKEY_SIZE = 32
+BLOCKHASH_SIZE = 32
+VERSION_PREFIX_MASK = 0x80
+
+
+def encode_compact_u16(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def decode_compact_u16(data: bytes, offset: int) -> Tuple[int, int]:
+    value = 0
+    for shift in (0, 7, 14):
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+    raise ValueError("Invalid compact-u16 encoding")
+
+
+class MessageLayout(NamedTuple):
+    """Byte positions of the parts of a wire-format message we care about."""
+
+    message_offset: int
+    version: int  # -1 for legacy
+    num_required_signatures: int
+    num_readonly_signed: int
+    num_readonly_unsigned: int
+    account_keys: List[str]
+    blockhash_offset: int
+
+    def writable_keys(self) -> List[str]:
+        """Statically listed writable accounts (lookup-table entries excluded)."""
+        keys = self.account_keys
+        signed = self.num_required_signatures
+        writable = keys[: signed - self.num_readonly_signed]
+        writable += keys[signed : len(keys) - self.num_readonly_unsigned]
+        return writable
+
+
+def parse_message_layout(tx_bytes: bytes) -> MessageLayout:
+    """Locates the header, static account keys and blockhash of a legacy or v0 transaction."""
+    num_signatures, offset = decode_compact_u16(tx_bytes, 0)
+    message_offset = offset + num_signatures * SIGNATURE_SIZE
+    offset = message_offset
+
+    version = -1
+    if tx_bytes[offset] & VERSION_PREFIX_MASK:
+        version = tx_bytes[offset] & ~VERSION_PREFIX_MASK
+        offset += 1
+
+    num_required, readonly_signed, readonly_unsigned = tx_bytes[offset : offset + 3]
+    offset += 3
+    num_keys, offset = decode_compact_u16(tx_bytes, offset)
+    keys = [
+        str(Pubkey.from_bytes(tx_bytes[offset + i * PUBKEY_SIZE : offset + (i + 1) * PUBKEY_SIZE]))
+        for i in range(num_keys)
+    ]
+    offset += num_keys * PUBKEY_SIZE
+    if offset + BLOCKHASH_SIZE > len(tx_bytes):
+        raise ValueError("Transaction is truncated")
+
+    return MessageLayout(
+        message_offset=message_offset,
+        version=version,
+        num_required_signatures=num_required,
+        num_readonly_signed=readonly_signed,
+        num_readonly_unsigned=readonly_unsigned,
+        account_keys=keys,
+        blockhash_offset=offset,
+    )
+
+
+class AddressTableLookup(NamedTuple):
+    account_key: str
+    writable_indexes: List[int]
+    readonly_indexes: List[int]
+
+
+def address_table_lookups(tx_bytes: bytes) -> List[AddressTableLookup]:
+    """A v0 message's lookup-table references; empty for legacy messages."""
+    layout = parse_message_layout(tx_bytes)
+    if layout.version < 0:
+        return []
+    offset = layout.blockhash_offset + BLOCKHASH_SIZE
+    num_instructions, offset = decode_compact_u16(tx_bytes, offset)
+    for _ in range(num_instructions):
+        num_accounts, offset = decode_compact_u16(tx_bytes, offset + 1)
+        data_len, offset = decode_compact_u16(tx_bytes, offset + num_accounts)
+        offset += data_len
+
+    lookups = []
+    num_lookups, offset = decode_compact_u16(tx_bytes, offset)
+    for _ in range(num_lookups):
+        if offset + PUBKEY_SIZE > len(tx_bytes):
+            raise ValueError("Transaction is truncated")
+        account_key = str(Pubkey.from_bytes(tx_bytes[offset : offset + PUBKEY_SIZE]))
+        num_writable, offset = decode_compact_u16(tx_bytes, offset + PUBKEY_SIZE)
+        writable = list(tx_bytes[offset : offset + num_writable])
+        num_readonly, offset = decode_compact_u16(tx_bytes, offset + num_writable)
+        readonly = list(tx_bytes[offset : offset + num_readonly])
+        offset += num_readonly
+        lookups.append(AddressTableLookup(account_key, writable, readonly))
+    return lookups
+
+
+def recent_blockhash(tx_bytes: bytes) -> str:
+    """The message's recent blockhash (or durable nonce), base58-encoded."""
+    offset = parse_message_layout(tx_bytes).blockhash_offset
+    return base58.b58encode(tx_bytes[offset : offset + BLOCKHASH_SIZE]).decode("utf-8")
+
+
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+# SystemInstruction::AdvanceNonceAccount, a u32 enum index
+ADVANCE_NONCE_ACCOUNT_DATA = (4).to_bytes(4, "little")
+
+
+def uses_durable_nonce(tx_bytes: bytes) -> bool:
+    """Whether the first instruction is AdvanceNonceAccount, which makes the blockhash a durable nonce."""
+    layout = parse_message_layout(tx_bytes)
+    offset = layout.blockhash_offset + BLOCKHASH_SIZE
+    num_instructions, offset = decode_compact_u16(tx_bytes, offset)
+    if num_instructions == 0 or offset >= len(tx_bytes):
+        return False
+    program_index = tx_bytes[offset]
+    if program_index >= len(layout.account_keys):
+        return False
+    num_accounts, offset = decode_compact_u16(tx_bytes, offset + 1)
+    data_len, offset = decode_compact_u16(tx_bytes, offset + num_accounts)
+    data = tx_bytes[offset : offset + data_len]
+    return (
+        layout.account_keys[program_index] == SYSTEM_PROGRAM_ID
+        and data[:4] == ADVANCE_NONCE_ACCOUNT_DATA
+    )
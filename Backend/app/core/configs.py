@@ -1,7 +1,9 @@
+import os
+import tempfile
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +15,154 @@ class Settings(BaseSettings):
     # Optional because it might not be set in all environments
     BACKEND_SOLANA_KEYPAIR: Optional[str] = None
 
+    # Shared cache
+    # One SQLite file per host, shared by every worker process
+    SHARED_CACHE_ENABLED: bool = True
+    SHARED_CACHE_PATH: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "chaincall-cache.sqlite3")
+    )
+    SHARED_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    SHARED_CACHE_MAX_ENTRY_BYTES: int = 16 * 1024 * 1024
+    IDL_CACHE_TTL_SECONDS: float = 3600.0
+    ACCOUNT_SNAPSHOT_TTL_SECONDS: float = 60.0
+
+    # PDA derivation
+    PDA_CACHE_SIZE: int = 100_000
+    # Batches with at least this many uncached PDAs go to the process pool
+    PDA_PROCESS_POOL_THRESHOLD: int = 256
+
+    # Executors for CPU-bound work (app/utils/executors.py)
+    EXECUTOR_THREAD_WORKERS: Optional[int] = None  # None = ThreadPoolExecutor default
+    # None = the host's CPUs split across WEB_CONCURRENCY web workers
+    EXECUTOR_PROCESS_WORKERS: Optional[int] = None
+    # Web worker processes on the host (gunicorn reads the same variable for -w)
+    WEB_CONCURRENCY: int = 1
+    EXECUTOR_PROCESS_POOL_ENABLED: bool = True
+    # Work on at least this many bytes (or items, for layouts) leaves the event loop
+    OFFLOAD_MIN_BYTES: int = 64 * 1024
+    OFFLOAD_MIN_ITEMS: int = 512
+
+    # Event loop lag monitor
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.05
+    # A loop blocked this long has the blocking stack captured and logged
+    LOOP_STALL_THRESHOLD_MS: float = 100.0
+    LOOP_STALL_HISTORY: int = 50
+
+    # /debug/profile and /debug/memory require this token in X-Debug-Token;
+    # unset disables them
+    DEBUG_TOKEN: Optional[str] = None
+    DEBUG_PROFILE_MAX_SECONDS: float = 60.0
+    DEBUG_PROFILE_INTERVAL_MS: float = 10.0
+    DEBUG_TRACEMALLOC_FRAMES: int = 16  # stack depth recorded per allocation while tracing
+
+    # Simulation cache (opt-in per request)
+    SIM_CACHE_MAX_ENTRIES: int = 4096
+    SIM_CACHE_TTL_SECONDS: float = 15.0
+    SIM_CACHE_MAX_SLOT_AGE: int = 30
+
+    # Slot-aware account cache (in-process)
+    ACCOUNT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Accounts kept fresh over accountSubscribe, per RPC endpoint
+    ACCOUNT_SUBSCRIPTION_MAX: int = 256
+    ACCOUNT_SUBSCRIPTION_COMMITMENT: str = "confirmed"
+    # Subscribe automatically once a cached account is read this often (0 = only on request)
+    ACCOUNT_SUBSCRIBE_AFTER_READS: int = 0
+
+    # Ask upstream for base64 account data as base64+zstd (needs zstandard)
+    # and decompress it here; callers still get base64
+    ACCOUNT_FETCH_ZSTD: bool = True
+    # Compressed account data at least this large is decompressed off the event loop
+    ZSTD_OFFLOAD_MIN_BYTES: int = 8 * 1024
+
+    # getMultipleAccounts calls in flight per request
+    MULTI_ACCOUNT_CONCURRENCY: int = 8
+    MULTI_ACCOUNT_MAX_CONCURRENCY: int = 32
+    MULTI_ACCOUNT_MAX_PUBKEYS: int = 50_000  # per /accounts/multi request
+    # /accounts/multi streams NDJSON above this many pubkeys unless told otherwise
+    MULTI_ACCOUNT_STREAM_THRESHOLD: int = 1000
+    # Field projections whose byte ranges are this close share one dataSlice
+    PROJECTION_MERGE_GAP_BYTES: int = 256
+
+    # Programs warmed at startup and refreshed before their IDL cache entries
+    # expire: comma-separated "[cluster|]program_id", where cluster is mainnet,
+    # devnet, testnet or an RPC URL (default mainnet)
+    WARM_TARGETS: str = ""
+    # /ready reports ready once warming finishes or this long after startup
+    WARM_TIMEOUT_SECONDS: float = 30.0
+    # Warmed programs are refetched this far into IDL_CACHE_TTL_SECONDS
+    WARM_REFRESH_AHEAD: float = 0.8
+    WARM_CONCURRENCY: int = 4
+
+    # RPC transport: "live", "record" (capture JSON-RPC traffic to the
+    # cassette) or "replay" (serve it back offline)
+    RPC_TRANSPORT_MODE: str = "live"
+    RPC_CASSETTE_PATH: Optional[str] = None
+    RPC_REPLAY_MATCH: str = "exact"  # or "method" to ignore endpoint and params
+    RPC_REPLAY_TIMING: bool = False  # delay replies by their recorded round trip
+
+    # Transaction decoding
+    LOOKUP_TABLE_CACHE_SIZE: int = 4096
+    # How often the discriminator index rescans IDLs in the shared cache
+    DISCRIMINATOR_INDEX_REFRESH_SECONDS: float = 30.0
+
+    # Block-range ingestion
+    INGEST_OUTPUT_DIR: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "chaincall-ingest")
+    )
+    INGEST_CONCURRENCY: int = 8  # getBlock calls in flight per ingestion
+    INGEST_MAX_CONCURRENCY: int = 64
+    INGEST_BLOCK_RETRIES: int = 4
+    INGEST_CHECKPOINT_SECONDS: float = 1.0
+
+    # Address history crawling
+    HISTORY_CONCURRENCY: int = 16  # getTransaction calls in flight per crawl
+    HISTORY_MAX_CONCURRENCY: int = 64
+    HISTORY_FETCH_RETRIES: int = 3
+    HISTORY_CURSOR_SECONDS: float = 1.0
+
+    # Local store of decoded instructions and events written by ingestion
+    # and history crawls
+    DECODED_STORE_ENABLED: bool = True
+    DECODED_STORE_PATH: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "chaincall-decoded.sqlite3")
+    )
+    DECODED_STORE_BATCH_SIZE: int = 500
+    DECODED_STORE_FLUSH_SECONDS: float = 0.5
+    DECODED_STORE_MAX_PENDING: int = 50_000  # writers wait beyond this
+    # Comma-separated IDL account / event field names to index; empty indexes every account
+    DECODED_STORE_ACCOUNT_NAMES: str = ""
+
+    # Preflight policy for /tx/send when the request doesn't choose one
+    # (the values of schemas.PreflightPolicy); anything else fails at startup
+    SEND_PREFLIGHT_POLICY: Literal[
+        "simulate-then-skip-preflight", "preflight-only", "none"
+    ] = "simulate-then-skip-preflight"
+
+    # Priority fee oracle (getRecentPrioritizationFees per writable-account set)
+    PRIORITY_FEE_TTL_SECONDS: float = 10.0
+    # Hot sets are refreshed in the background this far into their TTL
+    PRIORITY_FEE_REFRESH_AHEAD: float = 0.5
+    PRIORITY_FEE_HOT_READS: int = 3  # reads since the last fetch that make a set hot
+    PRIORITY_FEE_MAX_SETS: int = 4096
+    PRIORITY_FEE_PERCENTILES: str = "25,50,75,90,99"  # reported by /tx/priority-fees
+    PRIORITY_FEE_PERCENTILE: float = 75.0  # used by /tx/build with auto_priority_fee
+    PRIORITY_FEE_MIN_MICROLAMPORTS: int = 0
+    PRIORITY_FEE_MAX_MICROLAMPORTS: int = 5_000_000  # never attach more than this
+
+    # A pooled nonce account checked out by /tx/build and never released
+    # (sent or POST /tx/nonce/release) goes back to the pool after this long
+    NONCE_LEASE_SECONDS: float = 300.0
+
+    # Compiled transaction templates kept per worker (least recently used evicted)
+    TX_TEMPLATE_MAX: int = 1024
+
+    # Async send pipeline
+    SEND_QUEUE_MAX_PENDING: int = 10_000  # per cluster; beyond this sends get 429
+    SEND_QUEUE_CONCURRENCY: int = 32  # concurrent sendTransaction calls per cluster
+    SEND_QUEUE_REBROADCAST_SECONDS: float = 2.0
+    SEND_QUEUE_STATUS_TTL_SECONDS: float = 600.0
+
     # This config tells pydantic to read from a .env file if present
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
@@ -2,11 +2,41 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .routers.solana import router as solana_router
+from .routers.debug import router as debug_router
 from .models.schemas import SupportedChainsResponse, ChainInfoResponse
 from .chains.registry import ChainRegistry, initialize_registry
+from .chains.solana.send_queue import send_queue
+from .chains.solana.account_cache import account_cache
+from .chains.solana.ingest import ingest_jobs
+from .chains.solana.decoded_store import decoded_store
+from .chains.solana.priority_fees import priority_fee_oracle
+from .chains.solana.warming import warmer
+from .core.configs import settings
+from .utils import executors
+from .utils.loop_monitor import loop_monitor
+from .utils.rpc_cassette import shutdown_rpc_transport
+from contextlib import asynccontextmanager
 
 initialize_registry()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    warmer.start()
+    yield
+    await warmer.shutdown()
+    await loop_monitor.stop()
+    await send_queue.shutdown()
+    await account_cache.shutdown()
+    await ingest_jobs.shutdown()
+    await decoded_store.shutdown()
+    await priority_fee_oracle.shutdown()
+    await shutdown_rpc_transport()
+    executors.shutdown()
+
+
 app = FastAPI(
     title="Multi-Chain Postman Backend",
     description="""
@@ -26,6 +56,7 @@ extensible architecture for adding other chains.
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -37,6 +68,7 @@ app.add_middleware(
 )
 
 app.include_router(solana_router)
+app.include_router(debug_router)
 
 
 import logging
@@ -73,6 +105,7 @@ async def root():
             },
             "instructions": {
                 f"POST /{chain}/instruction/pack": "Pack instruction data using byte layout",
+                f"POST /{chain}/instruction/pack/bulk": "Pack many rows of one layout from columnar values",
                 f"POST /{chain}/instruction/unpack": "Unpack instruction data using byte layout",
                 f"GET /{chain}/instruction/types": "Get supported data types",
             },
@@ -80,8 +113,43 @@ async def root():
                 f"POST /{chain}/tx/build": "Build an unsigned transaction",
                 f"POST /{chain}/tx/simulate": "Simulate a transaction",
                 f"POST /{chain}/tx/send": "Send a signed transaction",
+                f"POST /{chain}/tx/send/async": "Queue a signed transaction for rebroadcast until confirmed",
+                f"GET /{chain}/tx/send/status/{{signature}}": "Status of a queued transaction",
+                f"GET /{chain}/tx/send/stats": "Send queue counts per cluster",
+                f"GET /{chain}/tx/priority-fees": "Priority fee percentiles for writable accounts",
+                f"POST /{chain}/tx/templates": "Register a precompiled transaction template",
+                f"GET /{chain}/tx/templates/{{handle}}": "Describe a transaction template",
+                f"DELETE /{chain}/tx/templates/{{handle}}": "Remove a transaction template",
+                f"POST /{chain}/tx/templates/{{handle}}/build": "Build a transaction from a template",
+                f"POST /{chain}/tx/decode": "Decode instructions of legacy or v0 transactions",
+                f"POST /{chain}/tx/nonce/accounts": "Register a durable nonce account",
+                f"GET /{chain}/tx/nonce/accounts": "List pooled nonce accounts",
+                f"POST /{chain}/tx/nonce/release": "Release a pooled nonce account",
+            },
+            "accounts": {
+                f"POST /{chain}/accounts/info": "Get account information",
+                f"POST /{chain}/accounts/decode/columnar": "Decode many same-typed accounts into columns",
+                f"POST /{chain}/accounts/multi": "Fetch many accounts in order, optionally IDL-decoded",
+                f"POST /{chain}/accounts/fields": "Read selected IDL fields of many accounts via dataSlice",
+                f"GET /{chain}/accounts/transfer/stats": "Account bytes fetched and saved by base64+zstd",
+            },
+            "pda": {
+                f"POST /{chain}/pda/derive": "Derive many PDAs from typed seeds",
+                f"POST /{chain}/pda/resolve": "Resolve instruction accounts from IDL PDA seeds",
+            },
+            "ingest": {
+                f"POST /{chain}/ingest/blocks": "Stream or write a program's instructions over a slot range",
+                f"GET /{chain}/ingest/jobs": "List background ingestions",
+                f"GET /{chain}/ingest/jobs/{{name}}": "Progress of a background ingestion",
+                f"DELETE /{chain}/ingest/jobs/{{name}}": "Cancel a background ingestion",
+            },
+            "history": {
+                f"POST /{chain}/history": "Stream an address's decoded transactions with a resume cursor",
+            },
+            "store": {
+                f"GET /{chain}/store/records": "Query stored decoded instructions and events",
+                f"GET /{chain}/store/stats": "Decoded store counts",
             },
-            "accounts": {f"POST /{chain}/accounts/info": "Get account information"},
         }
 
     return {
@@ -99,6 +167,16 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready", tags=["Info"])
+async def readiness_check():
+    """503 until the WARM_TARGETS programs are warmed or WARM_TIMEOUT_SECONDS has passed."""
+    status = warmer.status()
+    return JSONResponse(
+        status_code=200 if status["ready"] else 503,
+        content={"status": "ready" if status["ready"] else "warming", **status},
+    )
+
+
 @app.get("/chains", response_model=SupportedChainsResponse, tags=["Info"])
 async def get_supported_chains():
     chains = []
@@ -28,6 +28,12 @@ class DataType(str, Enum):
     BYTES = "bytes"
 
 
+class PreflightPolicy(str, Enum):
+    SIMULATE_THEN_SKIP_PREFLIGHT = "simulate-then-skip-preflight"
+    PREFLIGHT_ONLY = "preflight-only"
+    NONE = "none"
+
+
 class LayoutField(BaseModel):
     type: DataType
     value: Any
@@ -44,6 +50,27 @@ class PackInstructionResponse(BaseModel):
     length: int
 
 
+class BulkPackInstructionRequest(BaseModel):
+    types: List[DataType]
+    columns: List[List[Any]] = Field(
+        description="One list of values per layout field, all of the same length"
+    )
+    prefix_hex: Optional[str] = Field(
+        default=None,
+        description="Constant bytes prepended to every row, e.g. an instruction discriminator",
+    )
+
+
+class BulkPackInstructionResponse(BaseModel):
+    chain: str
+    count: int
+    record_size: Optional[int] = None
+    buffer_base64: str
+    offsets: List[int] = Field(
+        description="N + 1 row boundaries; row i is buffer[offsets[i]:offsets[i + 1]]"
+    )
+
+
 class UnpackInstructionRequest(BaseModel):
     buffer_hex: str
     layout: List[LayoutField]
@@ -71,6 +98,27 @@ class BuildTransactionRequest(BaseModel):
     accounts: List[AccountMeta]
     instruction_data: str = Field(description="Hex or base64 encoded instruction data")
     fee_payer: Optional[str] = None
+    nonce_account: Optional[str] = Field(
+        default=None,
+        description="Durable nonce account to use instead of a recent blockhash",
+    )
+    nonce_authority: Optional[str] = Field(
+        default=None, description="Nonce authority (defaults to the account's authority)"
+    )
+    use_nonce_pool: bool = Field(
+        default=False, description="Check out a nonce account from the registered pool"
+    )
+    compute_unit_price: Optional[int] = Field(
+        default=None, ge=0, description="Priority fee in micro-lamports per compute unit"
+    )
+    auto_priority_fee: bool = Field(
+        default=False,
+        description="Attach a SetComputeUnitPrice from the fee oracle for the writable accounts",
+    )
+    priority_fee_percentile: Optional[float] = Field(
+        default=None, ge=0, le=100, description="Defaults to PRIORITY_FEE_PERCENTILE"
+    )
+    compute_unit_limit: Optional[int] = Field(default=None, gt=0, le=1_400_000)
 
 
 class BuildTransactionResponse(BaseModel):
@@ -78,12 +126,144 @@ class BuildTransactionResponse(BaseModel):
     transaction_base64: str
     message_base64: str
     blockhash: str
+    nonce_account: Optional[str] = None
+    compute_unit_price: Optional[int] = None
+    priority_fee_source: Optional[str] = Field(
+        default=None,
+        description=(
+            "request, cache, rpc, or when no estimate could be fetched in time: stale "
+            "(last known estimate) or floor (PRIORITY_FEE_MIN_MICROLAMPORTS)"
+        ),
+    )
+
+
+class TemplateAccountMeta(BaseModel):
+    pubkey: Optional[str] = Field(default=None, description="Fixed account")
+    name: Optional[str] = Field(
+        default=None, description="Placeholder filled in by each build"
+    )
+    is_signer: bool = False
+    is_writable: bool = False
+
+
+class TransactionTemplateRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    program_id: str
+    accounts: List[TemplateAccountMeta]
+    fee_payer: Optional[str] = Field(
+        default=None,
+        description="Fixed fee payer or the name of a placeholder; defaults to a 'fee_payer' placeholder",
+    )
+    instruction: Optional[str] = Field(
+        default=None, description="IDL instruction whose args each build encodes"
+    )
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to use instead of fetching it on-chain"
+    )
+    compute_unit_limit: Optional[int] = Field(default=None, gt=0, le=1_400_000)
+    priority_fee: bool = Field(
+        default=False,
+        description="Reserve a SetComputeUnitPrice instruction, priced per build",
+    )
+
+
+class TransactionTemplateResponse(BaseModel):
+    chain: str
+    handle: str
+    program_id: str
+    instruction: Optional[str] = None
+    placeholders: List[str]
+    account_keys: List[str] = Field(description="Message account order; placeholders as {name}")
+    num_required_signatures: int
+    compute_unit_limit: Optional[int] = None
+    priority_fee: bool
+    builds: int
+    fallbacks: int
+
+
+class TemplateBuildRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    accounts: Dict[str, str] = Field(
+        default_factory=dict, description="Pubkey for each placeholder"
+    )
+    fee_payer: Optional[str] = Field(
+        default=None, description="Fills the 'fee_payer' placeholder"
+    )
+    args: Optional[Dict[str, Any]] = Field(
+        default=None, description="Instruction args, encoded with the template's IDL"
+    )
+    instruction_data: Optional[str] = Field(
+        default=None, description="Hex or base64 encoded data, instead of args"
+    )
+    recent_blockhash: Optional[str] = Field(
+        default=None, description="Skips the getLatestBlockhash call"
+    )
+    compute_unit_price: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="For templates with priority_fee; estimated by the fee oracle when omitted",
+    )
+    priority_fee_percentile: Optional[float] = Field(
+        default=None, ge=0, le=100, description="Defaults to PRIORITY_FEE_PERCENTILE"
+    )
+
+
+class PriorityFeeEstimateResponse(BaseModel):
+    chain: str
+    rpc_url: str
+    accounts: List[str]
+    percentiles: Dict[str, int]
+    samples: int
+    slot: Optional[int] = None
+    age_seconds: float
+
+
+class NonceAccountRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    address: str
+    authority: Optional[str] = None
+
+
+class NonceReleaseRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    address: str
+    used: bool = Field(
+        default=True,
+        description=(
+            "Whether a transaction using the current nonce was sent; false also "
+            "makes a nonce marked used available again"
+        ),
+    )
+
+
+class NonceAccountInfo(BaseModel):
+    address: str
+    authority: Optional[str] = None
+    nonce: Optional[str] = None
+    in_use: bool
+    uses: int
+    awaiting_advance: bool = Field(
+        default=False, description="Used; not handed out until the chain shows a new nonce"
+    )
+
+
+class NoncePoolResponse(BaseModel):
+    chain: str
+    rpc_url: str
+    accounts: List[NonceAccountInfo]
 
 
 class SimulateTransactionRequest(BaseModel):
     rpc_url: Optional[str] = None
     transaction_base64: str
     encoding: str = Field(default="base64")
+    use_cache: bool = Field(
+        default=False,
+        description="Reuse a recent simulation of the same message (blockhash ignored)",
+    )
+    max_slot_age: Optional[int] = Field(
+        default=None, description="Oldest cached result to accept, in slots"
+    )
 
 
 class SimulateTransactionResponse(BaseModel):
@@ -93,6 +273,8 @@ class SimulateTransactionResponse(BaseModel):
     error: Optional[str] = None
     units_consumed: Optional[int] = None
     return_data: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    slot: Optional[int] = None
 
 
 class SendTransactionRequest(BaseModel):
@@ -108,6 +290,11 @@ class SendTransactionRequest(BaseModel):
         default=False, description="Sign and send with backend keypair (testnet only)"
     )
     additional_signers: Optional[List[AdditionalSigner]] = None
+    preflight: Optional[PreflightPolicy] = Field(
+        default=None,
+        description="Who simulates before sending: we do (then skipPreflight), the node does, or nobody. "
+        "Defaults to SEND_PREFLIGHT_POLICY",
+    )
 
 
 class SendTransactionResponse(BaseModel):
@@ -119,16 +306,190 @@ class SendTransactionResponse(BaseModel):
     return_data: Optional[Dict[str, Any]] = None
 
 
+class AsyncSendRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    transaction_base64: str
+    last_valid_block_height: Optional[int] = Field(
+        default=None,
+        description=(
+            "Stop rebroadcasting after this block height (defaults to the transaction's blockhash "
+            "expiry, or 150 blocks past the processed height when that blockhash isn't the latest; "
+            "durable-nonce transactions are rebroadcast until they land unless it is given)"
+        ),
+    )
+
+
+class SendStatusResponse(BaseModel):
+    chain: str
+    signature: str
+    rpc_url: str
+    status: str = Field(description="queued, sent, confirmed, failed or expired")
+    attempts: int
+    error: Optional[str] = None
+    slot: Optional[int] = None
+    last_valid_block_height: Optional[int] = None
+    submitted_at: float
+    landed_at: Optional[float] = None
+
+
+class IngestBlocksRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    program_id: str
+    start_slot: int = Field(ge=0)
+    end_slot: int = Field(ge=0, description="Inclusive")
+    concurrency: Optional[int] = Field(
+        default=None, ge=1, description="getBlock calls in flight (defaults to INGEST_CONCURRENCY)"
+    )
+    commitment: str = "finalized"
+    include_events: bool = True
+    include_failed: bool = Field(default=False, description="Include failed transactions")
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to decode with instead of the program's on-chain IDL"
+    )
+    output: Optional[str] = Field(
+        default=None,
+        description="Write to this file under INGEST_OUTPUT_DIR in the background instead of streaming",
+    )
+    resume: bool = Field(
+        default=False, description="Continue the output file from its last completed slot"
+    )
+    store: bool = Field(default=True, description="Also write results to the decoded store")
+
+
+class IngestJobResponse(BaseModel):
+    name: str
+    path: str
+    program_id: str
+    start_slot: int
+    end_slot: int
+    status: str = Field(description="running, done, failed or cancelled")
+    last_slot: Optional[int] = Field(default=None, description="Every slot up to here is written")
+    records: int
+    error: Optional[str] = None
+    started_at: float
+    finished_at: Optional[float] = None
+    blocks: int = 0
+    skipped: int = 0
+    transactions: int = 0
+
+
+class IngestJobsResponse(BaseModel):
+    chain: str
+    jobs: List[IngestJobResponse]
+
+
+class AddressHistoryRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    address: str = Field(description="Program or wallet address")
+    before: Optional[str] = Field(
+        default=None, description="Start after this signature (the cursor from a previous call)"
+    )
+    until: Optional[str] = Field(default=None, description="Stop at this signature")
+    limit: Optional[int] = Field(default=1000, ge=1, description="Maximum transactions; null for all")
+    concurrency: Optional[int] = Field(
+        default=None, ge=1, description="getTransaction calls in flight (defaults to HISTORY_CONCURRENCY)"
+    )
+    include_failed: bool = True
+    fetch_missing_idls: bool = True
+    idls: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None, description="IDLs by program id to use for this request only"
+    )
+    commitment: str = "confirmed"
+    store: bool = Field(default=True, description="Also write results to the decoded store")
+
+
+class StoredRecord(BaseModel):
+    kind: str = Field(description="instruction or event")
+    program_id: str
+    name: Optional[str] = None
+    slot: int
+    block_time: Optional[int] = None
+    signature: str
+    failed: bool
+    record: Dict[str, Any]
+
+
+class StoredRecordsResponse(BaseModel):
+    chain: str
+    records: List[StoredRecord]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as cursor for the next page; null on the last page"
+    )
+
+
+class DecodeTransactionRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    transactions: List[str] = Field(description="Serialized legacy or v0 transactions")
+    encoding: str = Field(default="base64", description="base64 or base58")
+    idls: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None, description="IDLs by program id to use for this request only"
+    )
+    fetch_missing_idls: bool = Field(
+        default=True, description="Fetch IDLs for programs not in the index yet"
+    )
+
+
+class DecodedAccountMeta(BaseModel):
+    pubkey: str
+    is_signer: bool
+    is_writable: bool
+    name: Optional[str] = None
+    source: Optional[str] = Field(default=None, description="static or lookup")
+
+
+class DiscriminatorCandidate(BaseModel):
+    program_id: str
+    program: Optional[str] = None
+    name: str
+
+
+class DecodedInstruction(BaseModel):
+    index: int
+    program_id: str
+    program: Optional[str] = None
+    name: Optional[str] = None
+    args: Optional[Dict[str, Any]] = None
+    accounts: List[DecodedAccountMeta]
+    data_hex: str
+    matched_by: Optional[str] = Field(
+        default=None,
+        description=(
+            "program (decoded with the program's own IDL) or ambiguous (not decoded; "
+            "only other cached IDLs define the discriminator)"
+        ),
+    )
+    candidates: Optional[List[DiscriminatorCandidate]] = Field(
+        default=None, description="Cached IDLs defining the discriminator, when ambiguous"
+    )
+    error: Optional[str] = None
+
+
+class DecodedTransaction(BaseModel):
+    signatures: List[str] = []
+    version: Optional[str] = None
+    fee_payer: Optional[str] = None
+    recent_blockhash: Optional[str] = None
+    account_keys: List[DecodedAccountMeta] = []
+    instructions: List[DecodedInstruction] = []
+    error: Optional[str] = None
+
+
+class DecodeTransactionResponse(BaseModel):
+    chain: str
+    transactions: List[DecodedTransaction]
+
+
 class IDLInstruction(BaseModel):
     name: str
     discriminator: Optional[List[int]] = None
-    accounts: List[Dict[str, Any]]
-    args: List[Dict[str, Any]]
+    # Omitted when not selected with fields=
+    accounts: Optional[List[Dict[str, Any]]] = None
+    args: Optional[List[Dict[str, Any]]] = None
 
 
 class IDLType(BaseModel):
     name: str
-    type_def: Dict[str, Any]
+    type_def: Optional[Dict[str, Any]] = None
 
 
 class IDLResponse(BaseModel):
@@ -141,7 +502,7 @@ class IDLResponse(BaseModel):
     types: Optional[List[IDLType]] = None
     events: Optional[List[Dict[str, Any]]] = None
     errors: Optional[List[Dict[str, Any]]] = None
-    raw_idl: Dict[str, Any]
+    raw_idl: Optional[Dict[str, Any]] = None
 
 
 class IDLMethodsResponse(BaseModel):
@@ -160,7 +521,22 @@ class ErrorResponse(BaseModel):
 class AccountInfoRequest(BaseModel):
     rpc_url: Optional[str] = None
     pubkey: str
-    encoding: str = Field(default="base64")
+    encoding: str = Field(
+        default="base64",
+        description="base64, base64+zstd (data stays compressed), base58 or jsonParsed",
+    )
+    max_age_seconds: Optional[float] = Field(
+        default=None,
+        description="Serve a shared-cache snapshot if it is at most this old",
+    )
+    max_staleness_slots: Optional[int] = Field(
+        default=None,
+        description="Serve cached base64 data read at most this many slots ago",
+    )
+    subscribe: bool = Field(
+        default=False,
+        description="Keep this account fresh in the cache over accountSubscribe",
+    )
 
 
 class AccountInfoResponse(BaseModel):
@@ -172,6 +548,175 @@ class AccountInfoResponse(BaseModel):
     rent_epoch: int
     data: Optional[str] = None
     data_len: int
+    slot: Optional[int] = None
+    cached: bool = False
+
+
+class ColumnarDecodeRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    program_id: Optional[str] = None
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to use instead of fetching it on-chain"
+    )
+    account_type: Optional[str] = Field(
+        default=None, description="IDL account/type name describing every blob"
+    )
+    layout: Optional[List[DataType]] = Field(
+        default=None, description="Manual fixed-size layout, used when no account_type is given"
+    )
+    accounts_base64: List[str]
+    skip_bytes: Optional[int] = Field(
+        default=None,
+        description="Leading bytes to skip (defaults to the 8-byte discriminator for IDL types)",
+    )
+    format: str = Field(default="json", description="json or arrow (Arrow IPC stream)")
+
+
+class ColumnarDecodeResponse(BaseModel):
+    chain: str
+    count: int
+    record_size: int
+    columns: Dict[str, List[Any]]
+    discriminator_mismatches: List[int] = Field(default_factory=list)
+
+
+class FieldProjection(BaseModel):
+    accounts: List[str]
+    account_type: str = Field(..., description="IDL account type of every listed account")
+    fields: List[str] = Field(
+        ..., description="Dotted field paths; a struct path returns all its fields"
+    )
+    program_id: Optional[str] = Field(default=None, description="Overrides the request's program_id")
+    idl: Optional[Dict[str, Any]] = Field(default=None, description="Overrides the request's idl")
+
+
+class AccountFieldsRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    program_id: Optional[str] = None
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to use instead of fetching it on-chain"
+    )
+    projections: List[FieldProjection]
+    verify_discriminator: bool = Field(
+        default=False,
+        description="Also read the 8-byte discriminator and reject accounts of another type",
+    )
+
+
+class ProjectedAccount(BaseModel):
+    pubkey: str
+    account_type: str
+    fields: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class AccountFieldsResponse(BaseModel):
+    chain: str
+    slot: Optional[int] = None
+    results: List[List[ProjectedAccount]]
+    rpc_calls: int
+    bytes_fetched: int
+
+
+class MultiAccountRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    pubkeys: List[str] = Field(min_length=1)
+    encoding: str = Field(
+        default="base64",
+        description="base64, base64+zstd (data stays compressed), base58 or jsonParsed",
+    )
+    data_slice_offset: Optional[int] = Field(default=None, ge=0)
+    data_slice_length: Optional[int] = Field(
+        default=None, ge=0, description="Return only this many bytes of each account"
+    )
+    decode: bool = Field(
+        default=False, description="Decode accounts with the program's IDL (or idl)"
+    )
+    program_id: Optional[str] = Field(
+        default=None, description="With decode, only accounts owned by this program are decoded"
+    )
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to use instead of fetching it on-chain"
+    )
+    concurrency: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="getMultipleAccounts calls in flight (defaults to MULTI_ACCOUNT_CONCURRENCY)",
+    )
+    stream: Optional[bool] = Field(
+        default=None,
+        description="Stream NDJSON; defaults to true above MULTI_ACCOUNT_STREAM_THRESHOLD pubkeys",
+    )
+
+
+class MultiAccountEntry(BaseModel):
+    pubkey: str
+    lamports: int
+    owner: str
+    executable: bool
+    rent_epoch: int
+    data: Optional[Any] = None
+    data_len: int
+    account_type: Optional[str] = None
+    decoded: Optional[Any] = None
+    decode_error: Optional[str] = None
+
+
+class MultiAccountResponse(BaseModel):
+    chain: str
+    slot: Optional[int] = None
+    accounts: List[Optional[MultiAccountEntry]] = Field(
+        description="One per requested pubkey, in order; null when the account doesn't exist"
+    )
+    found: int
+    missing: int
+    rpc_calls: int
+
+
+class PDASeed(BaseModel):
+    type: DataType
+    value: Any
+
+
+class PDADeriveItem(BaseModel):
+    program_id: str
+    seeds: List[PDASeed]
+
+
+class PDADeriveRequest(BaseModel):
+    items: List[PDADeriveItem]
+
+
+class PDAResult(BaseModel):
+    address: Optional[str] = None
+    bump: Optional[int] = None
+    error: Optional[str] = None
+
+
+class PDADeriveResponse(BaseModel):
+    chain: str
+    results: List[PDAResult]
+
+
+class PDAResolveRequest(BaseModel):
+    rpc_url: Optional[str] = None
+    program_id: str
+    instruction: str
+    args: Dict[str, Any] = Field(default_factory=dict)
+    accounts: Dict[str, str] = Field(
+        default_factory=dict, description="Known account name -> pubkey"
+    )
+    idl: Optional[Dict[str, Any]] = Field(
+        default=None, description="IDL to use instead of fetching it on-chain"
+    )
+
+
+class PDAResolveResponse(BaseModel):
+    chain: str
+    program_id: str
+    instruction: str
+    accounts: Dict[str, str]
+    unresolved: List[str]
 
 
 class ChainInfoResponse(BaseModel):
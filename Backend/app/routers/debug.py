@@ -0,0 +1,114 @@
+import asyncio
+import secrets
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ..core.configs import settings
+from ..utils import cache_stats, executors
+from ..utils.loop_monitor import loop_monitor
+from ..utils.memory import memory_tracer
+from ..utils.profiler import collapsed, profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)) -> None:
+    if not settings.DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Debug endpoints are disabled (DEBUG_TOKEN is not set)")
+    if x_debug_token is None or not secrets.compare_digest(x_debug_token, settings.DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+@router.get(
+    "/loop",
+    summary="Event Loop Health",
+    description=(
+        "Event loop lag percentiles, recent stalls with the stack that blocked the loop, and "
+        "executor usage. Requires the X-Debug-Token header."
+    ),
+    dependencies=[Depends(require_debug_token)],
+)
+async def loop_health():
+    return {"loop": loop_monitor.stats(), "executors": executors.stats()}
+
+
+@router.get(
+    "/profile",
+    summary="Sample Stacks",
+    description=(
+        "Samples every thread of this worker (or only the event loop thread) for `seconds` "
+        "and returns collapsed stacks, one `frame;frame;... count` line per stack, ready for "
+        "flamegraph.pl or speedscope. Requires the X-Debug-Token header."
+    ),
+    dependencies=[Depends(require_debug_token)],
+)
+async def profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: Optional[float] = Query(None, gt=0, description="Defaults to DEBUG_PROFILE_INTERVAL_MS"),
+    threads: str = Query("all", pattern="^(all|loop)$"),
+    idle: bool = Query(False, description="Keep samples of threads parked waiting for work"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+):
+    if seconds > settings.DEBUG_PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be at most {settings.DEBUG_PROFILE_MAX_SECONDS}",
+        )
+    interval = (interval_ms or settings.DEBUG_PROFILE_INTERVAL_MS) / 1000
+    # The handler runs on the loop thread, so this is the loop's ident
+    loop_thread = threading.get_ident() if threads == "loop" else None
+    try:
+        result = await asyncio.to_thread(profiler.profile, seconds, interval, loop_thread, idle)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "json":
+        result["stacks"] = [{"stack": stack, "count": count} for stack, count in result["stacks"]]
+        return result
+    return PlainTextResponse(collapsed(result))
+
+
+@router.get(
+    "/memory",
+    summary="Memory Report",
+    description=(
+        "Sizes reported by every cache and process memory. While tracing is on, also the top "
+        "allocation sites and the growth since the baseline snapshot (`reset` makes this "
+        "snapshot the new baseline). Requires the X-Debug-Token header."
+    ),
+    dependencies=[Depends(require_debug_token)],
+)
+async def memory_report(
+    top: int = Query(20, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    reset: bool = Query(False),
+):
+    report = await asyncio.to_thread(memory_tracer.report, top, group_by, reset)
+    report["caches"] = cache_stats.collect()
+    return report
+
+
+@router.post(
+    "/memory/tracing",
+    summary="Start Allocation Tracing",
+    description="Starts tracemalloc and takes the baseline snapshot. Requires the X-Debug-Token header.",
+    dependencies=[Depends(require_debug_token)],
+)
+async def start_tracing(
+    frames: Optional[int] = Query(None, ge=1, le=100, description="Defaults to DEBUG_TRACEMALLOC_FRAMES"),
+):
+    await asyncio.to_thread(memory_tracer.start, frames or settings.DEBUG_TRACEMALLOC_FRAMES)
+    return {"tracing": True}
+
+
+@router.delete(
+    "/memory/tracing",
+    summary="Stop Allocation Tracing",
+    description="Stops tracemalloc and frees its traces. Requires the X-Debug-Token header.",
+    dependencies=[Depends(require_debug_token)],
+)
+async def stop_tracing():
+    memory_tracer.stop()
+    return {"tracing": False}
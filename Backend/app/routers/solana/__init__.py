@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import idl, instructions, transactions, accounts
+from . import idl, instructions, transactions, accounts, pda, ingest, history, store
 
 router = APIRouter(prefix="/solana", tags=["Solana"])
 
@@ -7,3 +7,7 @@ router.include_router(idl.router)
 router.include_router(instructions.router)
 router.include_router(transactions.router)
 router.include_router(accounts.router)
+router.include_router(pda.router)
+router.include_router(ingest.router)
+router.include_router(history.router)
+router.include_router(store.router)
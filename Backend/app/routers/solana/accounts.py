@@ -1,7 +1,29 @@
 from fastapi import APIRouter, HTTPException
-from ...chains.solana import SolanaRPCClient
-from ...models.schemas import AccountInfoRequest, AccountInfoResponse, ErrorResponse
+from fastapi.responses import Response, StreamingResponse
+from ...chains.solana import SolanaRPCClient, SolanaIDLLoader
+from ...chains.solana.account_cache import account_cache
+from ...chains.solana.account_data import data_len, get_account, transfer_stats
+from ...chains.solana.columnar import ColumnarLayout
+from ...chains.solana.idl_codec import get_codec
+from ...chains.solana.multi_accounts import MultiAccountReader, stream_accounts
+from ...chains.solana.projection import Projection, ProjectionReader
+from ...models.schemas import (
+    AccountFieldsRequest,
+    AccountFieldsResponse,
+    AccountInfoRequest,
+    AccountInfoResponse,
+    ColumnarDecodeRequest,
+    ColumnarDecodeResponse,
+    MultiAccountRequest,
+    MultiAccountResponse,
+    ErrorResponse,
+)
+from ...core.configs import settings
+from ...utils.executors import run_cpu
+from ...utils.shared_cache import get_shared_cache
 import base64
+import time
+from solders.pubkey import Pubkey
 
 router = APIRouter(prefix="/accounts", tags=["Solana - Accounts"])
 
@@ -15,12 +37,41 @@ router = APIRouter(prefix="/accounts", tags=["Solana - Accounts"])
 )
 async def get_account_info(request: AccountInfoRequest):
     rpc_client = SolanaRPCClient(request.rpc_url)
+    cache = get_shared_cache()
+    cache_key = f"{rpc_client.rpc_url}|{request.encoding}|{request.pubkey}"
     
     try:
-        account_info = await rpc_client.get_account_info(
-            request.pubkey,
-            request.encoding
+        account_info = None
+        slot = None
+        cached = False
+        use_slot_cache = request.encoding == "base64" and (
+            request.max_staleness_slots is not None or request.subscribe
         )
+        if use_slot_cache:
+            account_info, slot, cached = await account_cache.fetch(
+                rpc_client,
+                request.pubkey,
+                request.max_staleness_slots or 0,
+                request.subscribe,
+            )
+        elif cache and request.max_age_seconds:
+            snapshot = await cache.aget_json("account", cache_key)
+            if snapshot and time.time() - snapshot["fetched_at"] <= request.max_age_seconds:
+                account_info = snapshot["value"]
+                cached = True
+
+        if account_info is None and not use_slot_cache:
+            result = await get_account(rpc_client, request.pubkey, request.encoding)
+            account_info = result.get("value")
+            slot = result.get("context", {}).get("slot")
+            # Snapshots are only written for callers that read them back
+            if cache and account_info and request.max_age_seconds:
+                await cache.aset_json(
+                    "account",
+                    cache_key,
+                    {"fetched_at": time.time(), "value": account_info},
+                    settings.ACCOUNT_SNAPSHOT_TTL_SECONDS,
+                )
         
         if not account_info:
             raise HTTPException(
@@ -30,13 +81,10 @@ async def get_account_info(request: AccountInfoRequest):
         
         data = account_info.get("data")
         data_str = None
-        data_len = 0
         
         if data:
             if isinstance(data, list) and len(data) > 0:
                 data_str = data[0]
-                if isinstance(data_str, str):
-                    data_len = len(base64.b64decode(data_str))
             elif isinstance(data, str):
                 data_str = data
         
@@ -48,11 +96,15 @@ async def get_account_info(request: AccountInfoRequest):
             executable=account_info.get("executable", False),
             rent_epoch=account_info.get("rentEpoch", 0),
             data=data_str,
-            data_len=data_len
+            data_len=await data_len(account_info),
+            slot=slot,
+            cached=cached,
         )
     
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -60,3 +112,227 @@ async def get_account_info(request: AccountInfoRequest):
         )
     finally:
         await rpc_client.close()
+
+
+@router.post(
+    "/multi",
+    response_model=MultiAccountResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Get Multiple Accounts",
+    description=(
+        "Fetch any number of accounts in input order with concurrent getMultipleAccounts "
+        "calls of 100, optionally decoded with an IDL; large requests stream NDJSON"
+    ),
+)
+async def get_multiple_accounts(request: MultiAccountRequest):
+    if len(request.pubkeys) > settings.MULTI_ACCOUNT_MAX_PUBKEYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MULTI_ACCOUNT_MAX_PUBKEYS} pubkeys per request",
+        )
+    concurrency = request.concurrency or settings.MULTI_ACCOUNT_CONCURRENCY
+    if concurrency > settings.MULTI_ACCOUNT_MAX_CONCURRENCY:
+        raise HTTPException(
+            status_code=400,
+            detail=f"concurrency must be at most {settings.MULTI_ACCOUNT_MAX_CONCURRENCY}",
+        )
+    for pubkey in request.pubkeys:
+        try:
+            Pubkey.from_string(pubkey)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid public key: {pubkey}")
+
+    rpc_client = SolanaRPCClient(request.rpc_url)
+    stream = request.stream
+    if stream is None:
+        stream = len(request.pubkeys) > settings.MULTI_ACCOUNT_STREAM_THRESHOLD
+
+    try:
+        codec = None
+        if request.decode:
+            if not request.program_id and not request.idl:
+                raise ValueError("program_id or idl is required with decode")
+            entry = await SolanaIDLLoader(rpc_client).get_idl_entry_with_fallback(
+                request.program_id, request.idl
+            )
+            if not entry:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No Anchor IDL found for program {request.program_id}",
+                )
+            codec = get_codec(request.program_id or "", *entry)
+
+        data_slice = None
+        if request.data_slice_length is not None:
+            data_slice = (request.data_slice_offset or 0, request.data_slice_length)
+        reader = MultiAccountReader(
+            rpc_client,
+            request.encoding,
+            data_slice,
+            concurrency,
+            codec,
+            request.program_id,
+        )
+
+        if stream:
+            # The stream closes the client when it ends
+            response = StreamingResponse(
+                stream_accounts(reader, request.pubkeys),
+                media_type="application/x-ndjson",
+            )
+            rpc_client = None
+            return response
+
+        accounts = await reader.read(request.pubkeys)
+        return MultiAccountResponse(chain="solana", accounts=accounts, **reader.stats())
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching accounts: {str(e)}"
+        )
+    finally:
+        if rpc_client is not None:
+            await rpc_client.close()
+
+
+@router.post(
+    "/decode/columnar",
+    response_model=ColumnarDecodeResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Columnar Account Decode",
+    description="Decode many same-typed account blobs into columns using a NumPy structured dtype",
+)
+async def decode_accounts_columnar(request: ColumnarDecodeRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+
+    try:
+        discriminator = None
+        if request.account_type:
+            if not request.program_id and not request.idl:
+                raise ValueError("program_id or idl is required with account_type")
+            idl_loader = SolanaIDLLoader(rpc_client)
+            entry = await idl_loader.get_idl_entry_with_fallback(request.program_id, request.idl)
+            if not entry:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No Anchor IDL found for program {request.program_id}",
+                )
+            codec = get_codec(request.program_id or "", *entry)
+            skip = 8 if request.skip_bytes is None else request.skip_bytes
+            layout = ColumnarLayout.from_idl(codec, request.account_type, skip)
+            if skip == 8:
+                discriminator = codec.account_discriminator(request.account_type)
+        elif request.layout:
+            layout = ColumnarLayout.from_types(
+                [t.value for t in request.layout], request.skip_bytes or 0
+            )
+        else:
+            raise ValueError("Either account_type or layout is required")
+
+        blobs = [base64.b64decode(blob) for blob in request.accounts_base64]
+        batch = await run_cpu(
+            layout.decode, blobs, discriminator, size=sum(len(blob) for blob in blobs)
+        )
+
+        if request.format == "arrow":
+            return Response(
+                content=batch.to_arrow_ipc(),
+                media_type="application/vnd.apache.arrow.stream",
+            )
+
+        return ColumnarDecodeResponse(
+            chain="solana",
+            count=len(batch),
+            record_size=layout.record_size,
+            columns=batch.to_pydict(),
+            discriminator_mismatches=batch.mismatches,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error decoding accounts: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
+
+
+@router.post(
+    "/fields",
+    response_model=AccountFieldsResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Read Account Fields",
+    description=(
+        "Read selected IDL fields of many accounts without downloading them whole: field "
+        "offsets come from the compiled layout and only the covering bytes are fetched with "
+        "getMultipleAccounts dataSlice, sharing calls across projections"
+    ),
+)
+async def read_account_fields(request: AccountFieldsRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+
+    try:
+        idl_loader = SolanaIDLLoader(rpc_client)
+        codecs = {}
+        requests = []
+        for projection in request.projections:
+            program_id = projection.program_id or request.program_id
+            idl_content = projection.idl or request.idl
+            if not program_id and not idl_content:
+                raise ValueError("program_id or idl is required for every projection")
+            key = (program_id, id(idl_content))
+            if key not in codecs:
+                entry = await idl_loader.get_idl_entry_with_fallback(program_id, idl_content)
+                if not entry:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No Anchor IDL found for program {program_id}",
+                    )
+                codecs[key] = get_codec(program_id or "", *entry)
+            requests.append(
+                (
+                    await Projection.create(
+                        codecs[key], projection.account_type, projection.fields
+                    ),
+                    projection.accounts,
+                )
+            )
+
+        reader = ProjectionReader(
+            rpc_client, settings.MULTI_ACCOUNT_CONCURRENCY, request.verify_discriminator
+        )
+        results = await reader.read(requests)
+        return AccountFieldsResponse(
+            chain="solana",
+            slot=reader.slot,
+            results=results,
+            rpc_calls=reader.calls,
+            bytes_fetched=reader.bytes_fetched,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error reading account fields: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
+
+
+@router.get(
+    "/transfer/stats",
+    summary="Account Transfer Stats",
+    description="Account data fetched from upstream RPC and the bytes base64+zstd transfer saved",
+)
+async def get_transfer_stats():
+    return {"chain": "solana", "transfer": transfer_stats.stats()}
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from ...chains.solana import SolanaRPCClient
+from ...chains.solana.history import HistoryCrawler, stream_history
+from ...models.schemas import AddressHistoryRequest, ErrorResponse
+from ...core.configs import settings
+from solders.pubkey import Pubkey
+
+router = APIRouter(prefix="/history", tags=["Solana - History"])
+
+
+@router.post(
+    "",
+    responses={400: {"model": ErrorResponse}},
+    summary="Address History",
+    description=(
+        "Stream an address's transactions newest first as decoded NDJSON, with cursor "
+        "lines to resume from"
+    ),
+)
+async def address_history(request: AddressHistoryRequest):
+    concurrency = request.concurrency or settings.HISTORY_CONCURRENCY
+    if concurrency > settings.HISTORY_MAX_CONCURRENCY:
+        raise HTTPException(
+            status_code=400,
+            detail=f"concurrency must be at most {settings.HISTORY_MAX_CONCURRENCY}",
+        )
+    try:
+        Pubkey.from_string(request.address)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid address: {request.address}")
+
+    crawler = HistoryCrawler(
+        SolanaRPCClient(request.rpc_url),
+        request.address,
+        concurrency,
+        request.include_failed,
+        request.fetch_missing_idls,
+        request.idls,
+        request.commitment,
+        request.store,
+    )
+    return StreamingResponse(
+        stream_history(crawler, request.before, request.until, request.limit),
+        media_type="application/x-ndjson",
+    )
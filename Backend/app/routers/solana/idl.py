@@ -1,68 +1,72 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from typing import List, Optional
 from ...chains.solana import SolanaRPCClient, SolanaIDLLoader
+from ...chains.solana.idl_fragments import (
+    IDL_FIELDS,
+    IDL_SECTIONS,
+    METHOD_FIELDS,
+    get_idl_fragments,
+    parse_selection,
+    render_idl,
+    render_methods,
+)
 from ...models.schemas import IDLResponse, IDLMethodsResponse, ErrorResponse
 
 router = APIRouter(prefix="/idl", tags=["Solana - IDL"])
 
 
+FIELDS_DESCRIPTION = (
+    "Comma-separated sections to return: " + ", ".join(IDL_SECTIONS)
+    + "; add 'names' to list only item names. Defaults to everything"
+)
+INSTRUCTION_DESCRIPTION = "Only these instructions (repeat or comma-separate)"
+
+
+def _instruction_filter(instruction: Optional[List[str]]) -> Optional[List[str]]:
+    if not instruction:
+        return None
+    return [name.strip() for value in instruction for name in value.split(",") if name.strip()]
+
+
 @router.get(
     "/{program_id}",
     response_model=IDLResponse,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
     summary="Fetch Anchor IDL",
     description="Fetch and parse the Anchor IDL for a Solana program"
 )
 async def get_idl(
     program_id: str,
-    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)")
+    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)"),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    instruction: Optional[List[str]] = Query(default=None, description=INSTRUCTION_DESCRIPTION),
 ):
     rpc_client = SolanaRPCClient(rpc_url)
     idl_loader = SolanaIDLLoader(rpc_client)
     
     try:
-        idl = await idl_loader.fetch_idl(program_id)
+        selected = parse_selection(fields, IDL_FIELDS)
+        fragments = await get_idl_fragments(idl_loader, program_id)
         
-        if not idl:
+        if not fragments:
             raise HTTPException(
                 status_code=404,
                 detail=f"No Anchor IDL found for program {program_id}"
             )
         
-        instructions = idl_loader.parse_instructions(idl)
-        accounts = idl_loader.parse_accounts(idl)
-        types = idl_loader.parse_types(idl)
-        events = idl_loader.parse_events(idl)
-        errors = idl_loader.parse_errors(idl)
-        
-        return IDLResponse(
-            chain="solana",
-            program_id=program_id,
-            version=idl.get("version"),
-            name=idl.get("name"),
-            instructions=[
-                {
-                    "name": ix["name"],
-                    "discriminator": ix.get("discriminator"),
-                    "accounts": ix["accounts"],
-                    "args": ix["args"]
-                }
-                for ix in instructions
-            ],
-            accounts=[
-                {"name": acc["name"], "type_def": acc.get("type", {})}
-                for acc in accounts
-            ],
-            types=[
-                {"name": t["name"], "type_def": t.get("type", {})}
-                for t in types
-            ],
-            events=events,
-            errors=errors,
-            raw_idl=idl
+        content = render_idl(
+            fragments, program_id, selected, _instruction_filter(instruction)
         )
+        return Response(content=content, media_type="application/json")
     
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -75,44 +79,44 @@ async def get_idl(
 @router.get(
     "/{program_id}/methods",
     response_model=IDLMethodsResponse,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
     summary="Get IDL Methods",
     description="Get list of instruction methods and their argument schemas from a Solana program's IDL"
 )
 async def get_idl_methods(
     program_id: str,
-    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)")
+    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated method attributes: " + ", ".join(METHOD_FIELDS),
+    ),
+    instruction: Optional[List[str]] = Query(default=None, description=INSTRUCTION_DESCRIPTION),
 ):
     rpc_client = SolanaRPCClient(rpc_url)
     idl_loader = SolanaIDLLoader(rpc_client)
     
     try:
-        idl = await idl_loader.fetch_idl(program_id)
+        selected = parse_selection(fields, METHOD_FIELDS)
+        fragments = await get_idl_fragments(idl_loader, program_id)
         
-        if not idl:
+        if not fragments:
             raise HTTPException(
                 status_code=404,
                 detail=f"No Anchor IDL found for program {program_id}"
             )
         
-        instructions = idl_loader.parse_instructions(idl)
-        
-        return IDLMethodsResponse(
-            chain="solana",
-            program_id=program_id,
-            methods=[
-                {
-                    "name": ix["name"],
-                    "discriminator": ix.get("discriminator"),
-                    "accounts": ix["accounts"],
-                    "args": ix["args"]
-                }
-                for ix in instructions
-            ]
+        content = render_methods(
+            fragments, program_id, selected, _instruction_filter(instruction)
         )
+        return Response(content=content, media_type="application/json")
     
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
     except Exception as e:
         raise HTTPException(
             status_code=500,
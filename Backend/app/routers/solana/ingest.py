@@ -0,0 +1,125 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from ...chains.solana import SolanaRPCClient, SolanaIDLLoader
+from ...chains.solana.idl_codec import get_codec
+from ...chains.solana.ingest import BlockIngestor, ingest_jobs, stream_ndjson
+from ...models.schemas import (
+    IngestBlocksRequest,
+    IngestJobResponse,
+    IngestJobsResponse,
+    ErrorResponse,
+)
+from ...core.configs import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/ingest", tags=["Solana - Ingestion"])
+
+
+@router.post(
+    "/blocks",
+    responses={
+        202: {"model": IngestJobResponse},
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Ingest Block Range",
+    description=(
+        "Stream a program's decoded instructions and events over a slot range as NDJSON, "
+        "or write them to a resumable file in the background when `output` is set"
+    ),
+)
+async def ingest_blocks(request: IngestBlocksRequest):
+    if request.end_slot < request.start_slot:
+        raise HTTPException(status_code=400, detail="end_slot must not be before start_slot")
+    concurrency = request.concurrency or settings.INGEST_CONCURRENCY
+    if concurrency > settings.INGEST_MAX_CONCURRENCY:
+        raise HTTPException(
+            status_code=400,
+            detail=f"concurrency must be at most {settings.INGEST_MAX_CONCURRENCY}",
+        )
+
+    rpc_client = SolanaRPCClient(request.rpc_url)
+    try:
+        entry = (request.idl, None) if request.idl is not None else None
+        if entry is None:
+            try:
+                entry = await SolanaIDLLoader(rpc_client).fetch_idl_entry(request.program_id)
+            except Exception as e:
+                logger.info("Ingesting %s without an IDL: %s", request.program_id, e)
+        ingestor = BlockIngestor(
+            rpc_client,
+            request.program_id,
+            get_codec(request.program_id, *entry) if entry else None,
+            concurrency,
+            request.include_failed,
+            request.include_events,
+            request.commitment,
+            request.store,
+        )
+
+        if request.output is None:
+            return StreamingResponse(
+                stream_ndjson(ingestor, request.start_slot, request.end_slot),
+                media_type="application/x-ndjson",
+            )
+
+        job = ingest_jobs.start(
+            request.output, ingestor, request.start_slot, request.end_slot, request.resume
+        )
+        return JSONResponse(
+            status_code=202, content=IngestJobResponse(**job.to_dict()).model_dump()
+        )
+    except ValueError as e:
+        await rpc_client.close()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await rpc_client.close()
+        raise HTTPException(status_code=500, detail=f"Error starting ingestion: {str(e)}")
+
+
+@router.get(
+    "/jobs",
+    response_model=IngestJobsResponse,
+    summary="List Ingestions",
+    description="Background ingestions started by this worker",
+)
+async def list_ingest_jobs():
+    return IngestJobsResponse(
+        chain="solana", jobs=[IngestJobResponse(**job.to_dict()) for job in ingest_jobs.all()]
+    )
+
+
+@router.get(
+    "/jobs/{name}",
+    response_model=IngestJobResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    summary="Ingestion Status",
+    description="Progress of a background ingestion",
+)
+async def get_ingest_job(name: str):
+    try:
+        job = ingest_jobs.get(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion not found: {name}")
+    return IngestJobResponse(**job.to_dict())
+
+
+@router.delete(
+    "/jobs/{name}",
+    response_model=IngestJobResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    summary="Cancel Ingestion",
+    description="Stop a background ingestion; its checkpoint allows resuming later",
+)
+async def cancel_ingest_job(name: str):
+    try:
+        job = ingest_jobs.cancel(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion not found: {name}")
+    return IngestJobResponse(**job.to_dict())
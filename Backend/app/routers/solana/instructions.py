@@ -3,15 +3,24 @@ from ...chains.solana import SolanaBytePacker
 from ...models.schemas import (
     PackInstructionRequest,
     PackInstructionResponse,
+    BulkPackInstructionRequest,
+    BulkPackInstructionResponse,
     UnpackInstructionRequest,
     UnpackInstructionResponse,
     ErrorResponse,
 )
+from ...core.configs import settings
+from ...utils.executors import run_cpu
 import base64
 
 router = APIRouter(prefix="/instruction", tags=["Solana - Instructions"])
 
 
+def _layout_size(layout) -> int:
+    """Fields plus list elements, the unit for the offload threshold."""
+    return sum(len(f["value"]) if isinstance(f.get("value"), (list, str)) else 1 for f in layout)
+
+
 @router.post(
     "/pack",
     response_model=PackInstructionResponse,
@@ -23,7 +32,13 @@ async def pack_instruction(request: PackInstructionRequest):
     try:
         packer = SolanaBytePacker()
         layout = [{"type": f.type.value, "value": f.value} for f in request.layout]
-        packed_bytes = packer.pack_layout(layout)
+        packed_bytes = await run_cpu(
+            packer.pack_layout,
+            layout,
+            size=_layout_size(layout),
+            threshold=settings.OFFLOAD_MIN_ITEMS,
+            process=True,
+        )
 
         return PackInstructionResponse(
             chain="solana",
@@ -40,6 +55,42 @@ async def pack_instruction(request: PackInstructionRequest):
         )
 
 
+@router.post(
+    "/pack/bulk",
+    response_model=BulkPackInstructionResponse,
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Bulk Pack Instruction Data",
+    description="Pack many rows that share one layout from columnar values into a single buffer",
+)
+async def pack_instruction_bulk(request: BulkPackInstructionRequest):
+    try:
+        packer = SolanaBytePacker()
+        prefix = bytes.fromhex(request.prefix_hex) if request.prefix_hex else b""
+        buffer, offsets, record_size = await run_cpu(
+            packer.pack_columns,
+            [t.value for t in request.types],
+            request.columns,
+            prefix,
+            size=sum(len(column) for column in request.columns),
+            threshold=settings.OFFLOAD_MIN_ITEMS,
+        )
+
+        return BulkPackInstructionResponse(
+            chain="solana",
+            count=len(offsets) - 1,
+            record_size=record_size,
+            buffer_base64=base64.b64encode(buffer).decode("utf-8"),
+            offsets=offsets,
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error packing instructions: {str(e)}"
+        )
+
+
 @router.post(
     "/unpack",
     response_model=UnpackInstructionResponse,
@@ -52,7 +103,9 @@ async def unpack_instruction(request: UnpackInstructionRequest):
         packer = SolanaBytePacker()
         data = bytes.fromhex(request.buffer_hex)
         layout = [{"type": f.type.value} for f in request.layout]
-        unpacked_values = packer.unpack_layout(layout, data)
+        unpacked_values = await run_cpu(
+            packer.unpack_layout, layout, data, size=len(data), process=True
+        )
 
         return UnpackInstructionResponse(chain="solana", values=unpacked_values)
 
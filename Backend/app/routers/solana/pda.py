@@ -0,0 +1,97 @@
+from fastapi import APIRouter, HTTPException
+from ...chains.solana import SolanaRPCClient, SolanaIDLLoader, SolanaBytePacker
+from ...chains.solana.pda import check_pda_key, derive_pdas, resolve_instruction_accounts
+from ...models.schemas import (
+    PDADeriveRequest,
+    PDADeriveResponse,
+    PDAResolveRequest,
+    PDAResolveResponse,
+    PDAResult,
+    ErrorResponse,
+)
+
+router = APIRouter(prefix="/pda", tags=["Solana - PDA"])
+
+
+@router.post(
+    "/derive",
+    response_model=PDADeriveResponse,
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Derive PDAs",
+    description="Derive many program derived addresses from typed seeds in one call",
+)
+async def derive(request: PDADeriveRequest):
+    packer = SolanaBytePacker()
+    results = [PDAResult() for _ in request.items]
+    keys = []
+    positions = []
+
+    for index, item in enumerate(request.items):
+        try:
+            seeds = tuple(packer.pack_seed(s.type.value, s.value) for s in item.seeds)
+        except Exception as e:
+            results[index].error = f"Invalid seeds: {str(e)}"
+            continue
+        try:
+            check_pda_key(item.program_id, seeds)
+        except ValueError as e:
+            results[index].error = str(e)
+            continue
+        keys.append((item.program_id, seeds))
+        positions.append(index)
+
+    try:
+        derived = await derive_pdas(keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error deriving PDAs: {str(e)}")
+
+    for index, (address, bump) in zip(positions, derived):
+        results[index].address = address
+        results[index].bump = bump
+
+    return PDADeriveResponse(chain="solana", results=results)
+
+
+@router.post(
+    "/resolve",
+    response_model=PDAResolveResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Resolve Instruction Accounts",
+    description="Resolve an instruction's accounts from the PDA seeds and fixed addresses declared in its IDL",
+)
+async def resolve(request: PDAResolveRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+    idl_loader = SolanaIDLLoader(rpc_client)
+
+    try:
+        idl = await idl_loader.get_idl_with_fallback(request.program_id, request.idl)
+        if not idl:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No Anchor IDL found for program {request.program_id}",
+            )
+
+        accounts, unresolved = await resolve_instruction_accounts(
+            idl, request.program_id, request.instruction, request.args, request.accounts
+        )
+
+        return PDAResolveResponse(
+            chain="solana",
+            program_id=request.program_id,
+            instruction=request.instruction,
+            accounts=accounts,
+            unresolved=unresolved,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error resolving accounts: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
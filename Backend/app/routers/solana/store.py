@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, Query
+from ...chains.solana.decoded_store import decoded_store
+from ...models.schemas import StoredRecordsResponse, StoredRecord, ErrorResponse
+from ...core.configs import settings
+from typing import Optional
+
+router = APIRouter(prefix="/store", tags=["Solana - Decoded Store"])
+
+
+@router.get(
+    "/records",
+    response_model=StoredRecordsResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    summary="Query Decoded Records",
+    description=(
+        "Stored instructions and events newest first, filtered by program, name, "
+        "account, signature or slot/time range"
+    ),
+)
+async def query_records(
+    program_id: Optional[str] = None,
+    name: Optional[str] = Query(default=None, description="Instruction or event name"),
+    kind: Optional[str] = Query(default=None, pattern="^(instruction|event)$"),
+    account: Optional[str] = Query(default=None, description="Indexed account key"),
+    signature: Optional[str] = None,
+    min_slot: Optional[int] = None,
+    max_slot: Optional[int] = None,
+    since: Optional[int] = Query(default=None, description="Minimum block time (unix seconds)"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+):
+    if not settings.DECODED_STORE_ENABLED:
+        raise HTTPException(status_code=404, detail="Decoded store is disabled")
+    try:
+        rows, next_cursor = await decoded_store.aquery(
+            program_id=program_id,
+            name=name,
+            kind=kind,
+            account=account,
+            signature=signature,
+            min_slot=min_slot,
+            max_slot=max_slot,
+            since=since,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StoredRecordsResponse(
+        chain="solana",
+        records=[StoredRecord(**row) for row in rows],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/stats",
+    summary="Decoded Store Stats",
+    description="Stored record count and background writer progress",
+)
+async def store_stats():
+    if not settings.DECODED_STORE_ENABLED:
+        raise HTTPException(status_code=404, detail="Decoded store is disabled")
+    return await decoded_store.astats()
@@ -1,5 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from ...chains.solana import SolanaRPCClient, SolanaTxBuilder
+from fastapi import APIRouter, HTTPException, Query
+from ...chains.solana import SolanaRPCClient, SolanaRPCError, SolanaTxBuilder
+from ...chains.solana.nonce import nonce_pool
+from ...chains.solana.priority_fees import priority_fee_oracle
+from ...chains.solana.tx_templates import template_registry
+from ...chains.solana.send_queue import send_queue, QueueFullError
+from ...chains.solana.tx_decoder import decode_transaction as decode_tx
+from ...chains.solana.sim_cache import (
+    simulation_cache,
+    decode_transaction,
+    writable_accounts,
+)
 from ...models.schemas import (
     BuildTransactionRequest,
     BuildTransactionResponse,
@@ -7,14 +17,29 @@ from ...models.schemas import (
     SimulateTransactionResponse,
     SendTransactionRequest,
     SendTransactionResponse,
+    PreflightPolicy,
+    NonceAccountRequest,
+    NonceReleaseRequest,
+    NonceAccountInfo,
+    NoncePoolResponse,
+    AsyncSendRequest,
+    SendStatusResponse,
+    DecodeTransactionRequest,
+    DecodeTransactionResponse,
+    DecodedTransaction,
+    PriorityFeeEstimateResponse,
+    TransactionTemplateRequest,
+    TransactionTemplateResponse,
+    TemplateBuildRequest,
     ErrorResponse,
 )
 import os
+import asyncio
 import base64
 import logging
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from solders.keypair import Keypair
 from ...core.configs import settings
 
@@ -106,6 +131,38 @@ async def get_backend_wallet():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _quote_priority_fee(
+    rpc_client: SolanaRPCClient, writable: List[str], percentile: float, fetch: bool
+) -> Tuple[Optional[int], Optional[str], Optional[asyncio.Task]]:
+    """
+    ``(price, source, None)`` from the oracle's cache, or ``(None, None,
+    task)`` fetching the estimate alongside the blockhash when ``fetch``.
+    Otherwise a fallback price, so a build never waits on the estimate alone.
+    A price of 0 comes back as None: SetComputeUnitPrice(0) would be a no-op.
+    """
+    estimate = priority_fee_oracle.cached(rpc_client.rpc_url, writable)
+    if estimate is not None:
+        return estimate.estimate(percentile) or None, "cache", None
+    if fetch:
+        return None, None, asyncio.create_task(
+            priority_fee_oracle.estimate(rpc_client.rpc_url, writable)
+        )
+    price, source = priority_fee_oracle.fallback(rpc_client.rpc_url, writable, percentile)
+    return price or None, source, None
+
+
+async def _await_priority_fee(
+    fee_task: asyncio.Task, rpc_url: str, writable: List[str], percentile: float
+) -> Tuple[Optional[int], str]:
+    """The fetched estimate, or a fallback price if the fetch failed: fees never fail a build."""
+    try:
+        price, source = (await fee_task).estimate(percentile), "rpc"
+    except Exception as e:
+        logger.warning("Priority fee estimate failed, using a fallback price: %s", e)
+        price, source = priority_fee_oracle.fallback(rpc_url, writable, percentile, refresh=False)
+    return price or None, source
+
+
 @router.post(
     "/build",
     response_model=BuildTransactionResponse,
@@ -116,10 +173,52 @@ async def get_backend_wallet():
 async def build_transaction(request: BuildTransactionRequest):
     rpc_client = SolanaRPCClient(request.rpc_url)
     tx_builder = SolanaTxBuilder()
+    nonce = None
+
+    fee_task = None
 
     try:
-        blockhash_response = await rpc_client.get_latest_blockhash()
-        blockhash = blockhash_response["blockhash"]
+        fee_payer = request.fee_payer
+        if not fee_payer and request.accounts:
+            fee_payer = request.accounts[0].pubkey
+
+        if not fee_payer:
+            raise ValueError("No fee payer specified and no accounts provided")
+
+        compute_unit_price = request.compute_unit_price
+        fee_source = "request" if compute_unit_price is not None else None
+        fee_percentile = request.priority_fee_percentile
+        if fee_percentile is None:
+            fee_percentile = settings.PRIORITY_FEE_PERCENTILE
+        if compute_unit_price is None and request.auto_priority_fee:
+            # The fee payer is left out: it is per user and rarely contended
+            writable = [
+                acc.pubkey for acc in request.accounts if acc.is_writable and acc.pubkey != fee_payer
+            ]
+            # A durable nonce replaces the blockhash fetch the estimate would ride along with
+            compute_unit_price, fee_source, fee_task = _quote_priority_fee(
+                rpc_client,
+                writable,
+                fee_percentile,
+                fetch=not (request.use_nonce_pool or request.nonce_account),
+            )
+
+        if request.use_nonce_pool:
+            nonce = await nonce_pool.acquire(rpc_client)
+        elif request.nonce_account:
+            nonce = await nonce_pool.get(rpc_client, request.nonce_account)
+
+        if nonce:
+            # The cached durable nonce stands in for the blockhash: no RPC call
+            blockhash = nonce.nonce
+        else:
+            blockhash_response = await rpc_client.get_latest_blockhash()
+            blockhash = blockhash_response["blockhash"]
+
+        if fee_task is not None:
+            compute_unit_price, fee_source = await _await_priority_fee(
+                fee_task, rpc_client.rpc_url, writable, fee_percentile
+            )
 
         instruction_bytes = tx_builder.decode_instruction_data(request.instruction_data)
 
@@ -136,28 +235,305 @@ async def build_transaction(request: BuildTransactionRequest):
             request.program_id, accounts, instruction_bytes
         )
 
-        fee_payer = request.fee_payer
-        if not fee_payer and request.accounts:
-            fee_payer = request.accounts[0].pubkey
-
-        if not fee_payer:
-            raise ValueError("No fee payer specified and no accounts provided")
-
-        result = await tx_builder.build_transaction([instruction], fee_payer, blockhash)
+        result = await tx_builder.build_transaction(
+            [instruction],
+            fee_payer,
+            blockhash,
+            nonce_account=nonce.address if nonce else None,
+            nonce_authority=request.nonce_authority or (nonce.authority if nonce else None),
+            compute_unit_price=compute_unit_price,
+            compute_unit_limit=request.compute_unit_limit,
+        )
 
         return BuildTransactionResponse(
             chain="solana",
             transaction_base64=result["transaction_base64"],
             message_base64=result["message_base64"],
             blockhash=result["blockhash"],
+            nonce_account=result["nonce_account"],
+            compute_unit_price=result["compute_unit_price"],
+            priority_fee_source=fee_source,
         )
 
     except ValueError as e:
+        if nonce and request.use_nonce_pool:
+            await nonce_pool.release(rpc_client.rpc_url, nonce.address, used=False)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        if nonce and request.use_nonce_pool:
+            await nonce_pool.release(rpc_client.rpc_url, nonce.address, used=False)
         raise HTTPException(
             status_code=500, detail=f"Error building transaction: {str(e)}"
         )
+    finally:
+        if fee_task is not None and not fee_task.done():
+            fee_task.cancel()
+        await rpc_client.close()
+
+
+@router.get(
+    "/priority-fees",
+    response_model=PriorityFeeEstimateResponse,
+    responses={500: {"model": ErrorResponse}},
+    summary="Estimate Priority Fees",
+    description=(
+        "Compute unit price percentiles (micro-lamports) from getRecentPrioritizationFees for a "
+        "set of writable accounts, served from the oracle's cache when fresh"
+    ),
+)
+async def estimate_priority_fees(
+    accounts: str = Query(default="", description="Comma-separated writable accounts"),
+    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)"),
+):
+    rpc_url = rpc_url or SolanaRPCClient.get_default_rpc_url()
+
+    try:
+        writable = [a for a in accounts.split(",") if a]
+        estimate = await priority_fee_oracle.estimate(rpc_url, writable)
+        return PriorityFeeEstimateResponse(
+            chain="solana",
+            rpc_url=rpc_url,
+            accounts=list(priority_fee_oracle.key(rpc_url, writable)[1]),
+            **estimate.to_dict(),
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error estimating priority fees: {str(e)}"
+        )
+
+
+@router.post(
+    "/templates",
+    response_model=TransactionTemplateResponse,
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Register Transaction Template",
+    description=(
+        "Compile a transaction shape once (program, accounts with placeholders, IDL "
+        "instruction) and return a handle to build it with"
+    ),
+)
+async def register_template(request: TransactionTemplateRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+
+    try:
+        definition = request.model_dump(exclude={"rpc_url"}, exclude_none=True)
+        template = await template_registry.register(rpc_client, definition)
+        return TransactionTemplateResponse(chain="solana", **template.describe())
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error registering template: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
+
+
+@router.get(
+    "/templates/{handle}",
+    response_model=TransactionTemplateResponse,
+    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Get Transaction Template",
+)
+async def get_template(
+    handle: str,
+    rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)"),
+):
+    rpc_client = SolanaRPCClient(rpc_url)
+
+    try:
+        template = await template_registry.get(rpc_client, handle)
+        if template is None:
+            raise HTTPException(status_code=404, detail=f"Unknown template {handle}")
+        return TransactionTemplateResponse(chain="solana", **template.describe())
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error loading template: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
+
+
+@router.delete(
+    "/templates/{handle}",
+    responses={404: {"model": ErrorResponse}},
+    summary="Remove Transaction Template",
+)
+async def remove_template(handle: str):
+    if not await template_registry.remove(handle):
+        raise HTTPException(status_code=404, detail=f"Unknown template {handle}")
+    return {"handle": handle, "removed": True}
+
+
+@router.post(
+    "/templates/{handle}/build",
+    response_model=BuildTransactionResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Build Transaction From Template",
+    description=(
+        "Build an unsigned transaction from a registered template, supplying only the "
+        "placeholder accounts, fee payer and instruction args"
+    ),
+)
+async def build_from_template(handle: str, request: TemplateBuildRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+    fee_task = None
+
+    try:
+        template = await template_registry.get(rpc_client, handle)
+        if template is None:
+            raise HTTPException(status_code=404, detail=f"Unknown template {handle}")
+
+        values = request.accounts
+        if request.fee_payer:
+            values = {**values, "fee_payer": request.fee_payer}
+        data = template.instruction_data(request.args, request.instruction_data)
+
+        compute_unit_price = None
+        fee_source = None
+        if template.priority_fee:
+            compute_unit_price = request.compute_unit_price
+            fee_source = "request" if compute_unit_price is not None else None
+            fee_percentile = request.priority_fee_percentile
+            if fee_percentile is None:
+                fee_percentile = settings.PRIORITY_FEE_PERCENTILE
+            if compute_unit_price is None:
+                writable = template.writable_accounts(values)
+                compute_unit_price, fee_source, fee_task = _quote_priority_fee(
+                    rpc_client,
+                    writable,
+                    fee_percentile,
+                    fetch=request.recent_blockhash is None,
+                )
+
+        blockhash = request.recent_blockhash
+        if blockhash is None:
+            blockhash = (await rpc_client.get_latest_blockhash())["blockhash"]
+
+        if fee_task is not None:
+            compute_unit_price, fee_source = await _await_priority_fee(
+                fee_task, rpc_client.rpc_url, writable, fee_percentile
+            )
+
+        tx_bytes, message_bytes = template.build(values, data, blockhash, compute_unit_price)
+
+        return BuildTransactionResponse(
+            chain="solana",
+            transaction_base64=base64.b64encode(tx_bytes).decode("utf-8"),
+            message_base64=base64.b64encode(message_bytes).decode("utf-8"),
+            blockhash=blockhash,
+            compute_unit_price=compute_unit_price,
+            priority_fee_source=fee_source,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error building transaction: {str(e)}"
+        )
+    finally:
+        if fee_task is not None and not fee_task.done():
+            fee_task.cancel()
+        await rpc_client.close()
+
+
+async def _nonce_pool_response(rpc_url: str) -> NoncePoolResponse:
+    return NoncePoolResponse(
+        chain="solana",
+        rpc_url=rpc_url,
+        accounts=[NonceAccountInfo(**a.to_dict()) for a in await nonce_pool.list(rpc_url)],
+    )
+
+
+@router.post(
+    "/nonce/accounts",
+    response_model=NoncePoolResponse,
+    responses={400: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    summary="Register Nonce Account",
+    description="Add a durable nonce account to the pool and cache its current nonce",
+)
+async def register_nonce_account(request: NonceAccountRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+
+    try:
+        await nonce_pool.register(rpc_client.rpc_url, request.address, request.authority)
+        await nonce_pool.refresh(rpc_client, request.address)
+        return await _nonce_pool_response(rpc_client.rpc_url)
+
+    except ValueError as e:
+        await nonce_pool.remove(rpc_client.rpc_url, request.address)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error registering nonce account: {str(e)}"
+        )
+    finally:
+        await rpc_client.close()
+
+
+@router.get(
+    "/nonce/accounts",
+    response_model=NoncePoolResponse,
+    summary="List Nonce Accounts",
+    description="List the durable nonce accounts registered for an RPC endpoint",
+)
+async def list_nonce_accounts(rpc_url: str = Query(default=None, description="Solana RPC URL (defaults to mainnet)")):
+    return await _nonce_pool_response(rpc_url or SolanaRPCClient.get_default_rpc_url())
+
+
+@router.post(
+    "/nonce/release",
+    response_model=NoncePoolResponse,
+    summary="Release Nonce Account",
+    description="Return a checked-out nonce account to the pool; used nonces are refreshed before reuse",
+)
+async def release_nonce_account(request: NonceReleaseRequest):
+    rpc_url = request.rpc_url or SolanaRPCClient.get_default_rpc_url()
+    await nonce_pool.release(rpc_url, request.address, request.used)
+    return await _nonce_pool_response(rpc_url)
+
+
+@router.post(
+    "/decode",
+    response_model=DecodeTransactionResponse,
+    responses={500: {"model": ErrorResponse}},
+    summary="Decode Transactions",
+    description="Name the instructions and args of legacy or v0 transactions using every cached IDL",
+)
+async def decode_transactions(request: DecodeTransactionRequest):
+    rpc_client = SolanaRPCClient(request.rpc_url)
+
+    async def decode_one(transaction: str) -> DecodedTransaction:
+        try:
+            decoded = await decode_tx(
+                rpc_client,
+                decode_transaction(transaction, request.encoding),
+                request.fetch_missing_idls,
+                request.idls,
+            )
+            return DecodedTransaction(**decoded)
+        except Exception as e:
+            return DecodedTransaction(error=str(e))
+
+    try:
+        results = await asyncio.gather(*(decode_one(tx) for tx in request.transactions))
+        return DecodeTransactionResponse(chain="solana", transactions=results)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error decoding transactions: {str(e)}"
+        )
     finally:
         await rpc_client.close()
 
@@ -173,9 +549,20 @@ async def simulate_transaction(request: SimulateTransactionRequest):
     rpc_client = SolanaRPCClient(request.rpc_url)
 
     try:
-        result = await rpc_client.simulate_transaction(
-            request.transaction_base64, request.encoding
-        )
+        if request.use_cache:
+            result, slot, cached = await simulation_cache.simulate(
+                rpc_client,
+                request.transaction_base64,
+                request.encoding,
+                request.max_slot_age,
+            )
+        else:
+            response = await rpc_client.simulate_transaction_with_context(
+                request.transaction_base64, request.encoding
+            )
+            result = response["value"]
+            slot = response.get("context", {}).get("slot")
+            cached = False
 
         error = result.get("err")
         logs = result.get("logs", [])
@@ -193,6 +580,8 @@ async def simulate_transaction(request: SimulateTransactionRequest):
             error=error_str,
             units_consumed=units_consumed,
             return_data=return_data,
+            cached=cached,
+            slot=slot,
         )
 
     except Exception as e:
@@ -341,20 +730,25 @@ async def send_transaction(request: SendTransactionRequest):
         signed_transaction_base64 = request.transaction_base64
         rpc_client = SolanaRPCClient(request.rpc_url)
 
+    policy = request.preflight or PreflightPolicy(settings.SEND_PREFLIGHT_POLICY)
     simulation_logs = []
     simulation_return_data = None
 
     try:
         simulation_result = None
-        try:
-            simulation_result = await rpc_client.simulate_transaction(
-                signed_transaction_base64
-            )
-        except Exception as sim_err:
-            logger.warning(
-                f"Unable to simulate transaction before send: {str(sim_err)}",
-                exc_info=True,
-            )
+        if policy == PreflightPolicy.SIMULATE_THEN_SKIP_PREFLIGHT:
+            # Verify signatures and the blockhash here so the node's own
+            # preflight would only repeat this simulation.
+            try:
+                simulation = await rpc_client.simulate_transaction_with_context(
+                    signed_transaction_base64, sig_verify=True, commitment="confirmed"
+                )
+                simulation_result = simulation["value"]
+            except Exception as sim_err:
+                logger.warning(
+                    f"Unable to simulate transaction before send: {str(sim_err)}",
+                    exc_info=True,
+                )
 
         if simulation_result:
             simulation_logs = simulation_result.get("logs") or []
@@ -380,7 +774,25 @@ async def send_transaction(request: SendTransactionRequest):
                     ),
                 )
 
-        result = await rpc_client.send_transaction(signed_transaction_base64)
+        # Skip the node's preflight when our simulation already ran, or when
+        # the caller opted out; fall back to it if our simulation errored.
+        skip_preflight = policy == PreflightPolicy.NONE or simulation_result is not None
+        result = await rpc_client.send_transaction(
+            signed_transaction_base64, skip_preflight=skip_preflight
+        )
+
+        # The sent transaction will change its writable accounts, so cached
+        # simulations that touch them are no longer representative, and any
+        # pooled nonce account it advances needs a fresh nonce.
+        try:
+            writable = writable_accounts(
+                rpc_client.rpc_url, decode_transaction(signed_transaction_base64)
+            )
+            simulation_cache.invalidate_accounts(writable)
+            for pubkey in writable:
+                await nonce_pool.release(rpc_client.rpc_url, pubkey, used=True)
+        except Exception:
+            logger.debug("Could not parse sent transaction for cache invalidation")
 
         return SendTransactionResponse(
             chain="solana",
@@ -392,44 +804,123 @@ async def send_transaction(request: SendTransactionRequest):
 
     except HTTPException:
         raise
-    except Exception as e:
-        error_msg = str(e)
-        print(f"DEBUG: Transaction Send Error: {error_msg}")
-
-        if (
-            "Signature verification failed" in error_msg
-            or "Transaction signature verification failure" in error_msg
-        ):
-            raise HTTPException(
-                status_code=400,
-                detail=_build_error_detail(
-                    "Transaction signature verification failed. Ensure all required signers have signed.",
-                    logs=simulation_logs,
-                    reason=error_msg,
-                ),
-            )
-
-        if (
-            "Simulation failed" in error_msg
-            or "InstructionError" in error_msg
-            or "Transaction simulation failed" in error_msg
-        ):
+    except SolanaRPCError as e:
+        preflight = e.data if isinstance(e.data, dict) else {}
+        if "logs" in preflight or "err" in preflight:
+            # Failed preflight: the node returns the simulation in the error data
+            preflight_logs = preflight.get("logs") or []
             raise HTTPException(
                 status_code=400,
                 detail=_build_error_detail(
                     "Transaction simulation failed",
-                    logs=simulation_logs,
-                    reason=error_msg,
+                    logs=preflight_logs,
+                    reason=_extract_contract_error_message(preflight_logs) or e.message,
+                    code=_extract_contract_error_code(preflight_logs),
+                    program_error=preflight.get("err"),
                 ),
             )
+        _raise_send_error(str(e), simulation_logs)
+    except Exception as e:
+        _raise_send_error(str(e), simulation_logs)
+    finally:
+        await rpc_client.close()
+
 
+def _raise_send_error(error_msg: str, simulation_logs: List[str]):
+    logger.warning("Transaction send error: %s", error_msg)
+
+    if (
+        "Signature verification failed" in error_msg
+        or "Transaction signature verification failure" in error_msg
+    ):
         raise HTTPException(
-            status_code=500,
+            status_code=400,
             detail=_build_error_detail(
-                "Error sending transaction",
+                "Transaction signature verification failed. Ensure all required signers have signed.",
                 logs=simulation_logs,
                 reason=error_msg,
             ),
         )
-    finally:
-        await rpc_client.close()
+
+    if (
+        "Simulation failed" in error_msg
+        or "InstructionError" in error_msg
+        or "Transaction simulation failed" in error_msg
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=_build_error_detail(
+                "Transaction simulation failed",
+                logs=simulation_logs,
+                reason=error_msg,
+            ),
+        )
+
+    raise HTTPException(
+        status_code=500,
+        detail=_build_error_detail(
+            "Error sending transaction",
+            logs=simulation_logs,
+            reason=error_msg,
+        ),
+    )
+
+
+@router.post(
+    "/send/async",
+    response_model=SendStatusResponse,
+    status_code=202,
+    responses={400: {"model": ErrorResponse}, 429: {"model": ErrorResponse}},
+    summary="Queue Transaction",
+    description="Queue a signed transaction; it is rebroadcast until it confirms or its blockhash expires",
+)
+async def send_transaction_async(request: AsyncSendRequest):
+    try:
+        job = await send_queue.submit(
+            request.rpc_url,
+            request.transaction_base64,
+            request.last_valid_block_height,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error queueing transaction: {str(e)}"
+        )
+
+    try:
+        writable = writable_accounts(
+            job.rpc_url, decode_transaction(request.transaction_base64)
+        )
+        simulation_cache.invalidate_accounts(writable)
+        for pubkey in writable:
+            await nonce_pool.release(job.rpc_url, pubkey, used=True)
+    except Exception:
+        logger.debug("Could not parse queued transaction for cache invalidation")
+
+    return SendStatusResponse(chain="solana", **job.to_dict())
+
+
+@router.get(
+    "/send/status/{signature}",
+    response_model=SendStatusResponse,
+    responses={404: {"model": ErrorResponse}},
+    summary="Queued Transaction Status",
+    description="Get the status of a transaction submitted through /tx/send/async",
+)
+async def get_send_status(signature: str):
+    status = await send_queue.status(signature)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown signature: {signature}")
+    return SendStatusResponse(chain="solana", **status)
+
+
+@router.get(
+    "/send/stats",
+    summary="Send Queue Stats",
+    description="Per-cluster counts of queued transactions by status",
+)
+async def get_send_stats():
+    return {"chain": "solana", "clusters": send_queue.stats()}
@@ -0,0 +1,23 @@
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Registers a cache's ``stats`` callable; called once at import of the owning module."""
+    _sources[name] = stats
+
+
+def collect() -> Dict[str, Any]:
+    """Sizes and counters reported by every registered cache."""
+    out: Dict[str, Any] = {}
+    for name, stats in sorted(_sources.items()):
+        try:
+            out[name] = stats()
+        except Exception as e:
+            logger.debug("Cache stats for %s failed: %s", name, e)
+            out[name] = {"error": str(e)}
+    return out
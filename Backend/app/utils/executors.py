@@ -0,0 +1,91 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from ..core.configs import settings
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_counts: Dict[str, int] = {"inline": 0, "thread": 0, "process": 0}
+
+
+def process_workers() -> int:
+    """EXECUTOR_PROCESS_WORKERS, else this worker's share of the host's CPUs."""
+    if settings.EXECUTOR_PROCESS_WORKERS:
+        return settings.EXECUTOR_PROCESS_WORKERS
+    return max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=settings.EXECUTOR_THREAD_WORKERS, thread_name_prefix="offload"
+            )
+        return _thread_pool
+
+
+def process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            # Forking a worker that already runs threads (offload pool, loop
+            # monitor, SQLite cache) can copy locks held mid-operation
+            _process_pool = ProcessPoolExecutor(
+                max_workers=process_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+async def run_cpu(
+    fn: Callable[..., T],
+    *args: Any,
+    size: int = 0,
+    threshold: Optional[int] = None,
+    process: bool = False,
+) -> T:
+    """
+    Runs CPU-bound ``fn(*args)`` off the event loop when ``size`` reaches
+    ``threshold`` (default OFFLOAD_MIN_BYTES); smaller calls run inline,
+    where a pool hop would cost more than the work. ``process=True`` sends
+    pure-Python work that holds the GIL to the process pool, in which case
+    ``fn`` and its arguments must be picklable.
+    """
+    if size < (settings.OFFLOAD_MIN_BYTES if threshold is None else threshold):
+        _counts["inline"] += 1
+        return fn(*args)
+    executor: Executor
+    if process and settings.EXECUTOR_PROCESS_POOL_ENABLED:
+        executor = process_pool()
+        _counts["process"] += 1
+    else:
+        executor = thread_pool()
+        _counts["thread"] += 1
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args))
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "calls": dict(_counts),
+        "thread_workers": _thread_pool._max_workers if _thread_pool else 0,
+        "process_workers": process_workers() if _process_pool else 0,
+    }
+
+
+def shutdown() -> None:
+    global _thread_pool, _process_pool
+    with _lock:
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=False, cancel_futures=True)
+            _thread_pool = None
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+# Lag samples kept for percentiles (about a minute at the default interval)
+LAG_SAMPLES = 1200
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag with a heartbeat task and catches whatever blocks
+    the loop. A watchdog thread notices when the heartbeat is overdue by
+    ``threshold_ms`` and captures the loop thread's stack at that moment,
+    which names the callback holding the loop; the stall's full duration is
+    filled in once the heartbeat runs again.
+    """
+
+    def __init__(self, interval: float, threshold_ms: float, history: int):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.stall_count = 0
+        self._lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._beat = time.perf_counter()
+        self._stall: Optional[Dict[str, Any]] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._lags.append(max(0.0, now - started - self.interval))
+            self._beat = now
+            stall = self._stall
+            if stall is not None:
+                self._stall = None
+                stall["duration_ms"] = round((now - stall.pop("_since")) * 1000, 1)
+                logger.warning(
+                    "Event loop blocked for %.0f ms in:\n%s",
+                    stall["duration_ms"],
+                    "".join(stall["stack"]),
+                )
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            since = self._beat
+            if self._stall is not None or time.perf_counter() - since < self.threshold + self.interval:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            stall = {
+                "at": time.time(),
+                "duration_ms": None,  # set when the loop resumes
+                "stack": traceback.format_stack(frame) if frame is not None else [],
+                "_since": since + self.interval,
+            }
+            self.stall_count += 1
+            self.stalls.append(stall)
+            self._stall = stall
+
+    def stats(self) -> Dict[str, Any]:
+        lags = sorted(self._lags)
+
+        def pct(p: float) -> float:
+            return round(lags[min(len(lags) - 1, int(p * len(lags)))] * 1000, 2) if lags else 0.0
+
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.threshold * 1000,
+            "lag_ms": {"p50": pct(0.5), "p99": pct(0.99), "max": pct(1.0)},
+            "stalls": self.stall_count,
+            "recent_stalls": [
+                {k: v for k, v in stall.items() if not k.startswith("_")}
+                for stall in reversed(list(self.stalls))
+            ],
+        }
+
+
+loop_monitor = LoopMonitor(
+    settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    settings.LOOP_STALL_THRESHOLD_MS,
+    settings.LOOP_STALL_HISTORY,
+)
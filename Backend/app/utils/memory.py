@@ -0,0 +1,87 @@
+import gc
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Allocations made by tracemalloc itself and the import machinery are noise
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _stat(stat: Any, diff: bool) -> Dict[str, Any]:
+    out = {
+        "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if diff:
+        out.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+    return out
+
+
+class MemoryTracer:
+    """
+    Wraps ``tracemalloc``, which only traces between ``start`` and ``stop``
+    so an idle worker pays nothing. Reports list the top allocation sites
+    and the change since the baseline snapshot taken at start (or at the
+    last reset).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._baseline = None
+            tracemalloc.stop()
+
+    def report(self, top: int, group_by: str, reset: bool) -> Dict[str, Any]:
+        """Top allocators and growth since the baseline; blocks while the snapshot is taken."""
+        out: Dict[str, Any] = {"tracing": tracemalloc.is_tracing(), "process": self.process()}
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return out
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            out.update(
+                frames=tracemalloc.get_traceback_limit(),
+                traced_bytes=current,
+                peak_bytes=peak,
+                top=[_stat(s, False) for s in snapshot.statistics(group_by)[:top]],
+            )
+            if self._baseline is not None:
+                diff: List[Any] = snapshot.compare_to(self._baseline, group_by)
+                out["diff"] = [_stat(s, True) for s in diff[:top]]
+            if reset or self._baseline is None:
+                self._baseline = snapshot
+        return out
+
+    def process(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"gc_counts": gc.get_count()}
+        if resource is not None:
+            # ru_maxrss is in kilobytes on Linux
+            out["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return out
+
+
+memory_tracer = MemoryTracer()
@@ -0,0 +1,30 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def ordered_map(
+    items: AsyncIterator[T], fn: Callable[[T], Awaitable[R]], concurrency: int
+) -> AsyncIterator[Tuple[T, R]]:
+    """
+    Yields ``(item, await fn(item))`` in input order with up to
+    ``concurrency`` calls in flight. A slow item holds back later results
+    but not later calls, so the last yielded item is always a safe resume
+    point. Calls still in flight are cancelled when the consumer stops.
+    """
+    pending: Deque[Tuple[T, asyncio.Task]] = deque()
+    try:
+        async for item in items:
+            pending.append((item, asyncio.create_task(fn(item))))
+            if len(pending) >= concurrency:
+                head, task = pending.popleft()
+                yield head, await task
+        while pending:
+            head, task = pending.popleft()
+            yield head, await task
+    finally:
+        for _, task in pending:
+            task.cancel()
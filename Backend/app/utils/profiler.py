@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+# Leaf frames of threads parked waiting for work; left out unless idle=True
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("connection.py", "_poll"),
+    ("concurrent/futures/thread.py", "_worker"),
+}
+
+
+def _short_path(path: str) -> str:
+    parts = path.replace(os.sep, "/").split("/")
+    return "/".join(parts[-2:]) if len(parts) > 1 else path
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack with ``sys._current_frames`` from a
+    background thread and aggregates them as collapsed stacks
+    (``thread;outer;...;leaf count``), the input format of flamegraph.pl,
+    speedscope and similar tools. Nothing runs between profiles; one profile
+    runs at a time. The sampler needs the GIL, so a sample lands when the
+    sampled thread releases it or is preempted; CPU-bound code shows up
+    where it runs, code that yields constantly partly under the selector.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels: Dict[Tuple[Any, int], str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        key = (code, frame.f_lineno)
+        label = self._labels.get(key)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{frame.f_lineno})"
+            self._labels[key] = label
+        return label
+
+    def _idle(self, frame) -> bool:
+        path = frame.f_code.co_filename.replace(os.sep, "/")
+        name = frame.f_code.co_name
+        return any(path.endswith(suffix) and name == fn for suffix, fn in IDLE_FRAMES)
+
+    def profile(
+        self,
+        seconds: float,
+        interval: float,
+        thread_id: Optional[int] = None,
+        include_idle: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Blocks for ``seconds`` sampling every ``interval`` seconds (only
+        ``thread_id`` when given) and returns the collapsed stack counts.
+        Raises RuntimeError when another profile is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            own = threading.get_ident()
+            stacks: Counter = Counter()
+            samples = 0
+            started = time.perf_counter()
+            deadline = started + seconds
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own or (thread_id is not None and ident != thread_id):
+                        continue
+                    if not include_idle and self._idle(frame):
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(self._label(frame))
+                        frame = frame.f_back
+                    labels.append(names.get(ident, str(ident)))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+            return {
+                "seconds": round(time.perf_counter() - started, 3),
+                "interval_ms": interval * 1000,
+                "samples": samples,
+                "stacks": stacks.most_common(),
+            }
+        finally:
+            self._labels.clear()
+            self._lock.release()
+
+
+def collapsed(result: Dict[str, Any]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in result["stacks"])
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,255 @@
+import asyncio
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC error code returned when replay has no matching recording
+REPLAY_MISS_CODE = -32099
+TRANSPORT_MODES = ("live", "record", "replay")
+
+
+class Cassette:
+    """
+    JSON-RPC calls recorded as one compact JSON line each (gzip-compressed
+    when the path ends in .gz): endpoint, method, params, the reply's
+    result or error, and the upstream round-trip time. Recorded lines are
+    buffered and written out by ``flush``, which holds an exclusive ``flock``
+    on the file while appending one chunk (one gzip member), so several
+    workers can record into one file without interleaving.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_method: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._loaded = False
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, method: str, params: Any) -> str:
+        raw = json.dumps([url, method, params], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def append(self, url: str, method: str, params: Any, reply: Dict[str, Any], ms: float) -> None:
+        entry = {"url": url, "method": method, "params": params, "reply": reply, "ms": round(ms, 2)}
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._pending.append(line)
+            self._index(entry)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> None:
+        """Appends the buffered lines to the file. Blocking; see ``aflush``."""
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            data = "".join(lines).encode("utf-8")
+            if self.path.endswith(".gz"):
+                data = gzip.compress(data)
+            with open(self.path, "ab") as f:
+                # Other workers append to the same file
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.write(data)
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    async def aflush(self) -> None:
+        await asyncio.to_thread(self.flush)
+
+    def lookup(self, url: str, method: str, params: Any, match: str = "exact") -> Optional[Dict[str, Any]]:
+        """
+        Recorded entry for a call. Repeated calls cycle through every
+        recording of the same call in order; ``match="method"`` ignores the
+        endpoint and params, for replaying traffic whose contents vary.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if match == "method":
+                cursor_key, entries = f"method:{method}", self._by_method.get(method)
+            else:
+                cursor_key = self.key(url, method, params)
+                entries = self._by_key.get(cursor_key)
+            if not entries:
+                return None
+            cursor = self._cursors.get(cursor_key, 0)
+            self._cursors[cursor_key] = cursor + 1
+            return entries[cursor % len(entries)]
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with self._open("r") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        key = self.key(entry["url"], entry["method"], entry["params"])
+        self._by_key.setdefault(key, []).append(entry)
+        self._by_method.setdefault(entry["method"], []).append(entry)
+
+
+def _calls(request: httpx.Request) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+    """The request's JSON-RPC calls and whether they were sent as a batch."""
+    try:
+        payload = json.loads(request.content)
+    except ValueError:
+        return None, False
+    if isinstance(payload, list):
+        return payload, True
+    return [payload], False
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards requests upstream and appends every JSON-RPC call and reply to the cassette."""
+
+    def __init__(self, cassette: Cassette, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        ms = (time.perf_counter() - start) * 1000
+
+        calls, _ = _calls(request)
+        if response.status_code == 200 and calls:
+            try:
+                replies = json.loads(content)
+                replies = replies if isinstance(replies, list) else [replies]
+                by_id = {reply.get("id"): reply for reply in replies}
+                for call in calls:
+                    reply = by_id.get(call.get("id"))
+                    if reply is None:
+                        continue
+                    recorded = {k: reply[k] for k in ("result", "error") if k in reply}
+                    self.cassette.append(
+                        str(request.url), call.get("method"), call.get("params"), recorded, ms
+                    )
+            except ValueError:
+                pass
+            if self.cassette.pending and (self._flusher is None or self._flusher.done()):
+                self._flusher = asyncio.create_task(self._flush())
+
+        # The body is already decoded, so drop headers describing the wire encoding
+        headers = [
+            (k, v)
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        # Shared by every client in the process; closing one client must not close it
+        pass
+
+    async def shutdown(self) -> None:
+        if self._flusher is not None:
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.cassette.aflush()
+
+    async def _flush(self) -> None:
+        # Lines recorded while a write is in progress go out with the next one
+        while self.cassette.pending:
+            try:
+                await self.cassette.aflush()
+            except OSError as e:
+                logger.warning("Writing RPC cassette %s failed: %s", self.cassette.path, e)
+                return
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves JSON-RPC replies from a cassette without touching the network.
+    With ``timing`` each reply is delayed by its recorded round-trip time.
+    """
+
+    def __init__(self, cassette: Cassette, match: str = "exact", timing: bool = False):
+        self.cassette = cassette
+        self.match = match
+        self.timing = timing
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        calls, batch = _calls(request)
+        if calls is None:
+            return httpx.Response(400, json={"error": "Not a JSON-RPC request"}, request=request)
+
+        replies = []
+        delay_ms = 0.0
+        for call in calls:
+            entry = self.cassette.lookup(
+                str(request.url), call.get("method"), call.get("params"), self.match
+            )
+            reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": call.get("id")}
+            if entry is None:
+                self.misses += 1
+                reply["error"] = {
+                    "code": REPLAY_MISS_CODE,
+                    "message": f"No recorded response for {call.get('method')}",
+                }
+            else:
+                reply.update(entry["reply"])
+                delay_ms = max(delay_ms, entry.get("ms", 0.0))
+            replies.append(reply)
+
+        if self.timing and delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        return httpx.Response(200, json=replies if batch else replies[0], request=request)
+
+
+@lru_cache(maxsize=1)
+def get_rpc_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Process-wide transport for RPC_TRANSPORT_MODE; None means plain live HTTP."""
+    mode = settings.RPC_TRANSPORT_MODE
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"RPC_TRANSPORT_MODE must be one of {TRANSPORT_MODES}")
+    if mode == "live":
+        return None
+    if not settings.RPC_CASSETTE_PATH:
+        raise ValueError(f"RPC_CASSETTE_PATH is required when RPC_TRANSPORT_MODE={mode}")
+    cassette = Cassette(settings.RPC_CASSETTE_PATH)
+    if mode == "record":
+        return RecordingTransport(cassette)
+    return ReplayTransport(cassette, settings.RPC_REPLAY_MATCH, settings.RPC_REPLAY_TIMING)
+
+
+async def shutdown_rpc_transport() -> None:
+    """Writes out anything still buffered by a recording transport."""
+    if settings.RPC_TRANSPORT_MODE != "record":
+        return
+    transport = get_rpc_transport()
+    if isinstance(transport, RecordingTransport):
+        await transport.shutdown()
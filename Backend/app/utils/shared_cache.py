@@ -0,0 +1,308 @@
+import json
+import sqlite3
+import threading
+import time
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from ..core.configs import settings
+from . import cache_stats
+
+
+class SharedCache:
+    """
+    Host-wide cache backed by a single SQLite file in WAL mode.
+
+    Every gunicorn/uvicorn worker on the host opens the same file, so a value
+    fetched by one worker is visible to all of them and survives restarts.
+    Entries are grouped by namespace (e.g. ``idl``, ``layout``, ``account``),
+    carry an optional expiry and are evicted least-recently-used once the
+    total payload size exceeds ``max_bytes``. Leases live in their own table,
+    outside eviction, and give one worker at a time a key until it ends the
+    lease or the lease expires.
+    """
+
+    # Reads only refresh ``accessed_at`` when it is older than this many
+    # seconds, which keeps hot reads from turning into writes.
+    TOUCH_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_entry_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS leases (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        # Running payload total kept by triggers, so writes don't SUM the table.
+        # Set up in one write transaction so concurrent workers agree on the seed.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS totals "
+                "(id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO totals (id, size) "
+                "SELECT 0, COALESCE(SUM(size), 0) FROM entries"
+            )
+            for name, event, delta in (
+                ("insert", "INSERT", "NEW.size"),
+                ("delete", "DELETE", "-OLD.size"),
+                ("update", "UPDATE OF size", "NEW.size - OLD.size"),
+            ):
+                self._conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS entries_total_{name} "
+                    f"AFTER {event} ON entries "
+                    f"BEGIN UPDATE totals SET size = size + {delta} WHERE id = 0; END"
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries "
+                "WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                return None
+            if now - accessed_at > self.TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, key),
+                )
+            return bytes(value)
+
+    def set(
+        self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> bool:
+        size = len(value)
+        if size > self.max_entry_bytes:
+            return False
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front so the upsert and
+            # the eviction pass are atomic with respect to other workers.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert rather than INSERT OR REPLACE: REPLACE's implicit
+                # delete doesn't fire the totals trigger
+                self._conn.execute(
+                    "INSERT INTO entries "
+                    "(namespace, key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, "
+                    "size = excluded.size, expires_at = excluded.expires_at, "
+                    "accessed_at = excluded.accessed_at",
+                    (namespace, key, value, size, expires_at, now),
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+
+    async def adelete(self, namespace: str, key: str) -> None:
+        await asyncio.to_thread(self.delete, namespace, key)
+
+    def try_lease(self, namespace: str, key: str, ttl: float) -> bool:
+        """Takes the lease on ``key`` unless another live lease holds it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM leases WHERE namespace = ? AND key = ? AND expires_at <= ?",
+                    (namespace, key, now),
+                )
+                cursor = self._conn.execute(
+                    "INSERT INTO leases (namespace, key, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO NOTHING",
+                    (namespace, key, now + ttl),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def end_lease(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+
+    def leased(self, namespace: str, keys: Iterable[str]) -> Set[str]:
+        """The subset of ``keys`` currently under a live lease."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM leases WHERE namespace = ? AND expires_at > ?",
+                (namespace, time.time()),
+            ).fetchall()
+        return {key for (key,) in rows} & set(keys)
+
+    async def atry_lease(self, namespace: str, key: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self.try_lease, namespace, key, ttl)
+
+    async def aend_lease(self, namespace: str, key: str) -> None:
+        await asyncio.to_thread(self.end_lease, namespace, key)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+
+    def get_json(self, namespace: str, key: str) -> Optional[Any]:
+        raw = self.get(namespace, key)
+        return json.loads(raw) if raw is not None else None
+
+    def set_json(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        return self.set(namespace, key, raw, ttl)
+
+    async def aget_json(self, namespace: str, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get_json, namespace, key)
+
+    async def aset_json(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> bool:
+        return await asyncio.to_thread(self.set_json, namespace, key, value, ttl)
+
+    def iter_namespace(self, namespace: str) -> Iterator[Tuple[str, bytes]]:
+        """
+        Yields every live entry of a namespace, most recently used first.
+        Used by workers to warm their in-process state after a restart.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM entries WHERE namespace = ? "
+                "AND (expires_at IS NULL OR expires_at > ?) "
+                "ORDER BY accessed_at DESC",
+                (namespace, time.time()),
+            ).fetchall()
+        for key, value in rows:
+            yield key, bytes(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) "
+                "FROM entries GROUP BY namespace"
+            ).fetchall()
+        namespaces = {ns: {"entries": n, "bytes": b} for ns, n, b in rows}
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "total_bytes": sum(ns["bytes"] for ns in namespaces.values()),
+            "namespaces": namespaces,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        )
+        total = self._conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        rows = self._conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed_at ASC"
+        )
+        victims = []
+        for namespace, key, size in rows:
+            victims.append((namespace, key))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany(
+            "DELETE FROM entries WHERE namespace = ? AND key = ?", victims
+        )
+
+
+@lru_cache()
+def get_shared_cache() -> Optional[SharedCache]:
+    if not settings.SHARED_CACHE_ENABLED:
+        return None
+    return SharedCache(
+        settings.SHARED_CACHE_PATH,
+        max_bytes=settings.SHARED_CACHE_MAX_BYTES,
+        max_entry_bytes=settings.SHARED_CACHE_MAX_ENTRY_BYTES,
+    )
+
+
+def _shared_cache_stats() -> Dict[str, Any]:
+    cache = get_shared_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+cache_stats.register("shared", _shared_cache_stats)
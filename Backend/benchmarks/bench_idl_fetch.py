@@ -0,0 +1,75 @@
+"""
+Compare the native IDL fetch path against anchorpy's Program.fetch_idl.
+
+    cd Backend && python -m benchmarks.bench_idl_fetch <program_id> \
+        --rpc-url https://api.devnet.solana.com --iterations 20
+
+Both paths bypass the shared cache so every iteration hits the RPC. The
+anchorpy path needs RPC_TRANSPORT_MODE=live and is skipped otherwise.
+"""
+
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from app.chains.solana import SolanaRPCClient, SolanaIDLLoader
+from app.chains.solana.idl_loader import decode_idl_account, get_idl_address
+
+
+async def _time(fn: Callable[[], Awaitable], iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{label:<12} mean={statistics.mean(samples):8.2f}ms "
+        f"p50={statistics.median(samples):8.2f}ms p95={p95:8.2f}ms"
+    )
+
+
+async def main(program_id: str, rpc_url: str, iterations: int) -> None:
+    rpc_client = SolanaRPCClient(rpc_url)
+    loader = SolanaIDLLoader(rpc_client)
+    try:
+        native = await _time(lambda: loader.fetch_idl_native(program_id), iterations)
+        anchorpy = None
+        if rpc_client.transport is None:
+            anchorpy = await _time(
+                lambda: loader.fetch_idl_anchorpy(program_id), iterations
+            )
+
+        # Decode-only cost, with the account bytes fetched once up front.
+        account = await rpc_client.get_account_info(
+            str(get_idl_address(program_id)), "base64"
+        )
+        raw = base64.b64decode(account["data"][0])
+        start = time.perf_counter()
+        for _ in range(iterations):
+            decode_idl_account(raw)
+        decode_ms = (time.perf_counter() - start) * 1000 / iterations
+    finally:
+        await rpc_client.close()
+
+    _report("native", native)
+    if anchorpy is not None:
+        _report("anchorpy", anchorpy)
+    print(f"{'decode only':<12} mean={decode_ms:8.2f}ms ({len(raw)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("program_id")
+    parser.add_argument("--rpc-url", default=SolanaRPCClient.DEFAULT_RPC_URL)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.program_id, args.rpc_url, args.iterations))
@@ -0,0 +1,84 @@
+"""
+Measure send queue throughput and land rate against the in-process fake RPC.
+
+    cd Backend && python -m benchmarks.bench_send_queue --transactions 2000 \
+        --drop-rate 0.5 --slot-time 0.05 --rebroadcast 0.1
+
+Every transaction is a distinct signed transfer. The fake RPC drops
+``--drop-rate`` of the sends, so the land rate shows how well rebroadcasting
+recovers them before their blockhash expires.
+"""
+
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+
+import httpx
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+
+from app.chains.solana import SolanaRPCClient
+from app.chains.solana.send_queue import PENDING_STATES, SendQueue
+from benchmarks.fake_rpc import FakeSolanaRPC
+
+FAKE_RPC_URL = "http://fake-rpc"
+
+
+def _signed_transactions(count: int):
+    payer = Keypair()
+    blockhash = Hash.default()
+    for i in range(count):
+        ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=payer.pubkey(), lamports=i + 1))
+        tx = Transaction([payer], Message([ix], payer.pubkey()), blockhash)
+        yield base64.b64encode(bytes(tx)).decode("utf-8")
+
+
+async def main(args: argparse.Namespace) -> None:
+    fake = FakeSolanaRPC(
+        latency=args.latency, drop_rate=args.drop_rate, slot_time=args.slot_time, seed=1
+    )
+    transport = httpx.ASGITransport(app=fake)
+    queue = SendQueue(
+        max_pending=args.transactions,
+        concurrency=args.concurrency,
+        rebroadcast_interval=args.rebroadcast,
+        status_ttl=600,
+        client_factory=lambda url: SolanaRPCClient(url, transport=transport),
+    )
+    transactions = list(_signed_transactions(args.transactions))
+
+    start = time.perf_counter()
+    jobs = [await queue.submit(FAKE_RPC_URL, tx) for tx in transactions]
+    submit_seconds = time.perf_counter() - start
+
+    while any(job.status in PENDING_STATES for job in jobs):
+        await asyncio.sleep(args.rebroadcast / 2)
+    total_seconds = time.perf_counter() - start
+    await queue.shutdown()
+
+    landed = [job for job in jobs if job.status == "confirmed"]
+    latencies = sorted(job.landed_at - job.submitted_at for job in landed)
+    print(f"submitted   {len(jobs)} in {submit_seconds:.2f}s ({len(jobs) / submit_seconds:,.0f} tx/s)")
+    print(f"landed      {len(landed)}/{len(jobs)} ({100 * len(landed) / len(jobs):.1f}%)")
+    print(f"expired     {sum(job.status == 'expired' for job in jobs)}")
+    print(f"attempts    mean={statistics.mean(job.attempts for job in jobs):.2f}")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"time-to-land p50={statistics.median(latencies) * 1000:.0f}ms p95={p95 * 1000:.0f}ms")
+    print(f"drained in  {total_seconds:.2f}s; rpc calls {fake.calls}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--transactions", type=int, default=1000)
+    parser.add_argument("--drop-rate", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake RPC latency, seconds")
+    parser.add_argument("--slot-time", type=float, default=0.05)
+    parser.add_argument("--rebroadcast", type=float, default=0.1, help="Rebroadcast interval, seconds")
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,202 @@
+"""
+Compare builds per second of registered transaction templates against
+/tx/build, in-process and through the API with the fake RPC.
+
+    cd Backend && python -m benchmarks.bench_tx_templates --accounts 8 \
+        --iterations 20000 --requests 3000 --concurrency 32
+
+The in-process numbers time the build step alone: SolanaTxBuilder (what
+/tx/build runs) versus TransactionTemplate.build with the same inputs. The
+API numbers include request parsing, the blockhash fetch and the response.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+
+from app.chains.base.rpc_client import BaseRPCClient
+from app.chains.solana import SolanaTxBuilder
+from app.chains.solana.tx_templates import TransactionTemplate
+from app.main import app
+from benchmarks.fake_rpc import FakeSolanaRPC
+
+FAKE_RPC_URL = "http://fake-rpc"
+
+
+def _shape(accounts: int) -> Dict[str, Any]:
+    """A swap-like instruction: a signing user, then alternating placeholders and fixed pools."""
+    metas = [{"name": "user", "is_signer": True, "is_writable": True}]
+    for i in range(1, accounts):
+        if i % 2:
+            metas.append({"name": f"account_{i}", "is_writable": True})
+        else:
+            metas.append({"pubkey": str(Pubkey.new_unique()), "is_writable": i % 4 == 0})
+    return {
+        "program_id": str(Pubkey.new_unique()),
+        "accounts": metas,
+        "compute_unit_limit": 200_000,
+        "priority_fee": True,
+    }
+
+
+def _inputs(shape: Dict[str, Any]) -> Dict[str, str]:
+    values = {m["name"]: str(Pubkey.new_unique()) for m in shape["accounts"] if m.get("name")}
+    values["fee_payer"] = str(Pubkey.new_unique())
+    return values
+
+
+def _bench_sync(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+async def _bench_async(fn: Callable[[], Awaitable], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return iterations / (time.perf_counter() - start)
+
+
+async def _bench_api(
+    client: httpx.AsyncClient, path: str, body: Dict[str, Any], requests: int, concurrency: int
+) -> Tuple[float, List[float]]:
+    """Requests per second and per-request latencies in ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json=body)
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - start), samples
+
+
+def _report(label: str, builds_per_second: float, samples: List[float] = ()) -> None:
+    line = f"{label:<22} {builds_per_second:10.0f} builds/s"
+    if samples:
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        line += f"  p50={statistics.median(samples):7.2f}ms p95={p95:7.2f}ms"
+    print(line)
+
+
+async def main(args: argparse.Namespace) -> None:
+    shape = _shape(args.accounts)
+    values = _inputs(shape)
+    data = bytes(i % 256 for i in range(args.data_bytes))
+    blockhash = str(Hash.new_unique())
+    price = 1_000
+
+    # What /tx/build does per request
+    tx_builder = SolanaTxBuilder()
+    accounts = [
+        {
+            "pubkey": values[m["name"]] if m.get("name") else m["pubkey"],
+            "is_signer": m.get("is_signer", False),
+            "is_writable": m["is_writable"],
+        }
+        for m in shape["accounts"]
+    ]
+
+    async def build_with_builder() -> None:
+        instruction = tx_builder.build_instruction(shape["program_id"], accounts, data)
+        await tx_builder.build_transaction(
+            [instruction],
+            values["fee_payer"],
+            blockhash,
+            compute_unit_price=price,
+            compute_unit_limit=shape["compute_unit_limit"],
+        )
+
+    template = TransactionTemplate(
+        "bench",
+        shape["program_id"],
+        shape["accounts"],
+        compute_unit_limit=shape["compute_unit_limit"],
+        priority_fee=True,
+    )
+    builder_rate = await _bench_async(build_with_builder, args.iterations)
+    template_rate = _bench_sync(
+        lambda: template.build(values, data, blockhash, price), args.iterations
+    )
+    print(f"in-process, {args.accounts} accounts, {args.data_bytes} data bytes:")
+    _report("SolanaTxBuilder", builder_rate)
+    _report("template", template_rate)
+    print(f"{'speedup':<22} {template_rate / builder_rate:10.1f}x")
+
+    BaseRPCClient.default_transport = httpx.ASGITransport(app=FakeSolanaRPC(latency=args.latency))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        response = await client.post(
+            "/solana/tx/templates", json={**shape, "rpc_url": FAKE_RPC_URL}
+        )
+        response.raise_for_status()
+        handle = response.json()["handle"]
+        build_body = {
+            "rpc_url": FAKE_RPC_URL,
+            "program_id": shape["program_id"],
+            "accounts": accounts,
+            "fee_payer": values["fee_payer"],
+            "instruction_data": data.hex(),
+            "compute_unit_price": price,
+            "compute_unit_limit": shape["compute_unit_limit"],
+        }
+        template_body = {
+            "rpc_url": FAKE_RPC_URL,
+            "accounts": {k: v for k, v in values.items() if k != "fee_payer"},
+            "fee_payer": values["fee_payer"],
+            "instruction_data": data.hex(),
+            "compute_unit_price": price,
+        }
+        # Warm up both routes before timing
+        await _bench_api(client, "/solana/tx/build", build_body, 50, args.concurrency)
+        await _bench_api(
+            client, f"/solana/tx/templates/{handle}/build", template_body, 50, args.concurrency
+        )
+        build = await _bench_api(
+            client, "/solana/tx/build", build_body, args.requests, args.concurrency
+        )
+        templated = await _bench_api(
+            client,
+            f"/solana/tx/templates/{handle}/build",
+            template_body,
+            args.requests,
+            args.concurrency,
+        )
+        with_blockhash = await _bench_api(
+            client,
+            f"/solana/tx/templates/{handle}/build",
+            {**template_body, "recent_blockhash": blockhash},
+            args.requests,
+            args.concurrency,
+        )
+
+    print(f"API, {args.requests} requests, concurrency {args.concurrency}:")
+    _report("/tx/build", *build)
+    _report("template", *templated)
+    _report("template + blockhash", *with_blockhash)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--accounts", type=int, default=8, help="Accounts in the instruction")
+    parser.add_argument("--data-bytes", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=20_000, help="In-process builds")
+    parser.add_argument("--requests", type=int, default=3_000, help="API requests per route")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake RPC latency in seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,353 @@
+"""
+In-process fake Solana JSON-RPC server for benchmarks.
+
+It is an ASGI app, so clients reach it without sockets through
+``httpx.ASGITransport(FakeSolanaRPC(...))``, or it can be served on its own
+port for multi-worker runs:
+
+    cd Backend && python -m benchmarks.fake_rpc --port 8899 --latency 0.02
+
+Slots advance with wall time. A configurable fraction of sendTransaction
+calls are silently dropped, and a transaction that lands shows up as
+confirmed one slot later. ``SAMPLE_PROGRAM_ID`` has a small Anchor IDL
+and ``SAMPLE_ACCOUNT`` holds one of its accounts. Blocks added with
+``add_block`` are served by getBlocks/getBlock, and their transactions by
+getTransaction/getSignaturesForAddress; other slots are skipped. Account
+reads honour ``dataSlice`` and the base64 and base64+zstd encodings.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import struct
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+import base58
+from solders.transaction import VersionedTransaction
+
+from app.chains.solana.idl_codec import sighash
+from app.chains.solana.idl_loader import get_idl_address
+from app.chains.solana.wire import SIGNATURE_SIZE, decode_compact_u16
+
+# Blockhashes stay valid for 150 blocks on mainnet
+BLOCKHASH_VALIDITY = 150
+FAKE_BLOCKHASH = "11111111111111111111111111111111"
+
+SAMPLE_PROGRAM_ID = "Fg6PaFpoGXkYsidMpWTK6W2BeZ7FEfcYkg476zPFsLnS"
+# A Counter account owned by the sample program
+SAMPLE_ACCOUNT = "CounterAccount11111111111111111111111111111"
+SAMPLE_IDL: Dict[str, Any] = {
+    "version": "0.1.0",
+    "name": "sample",
+    "instructions": [
+        {
+            "name": "initialize",
+            "accounts": [
+                {"name": "user", "isMut": True, "isSigner": True},
+                {"name": "systemProgram", "isMut": False, "isSigner": False},
+            ],
+            "args": [{"name": "amount", "type": "u64"}, {"name": "label", "type": "string"}],
+        }
+    ],
+    "accounts": [
+        {
+            "name": "Counter",
+            "type": {
+                "kind": "struct",
+                "fields": [
+                    {"name": "authority", "type": "publicKey"},
+                    {"name": "count", "type": "u64"},
+                ],
+            },
+        }
+    ],
+    "types": [],
+    "errors": [{"code": 6000, "name": "TooBig", "msg": "Value too big."}],
+}
+
+
+class FakeRPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeSolanaRPC:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        drop_rate: float = 0.0,
+        error_rate: float = 0.0,
+        slot_time: float = 0.4,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.error_rate = error_rate
+        self.slot_time = slot_time
+        self.random = random.Random(seed)
+        self.started_at = time.monotonic()
+        self.landed: Dict[str, int] = {}
+        self.accounts: Dict[str, Dict[str, Any]] = {}
+        self.calls: Dict[str, int] = {}
+        self.blocks: Dict[int, Dict[str, Any]] = {}
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.history: Dict[str, List[str]] = {}
+        # Recent per-slot prioritization fees (micro-lamports), oldest first
+        self.prioritization_fees: List[int] = [0] * 100 + [1000 * i for i in range(50)]
+        self.set_idl(SAMPLE_PROGRAM_ID, SAMPLE_IDL)
+        counter = sighash("account", "Counter") + bytes(32) + struct.pack("<Q", 42)
+        self.set_account(SAMPLE_ACCOUNT, counter, owner=SAMPLE_PROGRAM_ID)
+
+    def slot(self) -> int:
+        return int((time.monotonic() - self.started_at) / self.slot_time)
+
+    def set_account(self, address: str, data: bytes, owner: str = FAKE_BLOCKHASH) -> None:
+        self.accounts[address] = {
+            "data": [base64.b64encode(data).decode("utf-8"), "base64"],
+            "executable": False,
+            "lamports": 1_000_000,
+            "owner": owner,
+            "rentEpoch": 0,
+            "space": len(data),
+        }
+
+    def add_block(self, slot: int, transactions: List[Dict[str, Any]]) -> None:
+        """Serves a block of getBlock transaction entries (``transaction`` and ``meta``)."""
+        self.blocks[slot] = {
+            "blockhash": FAKE_BLOCKHASH,
+            "blockHeight": slot,
+            "blockTime": 1_700_000_000 + slot // 2,
+            "parentSlot": slot - 1,
+            "previousBlockhash": FAKE_BLOCKHASH,
+            "transactions": transactions,
+        }
+        for entry in transactions:
+            tx = VersionedTransaction.from_bytes(base64.b64decode(entry["transaction"][0]))
+            signature = str(tx.signatures[0])
+            self.transactions[signature] = {
+                "slot": slot,
+                "blockTime": self.blocks[slot]["blockTime"],
+                **entry,
+            }
+            for key in tx.message.account_keys:
+                self.history.setdefault(str(key), []).append(signature)
+
+    def set_idl(self, program_id: str, idl: Dict[str, Any]) -> None:
+        """Stores an Anchor IDL account for the program in the on-chain layout."""
+        compressed = zlib.compress(json.dumps(idl).encode("utf-8"))
+        data = bytes(8) + bytes(32) + struct.pack("<I", len(compressed)) + compressed
+        self.set_account(str(get_idl_address(program_id)), data, owner=program_id)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        request = json.loads(body)
+        if isinstance(request, list):
+            response: Any = [self._dispatch(r) for r in request]
+        else:
+            response = self._dispatch(request)
+
+        payload = json.dumps(response).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
+
+    def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request.get("method", "")
+        self.calls[method] = self.calls.get(method, 0) + 1
+        reply = {"jsonrpc": "2.0", "id": request.get("id")}
+        if self.error_rate and self.random.random() < self.error_rate:
+            reply["error"] = {"code": -32005, "message": "Node is behind"}
+            return reply
+        handler = getattr(self, f"_rpc_{method}", None)
+        if handler is None:
+            reply["error"] = {"code": -32601, "message": "Method not found"}
+            return reply
+        try:
+            reply["result"] = handler(request.get("params") or [])
+        except FakeRPCError as e:
+            reply["error"] = {"code": e.code, "message": str(e)}
+        except ValueError as e:
+            reply["error"] = {"code": -32602, "message": str(e)}
+        return reply
+
+    def _context(self, value: Any) -> Dict[str, Any]:
+        return {"context": {"slot": self.slot()}, "value": value}
+
+    def _rpc_getRecentPrioritizationFees(self, params: List[Any]) -> List[Dict[str, int]]:
+        first = self.slot() - len(self.prioritization_fees) + 1
+        return [
+            {"slot": first + i, "prioritizationFee": fee}
+            for i, fee in enumerate(self.prioritization_fees)
+        ]
+
+    def _rpc_getSlot(self, params: List[Any]) -> int:
+        return self.slot()
+
+    def _rpc_getBlockHeight(self, params: List[Any]) -> int:
+        return self.slot()
+
+    def _rpc_getLatestBlockhash(self, params: List[Any]) -> Dict[str, Any]:
+        return self._context(
+            {
+                "blockhash": FAKE_BLOCKHASH,
+                "lastValidBlockHeight": self.slot() + BLOCKHASH_VALIDITY,
+            }
+        )
+
+    def _rpc_sendTransaction(self, params: List[Any]) -> str:
+        tx_bytes = base64.b64decode(params[0])
+        _, offset = decode_compact_u16(tx_bytes, 0)
+        signature = base58.b58encode(tx_bytes[offset : offset + SIGNATURE_SIZE]).decode("utf-8")
+        if signature not in self.landed and self.random.random() >= self.drop_rate:
+            self.landed[signature] = self.slot() + 1
+        return signature
+
+    def _rpc_getSignatureStatuses(self, params: List[Any]) -> Dict[str, Any]:
+        current = self.slot()
+        statuses = []
+        for signature in params[0]:
+            landed = self.landed.get(signature)
+            if landed is None or landed > current:
+                statuses.append(None)
+            else:
+                statuses.append(
+                    {
+                        "slot": landed,
+                        "confirmations": current - landed,
+                        "err": None,
+                        "confirmationStatus": "confirmed",
+                    }
+                )
+        return self._context(statuses)
+
+    def _rpc_simulateTransaction(self, params: List[Any]) -> Dict[str, Any]:
+        return self._context(
+            {
+                "err": None,
+                "logs": ["Program log: fake simulation"],
+                "accounts": None,
+                "unitsConsumed": 1_000,
+                "returnData": None,
+            }
+        )
+
+    def _account(self, address: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The stored account with ``dataSlice`` and base64/base64+zstd ``encoding`` applied."""
+        account = self.accounts.get(address)
+        if account is None:
+            return None
+        data = base64.b64decode(account["data"][0])
+        data_slice = config.get("dataSlice")
+        if data_slice:
+            data = data[data_slice["offset"] : data_slice["offset"] + data_slice["length"]]
+        encoding = config.get("encoding", "base64")
+        if encoding == "base64+zstd":
+            import zstandard
+
+            data = zstandard.ZstdCompressor().compress(data)
+        elif encoding != "base64":
+            raise FakeRPCError(-32602, f"Unsupported encoding: {encoding}")
+        return {**account, "data": [base64.b64encode(data).decode("utf-8"), encoding]}
+
+    def _rpc_getAccountInfo(self, params: List[Any]) -> Dict[str, Any]:
+        config = params[1] if len(params) > 1 else {}
+        return self._context(self._account(params[0], config))
+
+    def _rpc_getMultipleAccounts(self, params: List[Any]) -> Dict[str, Any]:
+        config = params[1] if len(params) > 1 else {}
+        return self._context([self._account(address, config) for address in params[0]])
+
+    def _rpc_getProgramAccounts(self, params: List[Any]) -> List[Dict[str, Any]]:
+        config = params[1] if len(params) > 1 else {}
+        entries = []
+        for address, account in self.accounts.items():
+            if account["owner"] != params[0]:
+                continue
+            data = base64.b64decode(account["data"][0])
+            matched = True
+            for f in config.get("filters", []):
+                if "dataSize" in f:
+                    matched &= len(data) == f["dataSize"]
+                elif "memcmp" in f:
+                    offset = f["memcmp"]["offset"]
+                    expected = base58.b58decode(f["memcmp"]["bytes"])
+                    matched &= data[offset : offset + len(expected)] == expected
+            if matched:
+                entries.append({"pubkey": address, "account": self._account(address, config)})
+        return entries
+
+    def _rpc_getBlocks(self, params: List[Any]) -> List[int]:
+        start, end = params[0], params[1]
+        return sorted(slot for slot in self.blocks if start <= slot <= end)
+
+    def _rpc_getBlock(self, params: List[Any]) -> Dict[str, Any]:
+        block = self.blocks.get(params[0])
+        if block is None:
+            raise FakeRPCError(-32007, f"Slot {params[0]} was skipped")
+        return block
+
+    def _rpc_getTransaction(self, params: List[Any]) -> Optional[Dict[str, Any]]:
+        return self.transactions.get(params[0])
+
+    def _rpc_getSignaturesForAddress(self, params: List[Any]) -> List[Dict[str, Any]]:
+        config = params[1] if len(params) > 1 else {}
+        signatures = sorted(
+            self.history.get(params[0], []),
+            key=lambda s: self.transactions[s]["slot"],
+            reverse=True,
+        )
+        if config.get("before") in signatures:
+            signatures = signatures[signatures.index(config["before"]) + 1 :]
+        if config.get("until") in signatures:
+            signatures = signatures[: signatures.index(config["until"])]
+        return [
+            {
+                "signature": signature,
+                "slot": self.transactions[signature]["slot"],
+                "blockTime": self.transactions[signature]["blockTime"],
+                "err": self.transactions[signature]["meta"].get("err"),
+                "memo": None,
+                "confirmationStatus": "finalized",
+            }
+            for signature in signatures[: config.get("limit", 1000)]
+        ]
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the fake Solana JSON-RPC over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every call")
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slot-time", type=float, default=0.4)
+    args = parser.parse_args()
+    uvicorn.run(
+        FakeSolanaRPC(args.latency, args.drop_rate, args.error_rate, args.slot_time),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,318 @@
+"""
+End-to-end load generator for the API.
+
+By default the app and a fake RPC run in this process and requests go
+through ``httpx.ASGITransport``, so results measure one worker's event loop
+without socket overhead:
+
+    cd Backend && python -m benchmarks.loadtest --mix build=4,simulate=3,idl=2,pack=1 \
+        --concurrency 64 --duration 20 --rpc-latency 0.02 --output results.json
+
+Against a running deployment (e.g. gunicorn with N uvicorn workers) backed by
+a standalone fake RPC:
+
+    python -m benchmarks.fake_rpc --port 8899 --latency 0.02 &
+    gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w 4 -b 127.0.0.1:5000 &
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000 --rpc-url http://127.0.0.1:8899
+
+``--replay cassette.jsonl`` serves RPC replies from a cassette recorded with
+RPC_TRANSPORT_MODE=record instead of the fake, matching calls by method.
+
+``--rate`` switches from a closed loop (each of ``--concurrency`` workers
+sends its next request when the last one returns) to an open loop with
+fixed arrivals, where latency is measured from the scheduled send time.
+Results are printed as JSON.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+
+from benchmarks.fake_rpc import SAMPLE_ACCOUNT, SAMPLE_PROGRAM_ID, FakeSolanaRPC
+
+IN_PROCESS_URL = "http://loadtest"
+IN_PROCESS_RPC_URL = "http://fake-rpc"
+LOOP_LAG_INTERVAL = 0.05
+
+Request = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+class RequestMix:
+    """Weighted request kinds; each kind renders to (method, path, json, params)."""
+
+    KINDS = ("build", "simulate", "send", "idl", "methods", "pack", "account")
+
+    def __init__(self, spec: str, rpc_url: str):
+        self.rpc_url = rpc_url
+        self.kinds: List[str] = []
+        self.weights: List[float] = []
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name not in self.KINDS:
+                raise ValueError(f"Unknown request kind '{name}', expected one of {self.KINDS}")
+            self.kinds.append(name)
+            self.weights.append(float(weight or 1))
+
+        self.payer = Keypair()
+        self.random = random.Random(0)
+        ix = transfer(
+            TransferParams(from_pubkey=self.payer.pubkey(), to_pubkey=self.payer.pubkey(), lamports=1)
+        )
+        tx = Transaction([self.payer], Message([ix], self.payer.pubkey()), Hash.default())
+        self.signed_tx = base64.b64encode(bytes(tx)).decode("utf-8")
+
+    def next(self) -> Tuple[str, Request]:
+        kind = self.random.choices(self.kinds, self.weights)[0]
+        return kind, getattr(self, f"_{kind}")()
+
+    def _build(self) -> Request:
+        body = {
+            "rpc_url": self.rpc_url,
+            "program_id": SAMPLE_PROGRAM_ID,
+            "accounts": [
+                {"pubkey": str(self.payer.pubkey()), "is_signer": True, "is_writable": True}
+            ],
+            "instruction_data": "afaf6d1f0d989bed" + "01" * 8,
+        }
+        return "POST", "/solana/tx/build", body, None
+
+    def _simulate(self) -> Request:
+        body = {"rpc_url": self.rpc_url, "transaction_base64": self.signed_tx}
+        return "POST", "/solana/tx/simulate", body, None
+
+    def _send(self) -> Request:
+        body = {
+            "rpc_url": self.rpc_url,
+            "transaction_base64": self.signed_tx,
+            "preflight": "none",
+        }
+        return "POST", "/solana/tx/send", body, None
+
+    def _idl(self) -> Request:
+        return "GET", f"/solana/idl/{SAMPLE_PROGRAM_ID}", None, {"rpc_url": self.rpc_url}
+
+    def _methods(self) -> Request:
+        return "GET", f"/solana/idl/{SAMPLE_PROGRAM_ID}/methods", None, {"rpc_url": self.rpc_url}
+
+    def _pack(self) -> Request:
+        body = {
+            "layout": [
+                {"type": "u8", "value": 1},
+                {"type": "u64", "value": self.random.randrange(2**64)},
+                {"type": "pubkey", "value": str(self.payer.pubkey())},
+                {"type": "string", "value": "loadtest"},
+            ]
+        }
+        return "POST", "/solana/instruction/pack", body, None
+
+    def _account(self) -> Request:
+        body = {"rpc_url": self.rpc_url, "pubkey": SAMPLE_ACCOUNT}
+        return "POST", "/solana/accounts/info", body, None
+
+
+class Recorder:
+    def __init__(self, warmup_until: float):
+        self.warmup_until = warmup_until
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.loop_lag: List[float] = []
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def record(self, kind: str, started: float, outcome: str) -> None:
+        now = time.perf_counter()
+        if started < self.warmup_until:
+            return
+        if self.started_at is None:
+            self.started_at = started
+        self.finished_at = now
+        self.latencies.setdefault(kind, []).append((now - started) * 1000)
+        if outcome != "ok":
+            counts = self.errors.setdefault(kind, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 3)
+
+    return {
+        "mean": round(statistics.mean(ordered), 3),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "p999": pick(0.999),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _summary(recorder: Recorder, config: Dict[str, Any]) -> Dict[str, Any]:
+    elapsed = (recorder.finished_at or 0) - (recorder.started_at or 0)
+    by_kind = {}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for kind, samples in recorder.latencies.items():
+        errors = recorder.errors.get(kind, {})
+        total_errors += sum(errors.values())
+        all_latencies += samples
+        by_kind[kind] = {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0,
+            "errors": errors,
+            "error_rate": round(sum(errors.values()) / len(samples), 4),
+            "latency_ms": _percentiles(samples),
+        }
+    return {
+        "config": config,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2) if elapsed else 0,
+        "error_rate": round(total_errors / len(all_latencies), 4) if all_latencies else 0,
+        "latency_ms": _percentiles(all_latencies),
+        "loop_lag_ms": _percentiles(recorder.loop_lag),
+        "by_kind": by_kind,
+    }
+
+
+async def _call(client: httpx.AsyncClient, mix: RequestMix, recorder: Recorder, started: float) -> None:
+    kind, (method, path, body, params) = mix.next()
+    try:
+        response = await client.request(method, path, json=body, params=params)
+        outcome = "ok" if response.status_code < 400 else str(response.status_code)
+    except Exception as e:
+        outcome = type(e).__name__
+    recorder.record(kind, started, outcome)
+
+
+async def _monitor_loop_lag(recorder: Recorder, deadline: float) -> None:
+    """Measures how late the event loop wakes a sleeping task; in-process this is the app's loop."""
+    while time.perf_counter() < deadline:
+        expected = time.perf_counter() + LOOP_LAG_INTERVAL
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        if expected >= recorder.warmup_until:
+            recorder.loop_lag.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+
+async def _closed_loop(client, mix, recorder, concurrency: int, deadline: float) -> None:
+    async def worker():
+        while time.perf_counter() < deadline:
+            await _call(client, mix, recorder, time.perf_counter())
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _open_loop(client, mix, recorder, rate: float, deadline: float) -> None:
+    interval = 1.0 / rate
+    tasks = set()
+    scheduled = time.perf_counter()
+    while scheduled < deadline:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(_call(client, mix, recorder, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        scheduled += interval
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = None
+    if args.url:
+        base_url = args.url
+        transport = None
+        rpc_url = args.rpc_url
+    else:
+        from app.chains.solana import SolanaRPCClient
+        from app.main import app
+        from app.utils.rpc_cassette import Cassette, ReplayTransport
+
+        if args.replay:
+            cassette = Cassette(args.replay)
+            SolanaRPCClient.default_transport = ReplayTransport(
+                cassette, match="method", timing=args.replay_timing
+            )
+        else:
+            fake = FakeSolanaRPC(
+                latency=args.rpc_latency, error_rate=args.rpc_error_rate, seed=1
+            )
+            SolanaRPCClient.default_transport = httpx.ASGITransport(app=fake)
+        base_url = IN_PROCESS_URL
+        transport = httpx.ASGITransport(app=app)
+        rpc_url = args.rpc_url or IN_PROCESS_RPC_URL
+
+    mix = RequestMix(args.mix, rpc_url)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    start = time.perf_counter()
+    recorder = Recorder(start + args.warmup)
+    deadline = start + args.warmup + args.duration
+
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=args.timeout
+    ) as client:
+        monitor = asyncio.create_task(_monitor_loop_lag(recorder, deadline))
+        if args.rate:
+            await _open_loop(client, mix, recorder, args.rate, deadline)
+        else:
+            await _closed_loop(client, mix, recorder, args.concurrency, deadline)
+        await monitor
+
+    config = {
+        "target": args.url or "in-process",
+        "rpc": "replay" if args.replay else ("fake" if fake else "external"),
+        "rpc_url": rpc_url,
+        "mix": args.mix,
+        "mode": f"open-loop {args.rate} rps" if args.rate else f"closed-loop x{args.concurrency}",
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "rpc_latency": args.rpc_latency if fake else None,
+        "rpc_error_rate": args.rpc_error_rate if fake else None,
+    }
+    result = _summary(recorder, config)
+    if fake is not None:
+        result["rpc_calls"] = fake.calls
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end API load generator")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--rpc-url", help="RPC URL sent in requests (default: in-process fake)")
+    parser.add_argument("--mix", default="build=4,simulate=3,idl=2,pack=1",
+                        help=f"Weighted kinds from {', '.join(RequestMix.KINDS)}")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate, requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--rpc-latency", type=float, default=0.0, help="In-process fake RPC latency, seconds")
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0, help="In-process fake RPC error fraction")
+    parser.add_argument("--replay", help="Serve RPC replies from this recorded cassette")
+    parser.add_argument("--replay-timing", action="store_true", help="Delay replays by recorded latency")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
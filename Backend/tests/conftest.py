@@ -0,0 +1,15 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time: point the shared cache and decoded store
+# at a scratch directory before any app module is imported.
+_SCRATCH = tempfile.mkdtemp(prefix="chaincall-tests-")
+os.environ.setdefault("SHARED_CACHE_PATH", os.path.join(_SCRATCH, "cache.sqlite3"))
+os.environ.setdefault("DECODED_STORE_PATH", os.path.join(_SCRATCH, "decoded.sqlite3"))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+
+from app.chains.solana.account_cache import (
+    AccountCache,
+    AccountSubscriber,
+    _Stream,
+    websocket_url,
+)
+
+RPC_URL = "http://rpc.test"
+PUBKEY = "So11111111111111111111111111111111111111112"
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
+
+
+def _subscriber():
+    subscriber = AccountSubscriber(AccountCache(1 << 20, 10, "confirmed"), 10, "confirmed")
+    stream = subscriber._streams[RPC_URL] = _Stream(RPC_URL)
+    stream.ws = FakeSocket()
+    return subscriber, stream
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize(
+    "rpc_url,expected",
+    [
+        ("https://api.mainnet-beta.solana.com", "wss://api.mainnet-beta.solana.com"),
+        ("http://127.0.0.1:8899", "ws://127.0.0.1:8900"),
+        ("http://node.internal:9000/rpc", "ws://node.internal:9000/rpc"),
+    ],
+)
+def test_websocket_url(rpc_url, expected):
+    assert websocket_url(rpc_url) == expected
+
+
+async def test_reply_after_unwatch_unsubscribes():
+    subscriber, stream = _subscriber()
+    stream.pubkeys.add(PUBKEY)
+    await subscriber._subscribe(stream, PUBKEY)
+    request_id = stream.ws.sent[-1]["id"]
+
+    subscriber.unwatch(RPC_URL, PUBKEY)
+    subscriber._handle(stream, {"jsonrpc": "2.0", "id": request_id, "result": 41})
+    await _settle()
+
+    assert stream.ws.sent[-1]["method"] == "accountUnsubscribe"
+    assert stream.ws.sent[-1]["params"] == [41]
+    assert not subscriber.is_live(RPC_URL, PUBKEY)
+
+
+async def test_duplicate_subscription_is_dropped():
+    subscriber, stream = _subscriber()
+    stream.pubkeys.add(PUBKEY)
+    await subscriber._subscribe(stream, PUBKEY)
+    await subscriber._subscribe(stream, PUBKEY)
+    first, second = (m["id"] for m in stream.ws.sent)
+
+    subscriber._handle(stream, {"jsonrpc": "2.0", "id": first, "result": 1})
+    subscriber._handle(stream, {"jsonrpc": "2.0", "id": second, "result": 2})
+    await _settle()
+
+    assert stream.by_pubkey[PUBKEY] == 1
+    assert stream.ws.sent[-1]["method"] == "accountUnsubscribe"
+    assert stream.ws.sent[-1]["params"] == [2]
+
+
+async def test_notification_updates_cache():
+    subscriber, stream = _subscriber()
+    stream.pubkeys.add(PUBKEY)
+    await subscriber._subscribe(stream, PUBKEY)
+    subscriber._handle(stream, {"jsonrpc": "2.0", "id": stream.ws.sent[-1]["id"], "result": 9})
+    value = {"data": ["AQ==", "base64"], "lamports": 5}
+    subscriber._handle(
+        stream,
+        {
+            "method": "accountNotification",
+            "params": {"subscription": 9, "result": {"context": {"slot": 100}, "value": value}},
+        },
+    )
+    assert subscriber.is_live(RPC_URL, PUBKEY)
+    assert stream.notifications == 1
@@ -0,0 +1,115 @@
+import pytest
+
+from app.chains.solana import byte_packer
+from app.chains.solana.byte_packer import SolanaBytePacker
+
+PUBKEY = "So11111111111111111111111111111111111111112"
+SHORT_PUBKEY = "3yZe7d"  # valid base58, 4 bytes
+
+
+@pytest.fixture
+def packer():
+    return SolanaBytePacker()
+
+
+def _pack_both(packer, monkeypatch, types, columns, prefix=b""):
+    pytest.importorskip("numpy")
+    vectorized = packer.pack_columns(types, columns, prefix)
+    with monkeypatch.context() as m:
+        m.setattr(byte_packer, "np", None)
+        fallback = packer.pack_columns(types, columns, prefix)
+    return vectorized, fallback
+
+
+@pytest.mark.parametrize(
+    "types,columns,prefix",
+    [
+        (["u8", "u16", "u32", "u64"], [[0, 255], [1, 65535], [2, 2**32 - 1], [3, 2**64 - 1]], b""),
+        (["i8", "i16", "i32", "i64"], [[-128, 127], [-1, 1], [-(2**31), 5], [-(2**63), 2**63 - 1]], b""),
+        (["u128", "i128"], [[0, 2**128 - 1], [-(2**127), 2**127 - 1]], b""),
+        (["bool", "pubkey"], [[True, False], [PUBKEY, PUBKEY]], b"\xaa\xbb"),
+        # The scalar packers truncate unsigned values; both paths must agree
+        (["u8", "u16"], [[256, -1], [70000, -2]], b""),
+        (["u64"], [[]], b"\x01"),
+    ],
+)
+def test_pack_columns_paths_agree(packer, monkeypatch, types, columns, prefix):
+    vectorized, fallback = _pack_both(packer, monkeypatch, types, columns, prefix)
+    assert vectorized == fallback
+    buffer, offsets, record_size = vectorized
+    rows = len(columns[0])
+    assert offsets == [i * record_size for i in range(rows + 1)]
+    assert len(buffer) == rows * record_size
+
+
+def test_pack_columns_matches_pack_layout(packer, monkeypatch):
+    types = ["u8", "i64", "pubkey"]
+    columns = [[1, 2], [-3, 4], [PUBKEY, PUBKEY]]
+    vectorized, _ = _pack_both(packer, monkeypatch, types, columns)
+    buffer, offsets, _ = vectorized
+    for row, (start, end) in enumerate(zip(offsets, offsets[1:])):
+        layout = [{"type": t, "value": column[row]} for t, column in zip(types, columns)]
+        assert buffer[start:end] == packer.pack_layout(layout)
+
+
+@pytest.mark.parametrize(
+    "types,columns",
+    [
+        (["pubkey"], [[SHORT_PUBKEY]]),
+        (["pubkey"], [["not base58 0OIl"]]),
+        (["u32"], [[1.5]]),
+        (["u64"], [["5"]]),
+        (["i8"], [[128]]),
+        (["i64"], [[2**63]]),
+        (["u128"], [[2**128]]),
+        (["i128"], [[None]]),
+    ],
+)
+def test_pack_columns_rejects_bad_values_on_both_paths(packer, monkeypatch, types, columns):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        packer.pack_columns(types, columns)
+    monkeypatch.setattr(byte_packer, "np", None)
+    with pytest.raises(ValueError):
+        packer.pack_columns(types, columns)
+
+
+def test_pack_columns_rejects_empty_layout(packer):
+    with pytest.raises(ValueError, match="no fields"):
+        packer.pack_columns([], [])
+
+
+def test_pack_columns_variable_size_has_no_record_size(packer):
+    buffer, offsets, record_size = packer.pack_columns(["u8", "string"], [[1, 2], ["a", "bcd"]])
+    assert record_size is None
+    assert offsets == [0, 6, 14]
+    assert buffer == b"\x01\x01\x00\x00\x00a\x02\x03\x00\x00\x00bcd"
+
+
+@pytest.mark.parametrize(
+    "field_type,value",
+    [
+        ("u8", 200),
+        ("u16", 513),
+        ("u32", 2**31),
+        ("u64", 2**64 - 1),
+        ("u128", 2**100 + 7),
+        ("i8", -5),
+        ("i16", -300),
+        ("i32", -(2**31)),
+        ("i64", -(2**40)),
+        ("i128", -(2**120)),
+        ("bool", True),
+        ("pubkey", PUBKEY),
+        ("string", "héllo"),
+    ],
+)
+def test_field_round_trip(packer, field_type, value):
+    packed = packer.pack_field(field_type, value)
+    assert packer.unpack_field(field_type, packed) == value
+
+
+def test_pack_seed_requires_32_byte_pubkey(packer):
+    assert len(packer.pack_seed("pubkey", PUBKEY)) == 32
+    with pytest.raises(ValueError):
+        packer.pack_seed("pubkey", SHORT_PUBKEY)
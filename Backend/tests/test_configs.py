@@ -0,0 +1,18 @@
+from typing import get_args
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.configs import Settings
+from app.models.schemas import PreflightPolicy
+
+
+def test_preflight_setting_matches_policy_enum():
+    annotation = Settings.model_fields["SEND_PREFLIGHT_POLICY"].annotation
+    assert set(get_args(annotation)) == {policy.value for policy in PreflightPolicy}
+
+
+def test_bad_preflight_setting_fails_at_startup(monkeypatch):
+    monkeypatch.setenv("SEND_PREFLIGHT_POLICY", "skip-everything")
+    with pytest.raises(ValidationError):
+        Settings()
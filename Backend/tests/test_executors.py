@@ -0,0 +1,41 @@
+import pytest
+
+from app.chains.solana.byte_packer import SolanaBytePacker
+from app.utils import executors
+from app.utils.executors import process_workers, run_cpu
+
+LAYOUT = [{"type": "u16", "value": 513}]
+
+
+@pytest.mark.parametrize(
+    "configured,web_workers,cpus,expected",
+    [(None, 1, 8, 8), (None, 4, 8, 2), (None, 16, 8, 1), (3, 4, 8, 3), (None, 1, None, 1)],
+)
+def test_process_workers_split_across_web_workers(
+    monkeypatch, configured, web_workers, cpus, expected
+):
+    monkeypatch.setattr(executors.settings, "EXECUTOR_PROCESS_WORKERS", configured)
+    monkeypatch.setattr(executors.settings, "WEB_CONCURRENCY", web_workers)
+    monkeypatch.setattr(executors.os, "cpu_count", lambda: cpus)
+    assert process_workers() == expected
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size,process,path", [(0, False, "inline"), (10, False, "thread"), (10, True, "process")])
+async def test_run_cpu_paths(size, process, path):
+    before = executors.stats()["calls"][path]
+    try:
+        result = await run_cpu(
+            SolanaBytePacker().pack_layout, LAYOUT, size=size, threshold=1, process=process
+        )
+    finally:
+        executors.shutdown()
+    assert result == b"\x01\x02"
+    assert executors.stats()["calls"][path] == before + 1
+
+
+def test_process_pool_does_not_fork():
+    try:
+        assert executors.process_pool()._mp_context.get_start_method() == "spawn"
+    finally:
+        executors.shutdown()
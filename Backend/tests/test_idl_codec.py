@@ -0,0 +1,126 @@
+import pytest
+
+from app.chains.solana.byte_packer import SolanaBytePacker
+from app.chains.solana.idl_codec import IdlCodec, sighash
+
+PUBKEY = "So11111111111111111111111111111111111111112"
+
+IDL = {
+    "instructions": [
+        {
+            "name": "configure",
+            "accounts": [],
+            "args": [
+                {"name": "amount", "type": "u64"},
+                {"name": "config", "type": {"defined": "Config"}},
+            ],
+        }
+    ],
+    "accounts": [{"name": "Config", "type": {"kind": "struct", "fields": []}}],
+    "types": [
+        {
+            "name": "Config",
+            "type": {
+                "kind": "struct",
+                "fields": [
+                    {"name": "owner", "type": "publicKey"},
+                    {"name": "big", "type": "i128"},
+                    {"name": "label", "type": "string"},
+                    {"name": "blob", "type": "bytes"},
+                    {"name": "maybe", "type": {"option": "u16"}},
+                    {"name": "list", "type": {"vec": "i32"}},
+                    {"name": "arr", "type": {"array": ["u8", 4]}},
+                    {"name": "pair", "type": {"defined": "Pair"}},
+                    {"name": "mode", "type": {"defined": "Mode"}},
+                    {"name": "flag", "type": "bool"},
+                    {"name": "ratio", "type": "f64"},
+                ],
+            },
+        },
+        {"name": "Pair", "type": {"kind": "struct", "fields": ["u8", "u32"]}},
+        {
+            "name": "Mode",
+            "type": {
+                "kind": "enum",
+                "variants": [
+                    {"name": "Off"},
+                    {"name": "On", "fields": [{"name": "level", "type": "u8"}]},
+                    {"name": "Pinned", "fields": ["u16", "bool"]},
+                ],
+            },
+        },
+    ],
+}
+
+CONFIG = {
+    "owner": PUBKEY,
+    "big": -(2**100),
+    "label": "hé",
+    "blob": "abcd",
+    "maybe": None,
+    "list": [1, -2],
+    "arr": [1, 2, 3, 4],
+    "pair": [7, 2**32 - 1],
+    "mode": {"variant": "On", "fields": {"level": 3}},
+    "flag": True,
+    "ratio": 0.5,
+}
+
+
+@pytest.fixture
+def codec():
+    return IdlCodec(IDL)
+
+
+def _encode(codec, type_def, value) -> bytes:
+    out = bytearray()
+    codec.compile_encoder(type_def)(value, out)
+    return bytes(out)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        CONFIG,
+        {**CONFIG, "maybe": 65535, "list": [], "mode": {"variant": "Off"}},
+        {**CONFIG, "mode": {"variant": "Pinned", "fields": [9, False]}},
+    ],
+)
+def test_defined_type_round_trip(codec, value):
+    data = _encode(codec, {"defined": "Config"}, value)
+    decoded, offset = codec.decode_type({"defined": "Config"}, data)
+    assert decoded == value
+    assert offset == len(data)
+
+
+def test_instruction_round_trip(codec):
+    data = codec.encode_instruction("configure", {"amount": 5, "config": CONFIG})
+    assert data[:8] == sighash("global", "configure")
+    assert codec.decode_instruction(data) == ("configure", {"amount": 5, "config": CONFIG})
+    assert codec.decode_instruction(bytes(8) + data[8:]) is None
+
+
+@pytest.mark.parametrize(
+    "type_def,value",
+    [("u8", 256), ("i64", 2**63), ("u128", -1), ({"defined": "Mode"}, "Missing")],
+)
+def test_encoder_rejects_bad_values(codec, type_def, value):
+    with pytest.raises(ValueError):
+        _encode(codec, type_def, value)
+
+
+@pytest.mark.parametrize(
+    "field_type,value",
+    [
+        ("u16", 513),
+        ("i32", -7),
+        ("u64", 2**64 - 1),
+        ("i128", -(2**127)),
+        ("bool", True),
+        ("pubkey", PUBKEY),
+    ],
+)
+def test_codec_matches_byte_packer(codec, field_type, value):
+    packed = SolanaBytePacker().pack_field(field_type, value)
+    assert _encode(codec, field_type, value) == packed
+    assert codec.decode_type(field_type, packed) == (value, len(packed))
@@ -0,0 +1,95 @@
+import asyncio
+import struct
+import uuid
+
+import httpx
+import pytest
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+
+from app.chains.solana import SolanaRPCClient
+from app.chains.solana.nonce import NoncePool
+from benchmarks.fake_rpc import FakeSolanaRPC
+
+AUTHORITY = Pubkey.new_unique()
+
+
+def _nonce_data(nonce: Hash) -> bytes:
+    return struct.pack("<II", 1, 1) + bytes(AUTHORITY) + bytes(nonce) + struct.pack("<Q", 5000)
+
+
+@pytest.fixture
+def fake():
+    return FakeSolanaRPC()
+
+
+@pytest.fixture
+async def client(fake):
+    # A fresh endpoint per test keeps the shared cache entries apart
+    client = SolanaRPCClient(
+        f"http://{uuid.uuid4().hex}.test", transport=httpx.ASGITransport(app=fake)
+    )
+    yield client
+    await client.close()
+
+
+def _nonce_account(fake) -> str:
+    address = str(Pubkey.new_unique())
+    fake.set_account(address, _nonce_data(Hash.new_unique()))
+    return address
+
+
+@pytest.mark.anyio
+async def test_workers_share_checkouts_and_spent_nonces(fake, client):
+    first, second = NoncePool(60.0), NoncePool(60.0)
+    address = _nonce_account(fake)
+    await first.register(client.rpc_url, address)
+
+    account = await second.acquire(client)
+    assert account.address == address and account.ready
+    with pytest.raises(ValueError, match="checked out"):
+        await first.acquire(client)
+
+    # Released as used from the other worker; the chain hasn't advanced yet
+    await first.release(client.rpc_url, address, used=True)
+    with pytest.raises(ValueError, match="have not landed"):
+        await second.acquire(client)
+
+    advanced = Hash.new_unique()
+    fake.set_account(address, _nonce_data(advanced))
+    account = await first.acquire(client)
+    assert account.nonce == str(advanced)
+    assert account.uses == 1
+
+
+@pytest.mark.anyio
+async def test_unreleased_lease_lapses(fake, client):
+    first, second = NoncePool(0.05), NoncePool(0.05)
+    await first.register(client.rpc_url, _nonce_account(fake))
+    await first.acquire(client)
+    with pytest.raises(ValueError, match="checked out"):
+        await second.acquire(client)
+    await asyncio.sleep(0.1)
+    assert (await second.acquire(client)).ready
+
+
+@pytest.mark.anyio
+async def test_explicit_account_is_not_pooled(fake, client):
+    pool = NoncePool(60.0)
+    address = _nonce_account(fake)
+    account = await pool.get(client, address)
+    assert account.nonce is not None
+    assert await pool.list(client.rpc_url) == []
+    assert await NoncePool(60.0).list(client.rpc_url) == []
+    with pytest.raises(ValueError, match="No nonce accounts"):
+        await pool.acquire(client)
+
+
+@pytest.mark.anyio
+async def test_removed_account_leaves_every_worker(fake, client):
+    first, second = NoncePool(60.0), NoncePool(60.0)
+    address = _nonce_account(fake)
+    await first.register(client.rpc_url, address)
+    assert [a.address for a in await second.list(client.rpc_url)] == [address]
+    await first.remove(client.rpc_url, address)
+    assert await second.list(client.rpc_url) == []
@@ -0,0 +1,114 @@
+import pytest
+from solders.pubkey import Pubkey
+
+from app.chains.solana import pda
+from app.chains.solana.byte_packer import SolanaBytePacker
+from app.chains.solana.warming import key_pdas
+
+PROGRAM_ID = "11111111111111111111111111111111"
+USER = "So11111111111111111111111111111111111111112"
+
+IDL = {
+    "instructions": [
+        {
+            "name": "deposit",
+            "args": [{"name": "amount", "type": "u64"}],
+            "accounts": [
+                {"name": "user"},
+                {
+                    "name": "config",
+                    "pda": {"seeds": [{"kind": "const", "value": list(b"config")}]},
+                },
+                {
+                    "name": "vault",
+                    "pda": {
+                        "seeds": [
+                            {"kind": "const", "value": list(b"vault")},
+                            {"kind": "account", "path": "user"},
+                            {"kind": "arg", "path": "amount"},
+                        ]
+                    },
+                },
+            ],
+        },
+        {
+            "name": "broken",
+            "args": [],
+            "accounts": [
+                # Const seed longer than MAX_SEED_LENGTH can't be derived
+                {"name": "huge", "pda": {"seeds": [{"kind": "const", "value": [0] * 33}]}},
+                {
+                    "name": "state",
+                    "pda": {"seeds": [{"kind": "const", "value": list(b"state")}]},
+                },
+            ],
+        },
+    ]
+}
+
+
+def test_collect_derives_known_seeds():
+    fixed, derivable, unresolved = pda.collect_instruction_pdas(
+        IDL, PROGRAM_ID, "deposit", {"amount": 5}, {"user": USER}
+    )
+    assert fixed == {}
+    assert unresolved == []
+    assert derivable["vault"] == (
+        PROGRAM_ID,
+        (b"vault", bytes(Pubkey.from_string(USER)), (5).to_bytes(8, "little")),
+    )
+
+
+@pytest.mark.parametrize(
+    "args,accounts",
+    [
+        ({"amount": "five"}, {"user": USER}),  # wrong arg type
+        ({"amount": 5}, {"user": "not-a-pubkey"}),  # bad base58
+        ({"amount": 5}, {"user": "3yZe7d"}),  # valid base58, 4 bytes
+    ],
+)
+def test_collect_reports_unencodable_seeds_as_unresolved(args, accounts):
+    _, derivable, unresolved = pda.collect_instruction_pdas(
+        IDL, PROGRAM_ID, "deposit", args, accounts
+    )
+    assert unresolved == ["vault"]
+    assert "config" in derivable
+
+
+def test_key_pdas_skips_underivable_accounts():
+    keys = key_pdas(IDL, PROGRAM_ID)
+    assert (PROGRAM_ID, (b"config",)) in keys
+    assert (PROGRAM_ID, (b"state",)) in keys
+    assert all(len(seed) <= SolanaBytePacker.MAX_SEED_LENGTH for _, seeds in keys for seed in seeds)
+
+
+@pytest.mark.anyio
+async def test_resolve_matches_solders():
+    known, unresolved = await pda.resolve_instruction_accounts(
+        IDL, PROGRAM_ID, "deposit", {"amount": 5}, {"user": USER}
+    )
+    expected, _ = Pubkey.find_program_address(
+        [b"vault", bytes(Pubkey.from_string(USER)), (5).to_bytes(8, "little")],
+        Pubkey.from_string(PROGRAM_ID),
+    )
+    assert known["vault"] == str(expected)
+    assert unresolved == []
+
+
+@pytest.mark.parametrize(
+    "program_id,seeds",
+    [
+        (PROGRAM_ID, (b"x",) * (pda.MAX_SEEDS + 1)),
+        (PROGRAM_ID, (b"x" * (SolanaBytePacker.MAX_SEED_LENGTH + 1),)),
+        ("not-a-program", (b"x",)),
+    ],
+)
+def test_check_pda_key_rejects(program_id, seeds):
+    with pytest.raises(ValueError):
+        pda.check_pda_key(program_id, seeds)
+
+
+@pytest.mark.parametrize("value", ["3yZe7d", USER + "1"])
+def test_pack_seed_pubkey_requires_32_bytes(value):
+    with pytest.raises(ValueError):
+        SolanaBytePacker().pack_seed("pubkey", value)
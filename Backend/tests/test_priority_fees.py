@@ -0,0 +1,87 @@
+import asyncio
+import base64
+
+import httpx
+import pytest
+from solders.message import Message
+
+from app.chains.solana import SolanaRPCClient
+from app.chains.solana.priority_fees import PriorityFeeOracle, percentile
+from app.main import app
+from benchmarks.fake_rpc import SAMPLE_ACCOUNT, FakeSolanaRPC
+
+RPC_URL = "http://rpc.test"
+
+
+@pytest.fixture
+def fake():
+    return FakeSolanaRPC()
+
+
+@pytest.fixture
+def oracle(fake):
+    transport = httpx.ASGITransport(app=fake)
+    return PriorityFeeOracle(
+        ttl=10.0,
+        refresh_ahead=0.5,
+        hot_reads=3,
+        max_sets=16,
+        client_factory=lambda url: SolanaRPCClient(url, transport=transport),
+    )
+
+
+@pytest.mark.parametrize(
+    "fees,p,expected",
+    [([], 50, 0), ([5], 99, 5), ([1, 2, 3, 4], 50, 2), ([1, 2, 3, 4], 75, 3), ([1, 2, 3, 4], 100, 4)],
+)
+def test_percentile_is_nearest_rank(fees, p, expected):
+    assert percentile(fees, p) == expected
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_fetch(fake, oracle):
+    entries = await asyncio.gather(*(oracle.estimate(RPC_URL, [SAMPLE_ACCOUNT]) for _ in range(5)))
+    assert all(entry is entries[0] for entry in entries)
+    assert fake.calls["getRecentPrioritizationFees"] == 1
+    assert oracle.cached(RPC_URL, [SAMPLE_ACCOUNT]) is entries[0]
+    await oracle.shutdown()
+
+
+@pytest.mark.anyio
+async def test_fallback_without_estimate_is_the_floor(oracle):
+    price, source = oracle.fallback(RPC_URL, [SAMPLE_ACCOUNT], 75, refresh=False)
+    assert (price, source) == (0, "floor")
+    await oracle.estimate(RPC_URL, [SAMPLE_ACCOUNT])
+    _, source = oracle.fallback(RPC_URL, [SAMPLE_ACCOUNT], 75, refresh=False)
+    assert source == "stale"
+    await oracle.shutdown()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fee_percentile,attached", [(25, False), (90, True)])
+async def test_build_skips_zero_compute_unit_price(monkeypatch, fee_percentile, attached):
+    fake = FakeSolanaRPC()
+    monkeypatch.setattr(SolanaRPCClient, "default_transport", httpx.ASGITransport(app=fake))
+    payer = "So11111111111111111111111111111111111111112"
+    body = {
+        # A URL of its own: the oracle keeps one client per endpoint
+        "rpc_url": f"http://fees-{fee_percentile}.test",
+        "program_id": "11111111111111111111111111111111",
+        "accounts": [
+            {"pubkey": payer, "is_signer": True, "is_writable": True},
+            {"pubkey": SAMPLE_ACCOUNT, "is_writable": True},
+        ],
+        "instruction_data": "00",
+        "auto_priority_fee": True,
+        "priority_fee_percentile": fee_percentile,
+    }
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://app") as http:
+        response = await http.post("/solana/tx/build", json=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["priority_fee_source"] == "rpc"
+    assert (result["compute_unit_price"] is not None) == attached
+
+    message = Message.from_bytes(base64.b64decode(result["message_base64"]))
+    programs = {str(message.account_keys[ix.program_id_index]) for ix in message.instructions}
+    assert ("ComputeBudget111111111111111111111111111111" in programs) == attached
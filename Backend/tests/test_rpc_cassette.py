@@ -0,0 +1,88 @@
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.chains.solana import SolanaRPCClient
+from app.utils.rpc_cassette import REPLAY_MISS_CODE, Cassette, RecordingTransport, ReplayTransport
+from benchmarks.fake_rpc import SAMPLE_ACCOUNT, FakeSolanaRPC
+
+RPC_URL = "http://rpc.test"
+
+pytestmark = pytest.mark.anyio
+
+
+async def _record(path: str):
+    fake = FakeSolanaRPC()
+    transport = RecordingTransport(Cassette(path), inner=httpx.ASGITransport(app=fake))
+    client = SolanaRPCClient(RPC_URL, transport=transport)
+    try:
+        account = await client.get_account_info(SAMPLE_ACCOUNT, "base64")
+        fees = await client.get_recent_prioritization_fees([SAMPLE_ACCOUNT])
+    finally:
+        await client.close()
+    await transport.shutdown()
+    return account, fees
+
+
+@pytest.mark.parametrize("name", ["cassette.jsonl", "cassette.jsonl.gz"])
+async def test_replay_serves_recorded_replies(tmp_path, name):
+    path = str(tmp_path / name)
+    account, fees = await _record(path)
+
+    client = SolanaRPCClient(RPC_URL, transport=ReplayTransport(Cassette(path)))
+    try:
+        assert await client.get_account_info(SAMPLE_ACCOUNT, "base64") == account
+        assert await client.get_recent_prioritization_fees([SAMPLE_ACCOUNT]) == fees
+    finally:
+        await client.close()
+
+
+async def test_replay_miss_is_a_jsonrpc_error(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    await _record(path)
+    transport = ReplayTransport(Cassette(path))
+    async with httpx.AsyncClient(transport=transport) as http:
+        response = await http.post(
+            RPC_URL, json={"jsonrpc": "2.0", "id": 7, "method": "getSlot", "params": []}
+        )
+    assert response.json()["error"]["code"] == REPLAY_MISS_CODE
+    assert transport.misses == 1
+
+
+def test_lookup_cycles_through_repeated_calls(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.jsonl"))
+    for slot in (1, 2):
+        cassette.append(RPC_URL, "getSlot", [], {"result": slot}, 1.0)
+    cassette.flush()
+
+    replay = Cassette(cassette.path)
+    results = [replay.lookup(RPC_URL, "getSlot", [])["reply"]["result"] for _ in range(3)]
+    assert results == [1, 2, 1]
+    assert replay.lookup("http://other", "getSlot", [], match="method")["reply"]["result"] == 1
+
+
+def test_append_buffers_until_flush(tmp_path):
+    cassette = Cassette(str(tmp_path / "cassette.jsonl"))
+    cassette.append(RPC_URL, "getSlot", [], {"result": 1}, 1.0)
+    assert cassette.pending == 1
+    assert not (tmp_path / "cassette.jsonl").exists()
+    cassette.flush()
+    assert cassette.pending == 0
+
+
+def test_writers_sharing_a_gzip_file_keep_whole_lines(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    # One Cassette per worker, all appending to the same file
+    writers = [Cassette(path) for _ in range(3)]
+    for round_ in range(4):
+        for i, writer in enumerate(writers):
+            writer.append(RPC_URL, "getSlot", [i, round_], {"result": "x" * 1000}, 1.0)
+            writer.flush()
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert sorted(tuple(e["params"]) for e in entries) == [
+        (i, r) for i in range(3) for r in range(4)
+    ]
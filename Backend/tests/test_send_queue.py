@@ -0,0 +1,109 @@
+import asyncio
+import base64
+
+import httpx
+import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import (
+    AdvanceNonceAccountParams,
+    TransferParams,
+    advance_nonce_account,
+    transfer,
+)
+from solders.transaction import Transaction
+
+from app.chains.solana import SolanaRPCClient
+from app.chains.solana.send_queue import MAX_PROCESSING_AGE, QueueFullError, SendQueue
+from benchmarks.fake_rpc import FAKE_BLOCKHASH, FakeSolanaRPC
+
+RPC_URL = "http://rpc.test"
+HEIGHT = 1_000
+
+
+def _signed(blockhash: str, nonce: bool = False) -> str:
+    payer = Keypair()
+    send = TransferParams(from_pubkey=payer.pubkey(), to_pubkey=Pubkey.new_unique(), lamports=1)
+    ixs = [transfer(send)]
+    if nonce:
+        advance = AdvanceNonceAccountParams(
+            nonce_pubkey=Pubkey.new_unique(), authorized_pubkey=payer.pubkey()
+        )
+        ixs.insert(0, advance_nonce_account(advance))
+    recent = Hash.from_string(blockhash)
+    tx = Transaction([payer], Message.new_with_blockhash(ixs, payer.pubkey(), recent), recent)
+    return base64.b64encode(bytes(tx)).decode()
+
+
+@pytest.fixture
+def fake():
+    # Slots don't advance during a test: block height stays at HEIGHT
+    fake = FakeSolanaRPC(slot_time=1_000.0)
+    fake.started_at -= HEIGHT * fake.slot_time
+    return fake
+
+
+@pytest.fixture
+async def queue(fake):
+    transport = httpx.ASGITransport(app=fake)
+    queue = SendQueue(
+        max_pending=2,
+        concurrency=4,
+        rebroadcast_interval=0.01,
+        status_ttl=60.0,
+        client_factory=lambda url: SolanaRPCClient(url, transport=transport),
+    )
+    yield queue
+    await queue.shutdown()
+
+
+@pytest.mark.anyio
+async def test_latest_blockhash_expiry_is_exact(fake, queue):
+    job = await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH))
+    assert job.last_valid_block_height == HEIGHT + MAX_PROCESSING_AGE
+    assert fake.calls.get("getBlockHeight", 0) == 0
+
+    # Remembered per cluster
+    await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH))
+    assert fake.calls["getLatestBlockhash"] == 1
+
+
+@pytest.mark.anyio
+async def test_older_blockhash_expires_from_processed_height(fake, queue):
+    older = str(Hash.new_unique())
+    job = await queue.submit(RPC_URL, _signed(older))
+    assert job.last_valid_block_height == HEIGHT + MAX_PROCESSING_AGE
+    assert fake.calls["getBlockHeight"] == 1
+
+    await queue.submit(RPC_URL, _signed(older))
+    assert fake.calls["getBlockHeight"] == 1
+
+
+@pytest.mark.anyio
+async def test_durable_nonce_transaction_does_not_expire(fake, queue):
+    job = await queue.submit(RPC_URL, _signed(str(Hash.new_unique()), nonce=True))
+    assert job.last_valid_block_height is None
+    assert "getLatestBlockhash" not in fake.calls
+
+
+@pytest.mark.anyio
+async def test_job_expires_past_last_valid_block_height(fake, queue):
+    fake.drop_rate = 1.0
+    job = await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH), last_valid_block_height=HEIGHT - 1)
+    for _ in range(100):
+        if job.status == "expired":
+            break
+        await asyncio.sleep(0.01)
+    assert job.status == "expired"
+    assert (await queue.status(job.signature))["status"] == "expired"
+
+
+@pytest.mark.anyio
+async def test_full_queue_rejects(fake, queue):
+    fake.drop_rate = 1.0
+    await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH))
+    await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH))
+    with pytest.raises(QueueFullError):
+        await queue.submit(RPC_URL, _signed(FAKE_BLOCKHASH))
@@ -0,0 +1,129 @@
+import base64
+import struct
+
+import httpx
+import pytest
+from solders.address_lookup_table_account import AddressLookupTableAccount
+from solders.hash import Hash
+from solders.instruction import AccountMeta, Instruction
+from solders.message import Message, MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+
+from app.chains.solana import SolanaRPCClient, sim_cache
+from app.chains.solana.lookup_tables import LookupTableCache
+from app.chains.solana.sim_cache import SimulationCache, writable_accounts
+from app.chains.solana.wire import address_table_lookups
+from benchmarks.fake_rpc import FakeSolanaRPC
+
+RPC_URL = "http://rpc.test"
+PAYER = Pubkey.new_unique()
+PROGRAM = Pubkey.new_unique()
+STATIC = Pubkey.new_unique()
+LOADED = [Pubkey.new_unique() for _ in range(3)]
+TABLE = Pubkey.new_unique()
+
+
+def _table_data(addresses):
+    # LookupTableMeta: discriminator, deactivation slot, last extended slot and
+    # start index, authority option, padding; then the addresses
+    meta = struct.pack("<IQQB", 1, 2**64 - 1, 0, 0) + b"\x00" + bytes(32) + bytes(2)
+    return meta + b"".join(bytes(a) for a in addresses)
+
+
+def _unsigned(message: bytes) -> str:
+    return base64.b64encode(bytes([1]) + bytes(64) + message).decode()
+
+
+def _v0_transaction() -> str:
+    ix = Instruction(
+        PROGRAM,
+        b"\x01",
+        [
+            AccountMeta(STATIC, False, True),
+            AccountMeta(LOADED[0], False, True),
+            AccountMeta(LOADED[2], False, False),
+        ],
+    )
+    table = AddressLookupTableAccount(TABLE, LOADED)
+    message = MessageV0.try_compile(PAYER, [ix], [table], Hash.default())
+    return _unsigned(to_bytes_versioned(message))
+
+
+@pytest.fixture
+def fake():
+    fake = FakeSolanaRPC()
+    fake.set_account(str(TABLE), _table_data(LOADED))
+    return fake
+
+
+@pytest.fixture
+async def client(fake, monkeypatch):
+    monkeypatch.setattr(sim_cache, "lookup_table_cache", LookupTableCache(8))
+    client = SolanaRPCClient(RPC_URL, transport=httpx.ASGITransport(app=fake))
+    yield client
+    await client.close()
+
+
+def test_address_table_lookups_parses_v0_and_skips_legacy():
+    raw = base64.b64decode(_v0_transaction())
+    [lookup] = address_table_lookups(raw)
+    assert lookup.account_key == str(TABLE)
+    assert lookup.writable_indexes == [0]
+    assert lookup.readonly_indexes == [2]
+
+    ix = Instruction(PROGRAM, b"", [AccountMeta(STATIC, False, True)])
+    message = Message.new_with_blockhash([ix], PAYER, Hash.default())
+    legacy = base64.b64decode(_unsigned(bytes(message)))
+    assert address_table_lookups(legacy) == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("changed", [STATIC, LOADED[0]])
+async def test_change_to_writable_account_invalidates(fake, client, changed):
+    cache = SimulationCache(16, 60.0, 10_000)
+    tx = _v0_transaction()
+    assert (await cache.simulate(client, tx))[2] is False
+    assert (await cache.simulate(client, tx))[2] is True
+
+    cache.invalidate_account(str(LOADED[2]))  # read-only through the table
+    assert (await cache.simulate(client, tx))[2] is True
+
+    cache.invalidate_account(str(changed))
+    assert (await cache.simulate(client, tx))[2] is False
+    assert fake.calls["simulateTransaction"] == 2
+
+
+@pytest.mark.anyio
+async def test_sent_transaction_invalidates_loaded_accounts(client):
+    cache = SimulationCache(16, 60.0, 10_000)
+    tx = _v0_transaction()
+    await cache.simulate(client, tx)
+
+    writable = writable_accounts(RPC_URL, base64.b64decode(tx))
+    assert str(LOADED[0]) in writable and str(LOADED[2]) not in writable
+    cache.invalidate_accounts(writable)
+    assert (await cache.simulate(client, tx))[2] is False
+
+
+@pytest.mark.anyio
+async def test_uncached_table_invalidates_through_table_address(client, monkeypatch):
+    cache = SimulationCache(16, 60.0, 10_000)
+    tx = _v0_transaction()
+    await cache.simulate(client, tx)
+
+    # The table was evicted from the lookup cache since the simulation
+    monkeypatch.setattr(sim_cache, "lookup_table_cache", LookupTableCache(8))
+    writable = writable_accounts(RPC_URL, base64.b64decode(tx))
+    assert str(TABLE) in writable
+    cache.invalidate_accounts(writable)
+    assert (await cache.simulate(client, tx))[2] is False
+
+
+@pytest.mark.anyio
+async def test_unresolvable_table_is_not_cached(fake, client):
+    del fake.accounts[str(TABLE)]
+    cache = SimulationCache(16, 60.0, 10_000)
+    tx = _v0_transaction()
+    assert (await cache.simulate(client, tx))[2] is False
+    assert (await cache.simulate(client, tx))[2] is False
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,46 @@
+import pytest
+
+from app.chains.solana.rpc_client import SolanaRPCClient
+from app.chains.solana.tx_templates import TemplateRegistry
+from app.utils.shared_cache import get_shared_cache
+
+PROGRAM_ID = "11111111111111111111111111111111"
+DEFINITION = {
+    "program_id": PROGRAM_ID,
+    "accounts": [{"name": "fee_payer", "is_signer": True, "is_writable": True}],
+}
+
+
+@pytest.fixture
+async def clients():
+    mainnet = SolanaRPCClient("https://mainnet.test")
+    devnet = SolanaRPCClient("https://devnet.test")
+    yield mainnet, devnet
+    await mainnet.close()
+    await devnet.close()
+
+
+@pytest.mark.anyio
+async def test_handle_depends_on_cluster(clients):
+    mainnet, devnet = clients
+    registry = TemplateRegistry(8)
+    on_mainnet = await registry.register(mainnet, DEFINITION)
+    on_devnet = await registry.register(devnet, DEFINITION)
+    assert on_mainnet.handle != on_devnet.handle
+    assert (await registry.register(mainnet, DEFINITION)) is on_mainnet
+
+
+@pytest.mark.anyio
+async def test_other_worker_loads_then_remove_clears_shared_cache(clients):
+    mainnet, devnet = clients
+    handle = (await TemplateRegistry(8).register(devnet, dict(DEFINITION, compute_unit_limit=200_000))).handle
+
+    # Another worker, asked through a client on a different cluster
+    other = TemplateRegistry(8)
+    template = await other.get(mainnet, handle)
+    assert template is not None and template.handle == handle
+
+    assert await other.remove(handle) is True
+    assert get_shared_cache().get_json("tx_template", handle) is None
+    assert await TemplateRegistry(8).get(devnet, handle) is None
+    assert await other.remove(handle) is False